@@ -0,0 +1,155 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Alignments designed as a chain of intersection points
+
+import math
+
+from ec.coord import Q, TrackCoord
+from ec.curve import CurveError, TrackCurve
+
+
+class AlignmentError(Exception):
+    pass
+
+
+class IPChain(object):
+    """ Alignment defined by a polyline of intersection points (IPs). Each
+        interior IP has a radius of curvature and speed tolerance, and the
+        two straights meeting at that IP are joined with an easement -
+        static - easement transition as found by TrackCurve.curve_fit_radius.
+        points: sequence of (x, z) tuples, at least 3.
+        radii, speeds: either a single number used for every interior IP, or
+        a sequence with one value per interior IP (len(points) - 2).
+        Additonal parameter: 'split' option for whether to split the static
+        curve sections into multiple 500 m sections.
+    """
+    # Minimum length of straight kept between transitions
+    tolerance = 0.0005
+
+    def __init__(self, points, radii, speeds, split=True):
+        try:
+            self.points = [(float(x), float(z)) for x, z in points]
+        except (TypeError, ValueError) as err:
+            raise AlignmentError('The IPs must be a sequence of (x, z) '
+                                 'tuples.') from err
+        if len(self.points) < 3:
+            raise AlignmentError('At least 3 IPs are needed to form an '
+                                 'alignment.')
+
+        self.radii = self._per_vertex(radii, 'radii')
+        self.speeds = self._per_vertex(speeds, 'speeds')
+        self.split_static = split
+
+    def _per_vertex(self, values, name):
+        """ Expands a single value to all interior IPs or checks that the
+            sequence has one value per interior IP.
+        """
+        count = len(self.points) - 2
+        try:
+            ls_values = [float(values)] * count
+        except TypeError:
+            ls_values = [float(v) for v in values]
+        if len(ls_values) != count:
+            raise AlignmentError('{0} must have one value per interior IP: '
+                                 'expected {1}, got {2}.'
+                                 ''.format(name, count, len(ls_values)))
+        return ls_values
+
+    def legs(self):
+        """ Returns the bearing (in radians) and length of each straight
+            between consecutive IPs.
+        """
+        ls_legs = []
+        for (x0, z0), (x1, z1) in zip(self.points, self.points[1:]):
+            length = math.hypot(x1 - x0, z1 - z0)
+            if length == 0:
+                raise AlignmentError('Consecutive IPs must not be at the same '
+                                     'position: ({0}, {1}).'.format(x0, z0))
+            ls_legs.append((math.atan2(x1 - x0, z1 - z0) % (2*math.pi),
+                            length))
+        return ls_legs
+
+    def transitions(self):
+        """ Finds the easement - static - easement transition at each
+            interior IP, returning a list of curve lists as given by
+            curve_fit_radius. Raises AlignmentError if a transition cannot
+            be fitted or if neighbouring transitions overlap.
+        """
+        legs = self.legs()
+        ls_curves = []
+        for i, (radius, speed) in enumerate(zip(self.radii, self.speeds)):
+            b_in, b_out = legs[i][0], legs[i+1][0]
+            start = TrackCoord(*self.points[i], rotation=b_in, quad=Q.NONE,
+                               curvature=0)
+            other = TrackCoord(*self.points[i+2], rotation=b_out,
+                               quad=Q.NONE, curvature=0)
+            track = TrackCurve(start, radius, speed, self.split_static)
+            try:
+                ls_curves.append(track.curve_fit_radius(other, radius))
+            except CurveError as err:
+                raise AlignmentError('IP {0}: {1}'.format(i + 1, err)) \
+                    from err
+
+        # Check that each straight is long enough to fit both its tangents
+        for j, (bearing, length) in enumerate(legs):
+            x0, z0 = self.points[j]
+            if j > 0:
+                end = ls_curves[j-1][-1]
+                used_start = self._along(bearing, (x0, z0), end)
+            else:
+                used_start = 0
+            if j < len(legs) - 1:
+                start = ls_curves[j][0]
+                used_end = self._along(bearing, (x0, z0), start)
+            else:
+                used_end = length
+
+            if used_start - used_end > self.tolerance:
+                raise AlignmentError(
+                    'The transitions at IPs {0} and {1} overlap by {2:.3f} '
+                    'm; consider reducing their radii or moving the IPs '
+                    'apart.'.format(j, j + 1, used_start - used_end))
+
+        return ls_curves
+
+    @staticmethod
+    def _along(bearing, origin, coord):
+        """ Distance of coord along a straight from origin with bearing. """
+        return ((coord.pos_x - origin[0]) * math.sin(bearing)
+                + (coord.pos_z - origin[1]) * math.cos(bearing))
+
+    def sections(self):
+        """ Assembles the straights and transitions into one continuous list
+            of TrackCoord objects starting at the first IP, and returns it
+            along with a list of the cumulative chainage at the end of each
+            section.
+        """
+        legs = self.legs()
+        ls_curves = self.transitions()
+
+        x0, z0 = self.points[0]
+        ls_sections = [TrackCoord(x0, z0, rotation=legs[0][0], quad=Q.NONE,
+                                  curvature=0)]
+        for j, (bearing, length) in enumerate(legs):
+            if j < len(legs) - 1:
+                end = ls_curves[j][0]
+                end_point = (end.pos_x, end.pos_z)
+            else:
+                end_point = self.points[-1]
+
+            prev = ls_sections[-1]
+            straight_length = math.hypot(end_point[0] - prev.pos_x,
+                                         end_point[1] - prev.pos_z)
+            if straight_length > self.tolerance:
+                ls_sections.append(TrackCoord(
+                    *end_point, rotation=bearing, quad=Q.NONE, curvature=0,
+                    org_length=straight_length, org_curvature=0,
+                    org_type='straight'))
+            if j < len(legs) - 1:
+                ls_sections += ls_curves[j][1:]
+
+        chainage, total = [0], 0
+        for s in ls_sections[1:]:
+            total += s.org_length
+            chainage.append(total)
+
+        return ls_sections, chainage
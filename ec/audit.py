@@ -0,0 +1,187 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Audit of existing track sections against speed tolerance and continuity
+
+import csv
+from enum import Enum
+import math
+
+from ec.sample import SampleError, SectionGeometry
+from ec.section import TrackSection
+
+
+class Check(Enum):
+    """ Type of problem found with a track section. """
+    EASEMENT_SPEED, POSITION, BEARING, CURVATURE, GEOMETRY = range(5)
+
+
+class Finding(object):
+    """ A problem with the section at a position in the route. value is the
+        measured quantity and limit the value it should be within: speed
+        tolerance (km/h) for easements, distance (m) for position and
+        geometry, angle (rad) for bearing and curvature (1/m).
+    """
+    messages = {
+        Check.EASEMENT_SPEED: 'Easement curve only long enough for speed '
+                              'tolerance {value:.1f} instead of {limit:.1f}',
+        Check.POSITION: 'Gap of {value:.3f} m from the previous section',
+        Check.BEARING: 'Change in bearing of {value:.6f} rad from the '
+                       'previous section',
+        Check.CURVATURE: 'Change in curvature of {value:.6f} from the '
+                         'previous section',
+        Check.GEOMETRY: 'End point {value:.3f} m away from the end of the '
+                        'section geometry'
+    }
+
+    def __init__(self, index, check, value, limit):
+        self.index, self.check = index, check
+        self.value, self.limit = value, limit
+
+    @property
+    def message(self):
+        return self.messages[self.check].format(value=self.value,
+                                                limit=self.limit)
+
+    def __repr__(self):
+        return 'Section {0}: {1}'.format(self.index, self.message)
+
+
+def factor_of(length, start_curvature, end_curvature):
+    """ Normalisation factor of an easement curve from its length and its
+        curvature at each end, inverting TrackSection.easement_length. The
+        curvature can change sign along the easement, eg in a reverse curve.
+    """
+    change = abs(end_curvature - start_curvature)
+    if change == 0:
+        raise ValueError('The curvature must change along an easement '
+                         'curve.')
+    return length / change
+
+
+def speed_of(factor):
+    """ Speed tolerance (km/h) giving a normalisation factor, inverting
+        TrackSection.factor.
+    """
+    ts = TrackSection
+    return ts.n_speed * (factor / (ts.n_length * ts.n_radius)) ** (1/3)
+
+
+def inferred_speed(section):
+    """ Effective speed tolerance (km/h) of the easement curve ending at a
+        TrackCoord object.
+    """
+    return speed_of(factor_of(section.org_length, section.org_curvature or 0,
+                              section.curvature or 0))
+
+
+class Auditor(object):
+    """ Checks track sections given as (start, end) pairs of TrackCoord
+        objects, eg as read from a route, where the start of each section
+        should match the end of the one before. Easement curves must be long
+        enough for the speed tolerance, which is either the same for every
+        section or given as a third item (start, end, speed) for each.
+        Tolerances:
+            margin: speed tolerance (km/h) allowed below the required speed
+            distance: gap (m) allowed between sections and at the end of
+            each section compared with its geometry
+            angle: change in bearing (rad) between sections
+            curvature: change in curvature (1/m) between sections
+    """
+
+    def __init__(self, speed=None, margin=0.5, distance=1e-3, angle=1e-5,
+                 curvature=1e-6, order=1):
+        self.speed, self.margin = speed, margin
+        self.distance, self.angle, self.curvature = distance, angle, curvature
+        self.order = order
+        self.counts = {c: 0 for c in Check}
+        self.sections = 0
+
+    @staticmethod
+    def _angle_diff(b1, b2):
+        return abs((b2 - b1 + math.pi) % (2*math.pi) - math.pi)
+
+    def check(self, index, start, end, speed=None, previous=None):
+        """ Returns a list of Finding objects for one section, with the end
+            of the previous section if there is one.
+        """
+        found = []
+        if previous is not None:
+            gap = math.hypot(start.pos_x - previous.pos_x,
+                             start.pos_z - previous.pos_z)
+            if gap > self.distance:
+                found.append(Finding(index, Check.POSITION, gap,
+                                     self.distance))
+            turn = self._angle_diff(previous.bearing.rad, start.bearing.rad)
+            if turn > self.angle:
+                found.append(Finding(index, Check.BEARING, turn, self.angle))
+            change = abs((start.curvature or 0) - (previous.curvature or 0))
+            if change > self.curvature:
+                found.append(Finding(index, Check.CURVATURE, change,
+                                     self.curvature))
+
+        speed = self.speed if speed is None else speed
+        if end.org_type == 'easement' and speed is not None:
+            try:
+                effective = inferred_speed(end)
+            except ValueError:
+                effective = 0
+            if effective < speed - self.margin:
+                found.append(Finding(index, Check.EASEMENT_SPEED, effective,
+                                     speed))
+
+        if end.org_length is not None:
+            try:
+                geometry = SectionGeometry(start, end, self.order)
+            except SampleError:
+                pass
+            else:
+                x, z = geometry.point(geometry.length)[:2]
+                miss = math.hypot(x - end.pos_x, z - end.pos_z)
+                if miss > self.distance:
+                    found.append(Finding(index, Check.GEOMETRY, miss,
+                                         self.distance))
+
+        for f in found:
+            self.counts[f.check] += 1
+        self.sections += 1
+        return found
+
+    def audit(self, sections):
+        """ Checks each of an iterable of (start, end) or (start, end,
+            speed) tuples in turn, yielding Finding objects as they are
+            found.
+        """
+        previous = None
+        for index, item in enumerate(sections):
+            start, end = item[0], item[1]
+            speed = item[2] if len(item) > 2 else None
+            yield from self.check(index, start, end, speed, previous)
+            previous = end
+
+    def summary(self):
+        """ Returns a dict of the number of findings of each type, and the
+            number of sections checked.
+        """
+        result = {c.name: n for c, n in self.counts.items()}
+        result['sections'] = self.sections
+        return result
+
+
+def chain(coords):
+    """ Converts a list of TrackCoord objects as returned by the TrackCurve
+        methods into (start, end) pairs for Auditor.audit.
+    """
+    return zip(coords[:-1], coords[1:])
+
+
+def write_report(findings, csv_file, header=True):
+    """ Writes findings to an open file object as CSV as they are found,
+        returning the number written.
+    """
+    writer = csv.writer(csv_file)
+    if header:
+        writer.writerow(('section', 'check', 'value', 'limit', 'message'))
+    n = 0
+    for f in findings:
+        writer.writerow((f.index, f.check.name, f.value, f.limit, f.message))
+        n += 1
+    return n
@@ -0,0 +1,246 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Batch curve fitting with columnar inputs and fixed-width results
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+import math
+from multiprocessing import shared_memory
+
+from ec import columnar
+from ec.columnar import Table
+from ec.common import Status
+from ec.coord import CoordError, Q, TrackCoord
+from ec.curve import CurveError, TrackCurve
+from ec.section import TrackError
+
+
+class Method(Enum):
+    """ Curve fitting method for each row of a batch. """
+    RADIUS, LENGTH, POINT = range(3)
+
+
+# Input columns; value is the radius or length, unused for POINT. clockwise
+# is 1 or 0 to set the direction of the curve or -1 to find it.
+INPUT_COLUMNS = ('method', 'start_x', 'start_z', 'start_bearing',
+                 'start_curvature', 'end_x', 'end_z', 'end_bearing', 'value',
+                 'minimum', 'speed', 'clockwise')
+INPUT_TYPES = {'method': 'q', 'clockwise': 'q'}
+
+# Results have a fixed number of sections after the start point; rows with
+# fewer sections have NaN in the unused columns and type 0. The type of each
+# section is an index into TYPES.
+SECTIONS = 4
+TYPES = (None, 'straight', 'static', 'easement')
+_type_codes = {t: i for i, t in enumerate(TYPES)}
+_section_columns = ('x', 'z', 'bearing', 'curvature', 'length', 'type')
+RESULT_COLUMNS = ('status', 'sections', 'start_x', 'start_z',
+                  'start_bearing', 'start_curvature') + tuple(
+    '{0}{1}'.format(c, i) for i in range(1, SECTIONS + 1)
+    for c in _section_columns)
+RESULT_TYPES = dict({'status': 'q', 'sections': 'q'},
+                    **{'type{}'.format(i): 'q'
+                       for i in range(1, SECTIONS + 1)})
+
+
+class BatchError(Exception):
+    pass
+
+
+def solve_row(row, order=1):
+    """ Fits a curve for one row of inputs, given as a dict. Returns a tuple
+        of Status and list of TrackCoord objects (empty if the status is
+        not OK).
+    """
+    try:
+        method = Method(int(row['method']))
+        clockwise = {-1: None, 0: False, 1: True}[int(row['clockwise'])]
+        start = TrackCoord(row['start_x'], row['start_z'],
+                           row['start_bearing'], Q.NONE,
+                           curvature=row['start_curvature'])
+        end = TrackCoord(row['end_x'], row['end_z'], row['end_bearing'],
+                         Q.NONE, curvature=0)
+        track = TrackCurve(start, row['minimum'], row['speed'], split=False,
+                           order=order)
+        if method is Method.RADIUS:
+            curve = track.curve_fit_radius(end, row['value'], clockwise)
+        elif method is Method.LENGTH:
+            curve = track.curve_fit_length(end, row['value'], clockwise)
+        else:
+            curve = track.curve_fit_point(end)
+    except (CurveError, TrackError) as err:
+        return err.code, []
+    except (CoordError, KeyError, ValueError, TypeError, ArithmeticError):
+        return Status.INVALID, []
+
+    if len(curve) > SECTIONS + 1:
+        return Status.INVALID, []
+    return Status.OK, curve
+
+
+def write_row(results, index, status, curve):
+    """ Writes the status and sections of a curve to a row of results. """
+    results['status'][index] = status.value
+    results['sections'][index] = max(len(curve) - 1, 0)
+    nan = math.nan
+    if curve:
+        first = curve[0]
+        results['start_x'][index] = first.pos_x
+        results['start_z'][index] = first.pos_z
+        results['start_bearing'][index] = first.bearing.rad
+        results['start_curvature'][index] = first.curvature or 0
+    else:
+        results['start_x'][index] = results['start_z'][index] = \
+            results['start_bearing'][index] = \
+            results['start_curvature'][index] = nan
+
+    for i in range(1, SECTIONS + 1):
+        if i < len(curve):
+            s = curve[i]
+            values = (s.pos_x, s.pos_z, s.bearing.rad, s.curvature,
+                      s.org_length, _type_codes[s.org_type])
+        else:
+            values = (nan,) * (len(_section_columns) - 1) + (0,)
+        for c, v in zip(_section_columns, values):
+            results['{0}{1}'.format(c, i)][index] = v
+
+
+def solve(inputs, results, start=0, stop=None, order=1):
+    """ Fits curves for rows start to stop of inputs, writing each to the
+        same row of results. Both are Table objects or dicts of columns,
+        eg memory mapped tables so each worker only touches its own rows.
+        Returns the number of rows with Status.OK.
+    """
+    stop = len(inputs['method']) if stop is None else stop
+    columns = [(n, inputs[n]) for n in INPUT_COLUMNS]
+    ok = 0
+    for i in range(start, stop):
+        status, curve = solve_row({n: c[i] for n, c in columns}, order)
+        write_row(results, i, status, curve)
+        ok += status is Status.OK
+    return ok
+
+
+def _check_columns(names):
+    missing = set(INPUT_COLUMNS) - set(names)
+    if missing:
+        raise BatchError('Input columns missing: {}.'
+                         ''.format(', '.join(sorted(missing))))
+
+
+def write_inputs(path, columns):
+    """ Writes a dict of input column name to sequence of values to a new
+        table file.
+    """
+    _check_columns(columns)
+    columnar.write(path, {n: columns[n] for n in INPUT_COLUMNS}, INPUT_TYPES)
+
+
+def run(input_path, output_path, order=1):
+    """ Fits curves for every row of an input table file, writing a result
+        table file with the same number of rows. Returns the number of rows
+        with Status.OK.
+    """
+    with Table.open(input_path) as inputs:
+        _check_columns(inputs.names)
+        with Table.create(output_path, RESULT_COLUMNS, len(inputs),
+                          RESULT_TYPES) as results:
+            ok = solve(inputs, results, order=order)
+            results.flush()
+    return ok
+
+
+def read_result(results, index):
+    """ Reads a row of results by index. Returns a tuple of Status and list
+        of TrackCoord objects, starting with the start point.
+    """
+    try:
+        status = Status(results['status'][index])
+        if status is not Status.OK:
+            return status, []
+        curve = [TrackCoord(results['start_x'][index],
+                            results['start_z'][index],
+                            results['start_bearing'][index], Q.NONE,
+                            curvature=results['start_curvature'][index])]
+        for i in range(1, results['sections'][index] + 1):
+            x, z, b, k, length, t = [results['{0}{1}'.format(c, i)][index]
+                                     for c in _section_columns]
+            # Each section starts with the curvature the last one ended with
+            curve.append(TrackCoord(x, z, b, Q.NONE, curvature=k,
+                                    org_curvature=curve[-1].curvature,
+                                    org_length=length, org_type=TYPES[t]))
+    except (KeyError, columnar.ColumnarError) as err:
+        raise BatchError('The results do not have the columns of this '
+                         'version.') from err
+    return status, curve
+
+
+def _shared_table(names, length, types):
+    """ Creates a table in a new block of shared memory. """
+    types = [types.get(n, 'd') for n in names]
+    header = columnar.make_header(names, types, length)
+    shm = shared_memory.SharedMemory(
+        create=True, size=max(columnar.table_size(len(names), length), 1))
+    shm.buf[:len(header)] = header
+    return shm, Table.from_buffer(shm.buf)
+
+
+def _solve_shared(input_name, result_name, start, stop, order):
+    """ Worker for execute: attaches to the shared tables by name and solves
+        its own range of rows in place.
+    """
+    blocks = [shared_memory.SharedMemory(name=input_name),
+              shared_memory.SharedMemory(name=result_name)]
+    inputs, results = (Table.from_buffer(b.buf) for b in blocks)
+    try:
+        return solve(inputs, results, start, stop, order)
+    finally:
+        inputs.close()
+        results.close()
+        for b in blocks:
+            b.close()
+
+
+def execute(inputs, processes=None, chunk=1000, order=1):
+    """ Fits curves for every row of inputs, a Table or dict of input
+        columns, with a pool of worker processes. The inputs are copied once
+        into shared memory along with an empty result table; each worker is
+        only sent the names of the blocks and a range of rows, and writes
+        its results in place. Returns a tuple of the number of rows with
+        Status.OK and a dict of result columns as arrays.
+    """
+    _check_columns(list(inputs.names if isinstance(inputs, Table)
+                        else inputs))
+    if chunk < 1:
+        raise BatchError('The chunk size must be at least 1.')
+    length = len(inputs['method'])
+
+    shm_in, table_in = _shared_table(INPUT_COLUMNS, length, INPUT_TYPES)
+    shm_out, table_out = _shared_table(RESULT_COLUMNS, length, RESULT_TYPES)
+    try:
+        for n in INPUT_COLUMNS:
+            column = table_in[n]
+            values = inputs[n]
+            if isinstance(values, array):
+                code = values.typecode
+            else:
+                code = getattr(values, 'format', None)
+            if code != column.format:
+                values = array(column.format, values)
+            column[:] = values
+
+        ranges = [(i, min(i + chunk, length)) for i in range(0, length, chunk)]
+        with ProcessPoolExecutor(processes) as pool:
+            futures = [pool.submit(_solve_shared, shm_in.name, shm_out.name,
+                                   a, b, order) for a, b in ranges]
+            ok = sum(f.result() for f in futures)
+
+        result = {n: array(table_out[n].format, table_out[n].tobytes())
+                  for n in RESULT_COLUMNS}
+    finally:
+        table_in.close()
+        table_out.close()
+        for shm in (shm_in, shm_out):
+            shm.close()
+            shm.unlink()
+    return ok, result
@@ -0,0 +1,137 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Position lookup by chainage along a list of track sections
+
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from operator import le
+
+from ec.sample import SectionGeometry
+
+
+class ChainageError(Exception):
+    pass
+
+
+class ChainageIndex(object):
+    """ Index of cumulative chainage over a list of TrackCoord objects as
+        returned by the TrackCurve methods, or a chain of them joined end to
+        end. The first TrackCoord is the starting point at chainage start.
+        Positions are found by binary search for the section followed by
+        evaluation within the section with SectionGeometry. order is the
+        Fresnel series order, as with TrackSection.
+    """
+
+    def __init__(self, sections, start=0, order=1):
+        if len(sections) < 2:
+            raise ChainageError('At least two TrackCoord objects are needed.')
+        self.geometry = [SectionGeometry(s, e, order)
+                         for s, e in zip(sections[:-1], sections[1:])]
+        self.starts = array('d', [start])
+        for g in self.geometry:
+            self.starts.append(self.starts[-1] + g.length)
+        self.start, self.end = start, self.starts[-1]
+
+    @classmethod
+    def from_curves(cls, curves, start=0, order=1):
+        """ Creates an index over several lists of TrackCoord objects, each
+            starting where the previous one ends.
+        """
+        sections = list(curves[0])
+        for curve in curves[1:]:
+            sections += curve[1:]
+        return cls(sections, start, order)
+
+    def __len__(self):
+        return len(self.geometry)
+
+    @property
+    def length(self):
+        return self.end - self.start
+
+    def section(self, chainage):
+        """ Index of the section containing a chainage. A chainage at the
+            boundary between two sections is in the second section, except
+            at the end of the last section.
+        """
+        if not self.start <= chainage <= self.end:
+            raise ChainageError('Chainage {0} is outside the range [{1}, '
+                                '{2}].'.format(chainage, self.start,
+                                               self.end))
+        return min(bisect_right(self.starts, chainage) - 1,
+                   len(self.geometry) - 1)
+
+    def at(self, chainage):
+        """ Returns (x, z, bearing, curvature) at a chainage, with the
+            bearing in radians.
+        """
+        i = self.section(chainage)
+        return self.geometry[i].point(chainage - self.starts[i])
+
+    def query(self, chainages, out=None):
+        """ Finds (x, z, bearing, curvature) for each of a sequence or
+            iterable of chainages. If the chainages are in ascending order the sections
+            are found by walking along the index instead of binary search.
+            If out is given, eg a preallocated array('d'), it is filled with
+            rows of 4 values; otherwise returns a list of tuples. Sorted
+            chainages with out given are evaluated a section at a time with
+            SectionGeometry.fill, taking about 0.8 s per million on a fitted
+            curve in CPython; other inputs are about twice as slow.
+        """
+        if out is not None:
+            if not hasattr(chainages, '__getitem__'):
+                # Iterators are read twice and sliced, so need a list
+                chainages = list(chainages)
+            if _ascending(chainages):
+                return self._query_sorted(chainages, out)
+
+        result = [] if out is None else out
+        starts, geometry = self.starts, self.geometry
+        last = len(geometry) - 1
+        i, previous = 0, None
+
+        for n, chainage in enumerate(chainages):
+            if previous is not None and chainage >= previous:
+                # Move forward from the last section found
+                while i < last and starts[i+1] <= chainage:
+                    i += 1
+                if chainage > self.end:
+                    raise ChainageError('Chainage {0} is outside the range '
+                                        '[{1}, {2}].'.format(
+                                            chainage, self.start, self.end))
+            else:
+                i = self.section(chainage)
+            previous = chainage
+
+            row = geometry[i].point(chainage - starts[i])
+            if out is None:
+                result.append(row)
+            else:
+                out[4*n], out[4*n+1], out[4*n+2], out[4*n+3] = row
+
+        return result
+
+    def _query_sorted(self, chainages, out):
+        """ query() for chainages in ascending order, filling out with each
+            run of chainages in the same section at once.
+        """
+        n = len(chainages)
+        if n and not (self.start <= chainages[0] and chainages[-1] <= self.end):
+            bad = chainages[0] if chainages[0] < self.start else chainages[-1]
+            raise ChainageError('Chainage {0} is outside the range [{1}, '
+                                '{2}].'.format(bad, self.start, self.end))
+        starts, geometry = self.starts, self.geometry
+        last = len(geometry) - 1
+        j = 0
+        while j < n:
+            i = self.section(chainages[j])
+            # Chainages up to the start of the next section, or to the end
+            k = n if i == last else bisect_left(chainages, starts[i+1], j)
+            s0 = starts[i]
+            geometry[i].fill(out, j, [c - s0 for c in chainages[j:k]])
+            j = k
+        return out
+
+
+def _ascending(values):
+    return all(map(le, values, islice(values, 1, None)))
@@ -0,0 +1,158 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Clearance checks between fitted alignments
+
+import math
+
+from ec.projection import Projector
+
+
+class ClearanceError(Exception):
+    pass
+
+
+class Clearance(object):
+    """ Closest approach between two alignments, with the chainage on each
+        alignment where it occurs. crossing is True if the alignments cross.
+    """
+
+    def __init__(self, first, second, distance, first_chainage,
+                 second_chainage, crossing=False):
+        self.first, self.second = first, second
+        self.distance = distance
+        self.first_chainage = first_chainage
+        self.second_chainage = second_chainage
+        self.crossing = crossing
+
+    def __repr__(self):
+        return 'Clearance {0!r} at {1:.3f} - {2!r} at {3:.3f}: {4:.3f}{5}' \
+               ''.format(self.first, self.first_chainage, self.second,
+                         self.second_chainage, self.distance,
+                         ' (crossing)' if self.crossing else '')
+
+
+def _segments_cross(a, b, c, d):
+    """ Checks whether the segments ab and cd cross, returning the fraction
+        along ab and along cd where they do, or None.
+    """
+    rx, rz = b[0] - a[0], b[1] - a[1]
+    sx, sz = d[0] - c[0], d[1] - c[1]
+    w = rx * sz - rz * sx
+    if w == 0:
+        return None
+    qx, qz = c[0] - a[0], c[1] - a[1]
+    t, u = (qx * sz - qz * sx) / w, (qx * rz - qz * rx) / w
+    if 0 <= t <= 1 and 0 <= u <= 1:
+        return t, u
+    return None
+
+
+class ClearanceChecker(object):
+    """ Finds pairs of alignments closer than a set spacing. Each alignment
+        is a list of TrackCoord objects as returned by the TrackCurve
+        methods, with a key to identify it (by default its position in the
+        list). Sections whose bounding boxes, widened by the spacing,
+        overlap are found by sweep and prune along x, and the distance
+        between them found from their geometry.
+    """
+    refinements = 20
+
+    def __init__(self, alignments, keys=None, order=1):
+        if keys is None:
+            keys = list(range(len(alignments)))
+        elif len(keys) != len(alignments):
+            raise ClearanceError('There must be one key for each alignment.')
+        self.keys = list(keys)
+        self.projectors = [Projector(a, order=order) for a in alignments]
+
+    def candidates(self, spacing):
+        """ Returns a set of tuples (a, i, b, j) for section i of alignment
+            a and section j of alignment b, a < b, with bounding boxes
+            within spacing of each other.
+        """
+        boxes = [(box, a, i) for a, p in enumerate(self.projectors)
+                 for i, box in enumerate(p.boxes)]
+        boxes.sort(key=lambda e: e[0][0])
+
+        result, active = set(), []
+        for box, a, i in boxes:
+            # Remove boxes ending before this one starts
+            active = [e for e in active if e[0][2] + spacing >= box[0]]
+            for other, b, j in active:
+                if a != b and other[1] <= box[3] + spacing \
+                        and box[1] <= other[3] + spacing:
+                    result.add((a, i, b, j) if a < b else (b, j, a, i))
+            active.append((box, a, i))
+
+        return result
+
+    def _section_distance(self, a, i, b, j):
+        """ Closest points between section i of alignment a and section j of
+            alignment b. Returns a tuple (distance, length along i, length
+            along j, crossing).
+        """
+        pa, pb = self.projectors[a], self.projectors[b]
+        ga, gb = pa.index.geometry[i], pb.index.geometry[j]
+        coarse_a, coarse_b = pa.coarse[i], pb.coarse[j]
+
+        # Crossing sections found from their coarse polylines
+        for m in range(len(coarse_a) - 1):
+            for n in range(len(coarse_b) - 1):
+                t = _segments_cross(coarse_a[m][1:], coarse_a[m+1][1:],
+                                    coarse_b[n][1:], coarse_b[n+1][1:])
+                if t is not None:
+                    sa = coarse_a[m][0] + t[0] * (coarse_a[m+1][0]
+                                                  - coarse_a[m][0])
+                    sb = coarse_b[n][0] + t[1] * (coarse_b[n+1][0]
+                                                  - coarse_b[n][0])
+                    return 0, sa, sb, True
+
+        # Start from the closest pair of points projected between sections
+        best = (math.inf, 0, 0)
+        for s, x, z in coarse_a:
+            sb, dist = pb.section_nearest(j, x, z)
+            best = min(best, (dist, s, sb))
+        for s, x, z in coarse_b:
+            sa, dist = pa.section_nearest(i, x, z)
+            best = min(best, (dist, sa, s))
+
+        # Alternate projections onto each section until they settle
+        dist, sa, sb = best
+        for _ in range(self.refinements):
+            x, z = gb.point(sb)[:2]
+            sa_new = pa.section_nearest(i, x, z)[0]
+            x, z = ga.point(sa_new)[:2]
+            sb_new, dist_new = pb.section_nearest(j, x, z)
+            if dist_new > dist:
+                break
+            settled = abs(sa_new - sa) < 1e-9 and abs(sb_new - sb) < 1e-9
+            dist, sa, sb = dist_new, sa_new, sb_new
+            if settled:
+                break
+
+        return math.sqrt(dist), sa, sb, False
+
+    def check(self, spacing):
+        """ Returns a list of Clearance objects for each pair of alignments
+            closer than spacing, with the closest first.
+        """
+        closest = {}
+        for a, i, b, j in self.candidates(spacing):
+            dist, sa, sb, crossing = self._section_distance(a, i, b, j)
+            if dist < spacing and ((a, b) not in closest
+                                   or dist < closest[a, b][0]):
+                ca = self.projectors[a].index.starts[i] + sa
+                cb = self.projectors[b].index.starts[j] + sb
+                closest[a, b] = (dist, ca, cb, crossing)
+
+        result = [Clearance(self.keys[a], self.keys[b], dist, ca, cb,
+                            crossing)
+                  for (a, b), (dist, ca, cb, crossing) in closest.items()]
+        result.sort(key=lambda c: c.distance)
+        return result
+
+
+def check_clearance(alignments, spacing, keys=None, order=1):
+    """ Finds pairs of alignments closer than spacing, as with
+        ClearanceChecker.check.
+    """
+    return ClearanceChecker(alignments, keys, order).check(spacing)
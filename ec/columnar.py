@@ -0,0 +1,216 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Columnar binary tables for batch inputs and results, read with mmap
+
+from array import array
+import mmap
+import struct
+import sys
+
+MAGIC = b'ECOL'
+# Version 2: batch results with section types and start curvature
+VERSION = 2
+# Magic, version, number of columns and number of rows
+_header = struct.Struct('<4sHHQ')
+# Name of each column and its type: 'd' for float64 or 'q' for int64
+_column = struct.Struct('<15sc')
+TYPES = ('d', 'q')
+WIDTH = 8
+
+
+class ColumnarError(Exception):
+    pass
+
+
+class Table(object):
+    """ A table stored as a header followed by each column in turn as
+        little-endian 8-byte values, accessed through a memory map. Columns
+        are memoryview objects on the map, so slices of them can be read or
+        written without copying. Open a file with Table.open or create one
+        with Table.create; tables are also context managers which close the
+        file on exit. Any memoryviews taken from the columns must be
+        released before closing.
+    """
+
+    def __init__(self, buffer, names, types, length, closing=()):
+        self.names, self.types, self.length = names, types, length
+        self._buffer = buffer
+        self._closing = closing
+        self._views = []
+        self.columns = {}
+        view = memoryview(buffer)
+        self._views.append(view)
+        offset = data_offset(len(names))
+        for name, code in zip(names, types):
+            size = length * WIDTH
+            column = view[offset:offset+size].cast(code)
+            self._views.append(column)
+            self.columns[name] = column
+            offset += size
+
+    @classmethod
+    def open(cls, path, write=False):
+        """ Opens an existing table with a memory map, read only unless
+            write is True.
+        """
+        f = open(path, 'r+b' if write else 'rb')
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE
+                               if write else mmap.ACCESS_READ)
+        except ValueError as err:
+            f.close()
+            raise ColumnarError('{!r} is empty.'.format(path)) from err
+        try:
+            names, types, length = read_header(buffer)
+        except ColumnarError:
+            buffer.close()
+            f.close()
+            raise
+        return cls(buffer, names, types, length, (buffer, f))
+
+    @classmethod
+    def create(cls, path, names, length, types=None):
+        """ Creates a table file with the columns names, all zero, and opens
+            it for writing. types is a dict of column name to type code for
+            any column that is not float64.
+        """
+        types = [(types or {}).get(n, 'd') for n in names]
+        header = make_header(names, types, length)
+        with open(path, 'wb') as f:
+            f.write(header)
+            f.truncate(len(header) + len(names) * length * WIDTH)
+        return cls.open(path, write=True)
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """ Uses a table already in a writable buffer, eg shared memory. """
+        names, types, length = read_header(buffer)
+        return cls(buffer, names, types, length)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, name):
+        try:
+            return self.columns[name]
+        except KeyError as err:
+            raise ColumnarError('No column {!r}.'.format(name)) from err
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def row(self, index):
+        """ Returns a row by index as a dict of column values. """
+        if not -self.length <= index < self.length:
+            raise ColumnarError('Row {} out of range.'.format(index))
+        return {n: self.columns[n][index] for n in self.names}
+
+    def rows(self, start=0, stop=None):
+        """ Yields rows from start to stop as tuples, in the same order as
+            names.
+        """
+        stop = self.length if stop is None else min(stop, self.length)
+        columns = [self.columns[n] for n in self.names]
+        for i in range(start, stop):
+            yield tuple(c[i] for c in columns)
+
+    def flush(self):
+        if hasattr(self._buffer, 'flush'):
+            self._buffer.flush()
+
+    def close(self):
+        """ Releases the columns and closes the memory map and file. """
+        for view in reversed(self._views):
+            view.release()
+        self._views, self.columns = [], {}
+        try:
+            for c in self._closing:
+                c.close()
+        except BufferError as err:
+            raise ColumnarError('Views of the columns are still in use.') \
+                from err
+
+
+def data_offset(n_columns):
+    return _header.size + n_columns * _column.size
+
+
+def table_size(n_columns, length):
+    """ Number of bytes needed for a table. """
+    return data_offset(n_columns) + n_columns * length * WIDTH
+
+
+def make_header(names, types, length):
+    if sys.byteorder != 'little':
+        raise ColumnarError('Tables are only supported on little-endian '
+                            'machines.')
+    if len(set(names)) != len(names):
+        raise ColumnarError('Column names must be unique.')
+    parts = [_header.pack(MAGIC, VERSION, len(names), length)]
+    for name, code in zip(names, types):
+        if code not in TYPES:
+            raise ColumnarError('Type {!r} must be one of {}.'
+                                ''.format(code, TYPES))
+        encoded = name.encode('ascii')
+        if len(encoded) > _column.size - 1:
+            raise ColumnarError('Column name {!r} is too long.'.format(name))
+        parts.append(_column.pack(encoded, code.encode('ascii')))
+    return b''.join(parts)
+
+
+def read_header(buffer):
+    """ Returns the column names, types and number of rows in a table. """
+    try:
+        magic, version, n, length = _header.unpack_from(buffer)
+    except struct.error as err:
+        raise ColumnarError('The header is incomplete.') from err
+    if magic != MAGIC:
+        raise ColumnarError('Not a columnar table.')
+    if version != VERSION:
+        raise ColumnarError('Unsupported version {}.'.format(version))
+    if len(buffer) < table_size(n, length):
+        raise ColumnarError('The table is shorter than its header states.')
+    names, types = [], []
+    for i in range(n):
+        name, code = _column.unpack_from(buffer, _header.size + i*_column.size)
+        names.append(name.rstrip(b'\0').decode('ascii'))
+        types.append(code.decode('ascii'))
+    return names, types, length
+
+
+def write(path, columns, types=None):
+    """ Writes a dict of column name to sequence of values to a new table
+        file. All columns must be the same length; arrays with type code
+        'q' are stored as int64.
+    """
+    names = list(columns)
+    lengths = {len(columns[n]) for n in names}
+    if len(lengths) > 1:
+        raise ColumnarError('Columns must be the same length.')
+    types = dict(types or {})
+    for n in names:
+        if getattr(columns[n], 'typecode', None) == 'q':
+            types.setdefault(n, 'q')
+    length = lengths.pop() if lengths else 0
+
+    with Table.create(path, names, length, types) as table:
+        for n in names:
+            values = columns[n]
+            code = table.types[table.names.index(n)]
+            if not isinstance(values, array) or values.typecode != code:
+                values = array(code, values)
+            table[n][:] = values
+        table.flush()
+
+
+def read(path, names=None):
+    """ Reads columns from a table file into a dict of arrays. """
+    with Table.open(path) as table:
+        names = table.names if names is None else names
+        result = {}
+        for n in names:
+            column = table[n]
+            result[n] = array(column.format, column.tobytes())
+        return result
@@ -1,9 +1,20 @@
 # MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
 # Independent functions/classes for use with track calculations
 
+from array import array
+from enum import Enum
 import math
 
 
+class Status(Enum):
+    """ Outcome of checking whether a curve can be fitted. Also carried as
+        the code attribute of CurveError and TrackError exceptions.
+    """
+    OK, INVALID, NOT_STRAIGHT, PARALLEL, REVERSE_PARALLEL, SAME_ALIGNMENT, \
+        CURVED_AWAY, NOT_ALIGNED, EASEMENTS_TOO_LONG, RADIUS_BELOW_MINIMUM, \
+        START_TOO_CLOSE, NO_SOLUTION = range(12)
+
+
 def transform(a, r, b=(0, 0), c=None):
     """ Rotates a point a = (x, y) around axis b = (x0, y0) by r clockwise
         and translates by c = (x1, y1) such that b -> c.
@@ -61,6 +72,10 @@ class Bearing(object):
     def rad(self, value):
         self._rad = value % (2*math.pi)
 
+    def __reduce__(self):
+        # Pickled as the angle in radians only
+        return Bearing, (self._rad, True)
+
     def __str__(self):
         return "Bearing {0} degrees / {1} radians".format(self.deg, self.rad)
 
@@ -131,6 +146,48 @@ class Bearing(object):
             return any(round(self.rad-j, places) == 0 for j in vl)
 
 
+def normalise_bearings(angles, rad=True):
+    """ Normalises a sequence of angles to bearings in radians in the range
+        [0, 2pi), as with the Bearing rad and deg setters. Returns an array.
+    """
+    if rad:
+        tau = 2*math.pi
+        return array('d', (a % tau for a in angles))
+    else:
+        return array('d', (math.radians(a % 360) for a in angles))
+
+
+def flip_bearings(bearings):
+    """ Bearings in radians pointing in the opposite direction, as with
+        Bearing.flip. Returns an array.
+    """
+    tau, pi = 2*math.pi, math.pi
+    return array('d', ((b + pi) % tau for b in bearings))
+
+
+def abs_bearings(bearings):
+    """ Absolute values of bearings in radians, treating bearings greater
+        than pi as negative, as with abs(Bearing). Returns an array.
+    """
+    tau, pi = 2*math.pi, math.pi
+    return array('d', ((tau - b) % tau if b > pi else b for b in bearings))
+
+
+def bearings_nearly_equal(first, second, places=7, both=False):
+    """ Checks whether each pair of bearings in radians from the sequences
+        first and second are almost equal, as with Bearing.nearly_equal.
+        If both: also tests the flipped bearings from second. Returns a list
+        of bools.
+    """
+    if both:
+        return [a == b or a == c or round(a - b, places) == 0
+                or round(a - c, places) == 0
+                for a, b, c in zip(first, second, flip_bearings(second))]
+    else:
+        return [a == b or round(a - b, places) == 0
+                for a, b in zip(first, second)]
+
+
 class LinearEquation(object):
     """ Defines a linear equation in Cartesian coordinates with the bearing r
         through a point (u, v).
@@ -205,15 +262,15 @@ class LinearEquation(object):
                 x = (u1*cot(b1) - u2*cot(b2) + v2 - v1) \
                     / (cot(b1) - cot(b2))
             except ZeroDivisionError:
-                x = (u2*math.tan(b1) + u1*math.tan(b2)
-                     + (v1-v2)*math.tan(b1)*math.tan(b2)) \
+                x = (u1*math.tan(b2) - u2*math.tan(b1)
+                     + (v2-v1)*math.tan(b1)*math.tan(b2)) \
                     / (math.tan(b2) - math.tan(b1))
             try:
                 y = (v1*math.tan(b1) - v2*math.tan(b2) + u2 - u1) \
                     / (math.tan(b1) - math.tan(b2))
             except ZeroDivisionError:
-                y = (v2*cot(b1) + v1*cot(b2)
-                     + (u1-u2)*cot(b1)*cot(b2)) \
+                y = (v1*cot(b2) - v2*cot(b1)
+                     + (u2-u1)*cot(b1)*cot(b2)) \
                     / (cot(b2) - cot(b1))
 
         return x, y
@@ -221,3 +278,108 @@ class LinearEquation(object):
     def __str__(self):
         return 'LinearEquation at coordinates ({0}, {1}) with bearing {2}' \
                ''.format(self.u, self.v, self.b)
+
+
+def _column(values, n):
+    """ Returns a sequence of n floats, repeating values if it is a single
+        number.
+    """
+    try:
+        if len(values) != n:
+            raise ValueError('Expected a sequence of length {0}.'.format(n))
+    except TypeError:
+        return array('d', [values]) * n
+    return values
+
+
+class LinearEquationArray(object):
+    """ A set of lines, each with bearing b through a point (u, v), for
+        working with many lines at once. The bearings are held as columns of
+        cos b and sin b so the methods only need multiplication and addition
+        for each line. Arguments can either be sequences with one value per
+        line or a single value for all lines, and results are arrays.
+    """
+
+    def __init__(self, bearings, us, vs):
+        try:
+            self.u, self.v = array('d', us), array('d', vs)
+            self.cos = array('d', (math.cos(b) for b in bearings))
+            self.sin = array('d', (math.sin(b) for b in bearings))
+        except TypeError as err:
+            raise TypeError('bearings, us and vs must be sequences of '
+                            'numbers.') from err
+        if not len(self.cos) == len(self.u) == len(self.v):
+            raise ValueError('bearings, us and vs must have the same length.')
+
+    @classmethod
+    def from_lines(cls, lines):
+        """ Creates an array from a sequence of LinearEquation objects. """
+        return cls([ln.b for ln in lines], [ln.u for ln in lines],
+                   [ln.v for ln in lines])
+
+    def __len__(self):
+        return len(self.u)
+
+    def __getitem__(self, i):
+        b = math.atan2(self.sin[i], self.cos[i]) % (2*math.pi)
+        return LinearEquation(Bearing(b, rad=True), (self.u[i], self.v[i]))
+
+    def move(self, lengths):
+        """ Returns arrays of x and y coordinates a set length along each
+            line, as with LinearEquation.move.
+        """
+        lengths = _column(lengths, len(self))
+        return (array('d', (u + t*s for u, t, s
+                            in zip(self.u, lengths, self.sin))),
+                array('d', (v + t*c for v, t, c
+                            in zip(self.v, lengths, self.cos))))
+
+    def dist(self, xs, ys, absolute=True):
+        """ Shortest distances between each line and the points (x, y), as
+            with LinearEquation.dist.
+        """
+        n = len(self)
+        result = array('d', ((x-u)*c - (y-v)*s for x, y, u, v, c, s in zip(
+            _column(xs, n), _column(ys, n), self.u, self.v, self.cos,
+            self.sin)))
+        return array('d', map(abs, result)) if absolute else result
+
+    def same_side(self, x1s, y1s, x2s, y2s):
+        """ Checks for each line whether the points (x1, y1) and (x2, y2)
+            are on the same side, as with LinearEquation.same_side. Returns
+            a list of bools.
+        """
+        d1, d2 = self.dist(x1s, y1s, False), self.dist(x2s, y2s, False)
+        return [a * b >= 0 for a, b in zip(d1, d2)]
+
+    def intersect(self, other):
+        """ Finds the intersections of each line with the line at the same
+            index in other, which is either another LinearEquationArray of
+            the same length or a single LinearEquation used for all lines.
+            Returns arrays of x and y coordinates, which are NaN where the
+            lines are parallel.
+        """
+        n = len(self)
+        try:
+            u2, v2 = _column(other.u, n), _column(other.v, n)
+            c2 = _column(other.cos, n)
+            s2 = _column(other.sin, n)
+        except AttributeError:
+            try:
+                c2 = _column(math.cos(other.b), n)
+                s2 = _column(math.sin(other.b), n)
+            except AttributeError as err:
+                raise AttributeError("'other' must be a LinearEquation or "
+                                     "LinearEquationArray object.") from err
+
+        # Homogeneous coordinates of each line are (cos b, -sin b, r) and
+        # the intersection is their cross product
+        xs, ys = array('d'), array('d')
+        for u1, v1, c1, s1, u2_, v2_, c2_, s2_ in zip(
+                self.u, self.v, self.cos, self.sin, u2, v2, c2, s2):
+            r1, r2 = s1*v1 - c1*u1, s2_*v2_ - c2_*u2_
+            w = s1*c2_ - c1*s2_
+            xs.append((s2_*r1 - s1*r2) / w if w else math.nan)
+            ys.append((c2_*r1 - c1*r2) / w if w else math.nan)
+
+        return xs, ys
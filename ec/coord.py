@@ -1,6 +1,7 @@
 # MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
 # Track coordinates
 
+from array import array
 from enum import Enum
 import math
 
@@ -187,6 +188,23 @@ class TrackCoord(object):
         self.pos_x += mv_x
         self.pos_z += mv_z
 
+    def __copy__(self):
+        # Shallow copy of all attributes, sharing the Bearing object, as
+        # before __reduce__ was defined
+        new = TrackCoord.__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        return new
+
+    def __reduce__(self):
+        """ Pickles the arguments needed to recreate the object, with the
+            bearing as a float and trailing None values left out.
+        """
+        args = [self.pos_x, self.pos_z, self._bearing.rad, self._curvature,
+                self._org_curvature, self.org_length, self.org_type]
+        while args[-1] is None:
+            args.pop()
+        return _restore, tuple(args)
+
     def __repr__(self):
         return 'org: {ol} {oc}; pos: {px} {pz}; curv: {c}; brg: {b}'.format(
             ol=self.org_length, oc=self._org_curvature, px=self.pos_x,
@@ -204,3 +222,94 @@ class TrackCoord(object):
         return ("{r} position ({x:.3f}, {z:.3f}) and bearing of {a:.3f}"
                 "".format(r=str_r, x=self.pos_x, z=self.pos_z,
                           a=self.bearing.deg))
+
+
+def _restore(pos_x, pos_z, bearing, curvature=None, org_curvature=None,
+             org_length=None, org_type=None):
+    """ Recreates a TrackCoord object from values already checked, without
+        the conversions in __init__. bearing is in radians.
+    """
+    coord = TrackCoord.__new__(TrackCoord)
+    b = Bearing.__new__(Bearing)
+    b._rad = bearing
+    coord.__dict__.update(_bearing=b, _curvature=curvature,
+                          _org_curvature=org_curvature, pos_x=pos_x,
+                          pos_z=pos_z, org_length=org_length,
+                          org_type=org_type)
+    return coord
+
+
+# Bearing in degrees from y-axis rotation r for each quadrant: base + sign * r
+_quad_offsets = {Q.NE: (0, 1), Q.SE: (180, -1), Q.SW: (180, 1),
+                 Q.NW: (360, -1)}
+_quad_offsets.update({q.name: v for q, v in list(_quad_offsets.items())})
+_quad_names = (Q.NE.name, Q.SE.name, Q.SW.name, Q.NW.name)
+
+
+def quads_to_bearings(rotations, quads):
+    """ Converts sequences of y-axis rotations (deg) and quadrants, either Q
+        members or their names, to an array of bearings in radians, as with
+        the TrackCoord.quad setter.
+    """
+    result = array('d')
+    offsets = _quad_offsets
+    for rotation, quad in zip(rotations, quads):
+        try:
+            base, sign = offsets[quad]
+        except (KeyError, TypeError):
+            raise CoordError('{!r} is not a valid quadrant.'.format(quad))
+        try:
+            rotation = abs(rotation)
+        except TypeError as err:
+            raise CoordError(
+                '{0!r} is not a valid number for the rotation variable.'
+                ''.format(rotation), err)
+        if rotation > 90:
+            raise CoordError('The y-axis rotation must be in the range '
+                             '[-90, 90].')
+        result.append(math.radians((base + sign * rotation) % 360))
+
+    return result
+
+
+def bearings_to_quads(bearings):
+    """ Converts a sequence of bearings in radians to y-axis rotations (deg)
+        and quadrant names, as with the TrackCoord.quad getter. Returns an
+        array of rotations and a list of names.
+    """
+    rotations, quads = array('d'), []
+    names = _quad_names
+    for b in bearings:
+        deg = math.degrees(b)
+        i = int(deg // 90)
+        if i == 4 and round(deg) == 360:
+            i = 0
+        elif not 0 <= i < 4:
+            raise ValueError('Bearing: {} is not within [0, 360) / [0, 2pi).'
+                             ''.format(repr(deg)))
+        rotations.append(deg if i == 0 else 180 - deg if i == 1 else
+                         deg - 180 if i == 2 else 360 - deg)
+        quads.append(names[i])
+
+    return rotations, quads
+
+
+def format_quad(rotation, quad):
+    """ Formats a y-axis rotation and quadrant name for display, with the
+        rotation to 3 decimal places. Rotations of 0 or 90 are shown with a
+        single direction, eg 'N' or 'E'. Returns a tuple of strings.
+    """
+    text = '{:.3f}'.format(rotation)
+    if text == '0.000' or text == '360.000':
+        return '0.000', 'N' if quad == 'NE' or quad == 'NW' else 'S'
+    elif text == '90.000':
+        return text, 'W' if quad == 'NW' or quad == 'SW' else 'E'
+    else:
+        return text, quad
+
+
+def format_quads(bearings):
+    """ Formats a sequence of bearings in radians for display as with
+        format_quad. Returns a list of tuples of strings.
+    """
+    return list(map(format_quad, *bearings_to_quads(bearings)))
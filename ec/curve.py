@@ -4,12 +4,19 @@
 from copy import copy
 import math
 
-from ec.common import Bearing, LinearEquation
+from ec import kernel
+from ec.common import Bearing, LinearEquation, Status
 from ec.section import TrackSection
 
 
 class CurveError(Exception):
-    pass
+    """ Error with fitting a curve. code is a Status member describing the
+        problem.
+    """
+
+    def __init__(self, *args, code=Status.INVALID):
+        super(CurveError, self).__init__(*args)
+        self.code = code
 
 
 class TrackCurve(TrackSection):
@@ -20,35 +27,66 @@ class TrackCurve(TrackSection):
         curve section into multiple 500 m sections.
     """
     max_length = 500
-
-    def __init__(self, curve, minimum, speed, split=True):
-        super(TrackCurve, self).__init__(curve, minimum, speed)
+    messages = {
+        Status.NOT_STRAIGHT: 'Both tracks must be straight.',
+        Status.PARALLEL: 'Tracks 1 and 2 must not be parallel.',
+        Status.REVERSE_PARALLEL: 'This method does not work with tracks '
+                                 'parallel in opposite directions.',
+        Status.SAME_ALIGNMENT: 'The other track is on the same alignment as '
+                               'the starting track.',
+        Status.CURVED_AWAY: 'The starting track is curved away from the '
+                            'other track - cannot make a suitable alignment.',
+        Status.NOT_ALIGNED: 'The curved track is not aligned in the same '
+                            'direction as the other track.',
+        Status.EASEMENTS_TOO_LONG: 'The easement curves are too long to fit '
+                                   'within the curve; consider increasing '
+                                   'the radius of curvature.',
+        Status.START_TOO_CLOSE: 'Start point is too close to the straight '
+                                'track such that the required RoC is smaller '
+                                'than the minimum.'
+    }
+
+    def __init__(self, curve, minimum, speed, split=True, order=1):
+        super(TrackCurve, self).__init__(curve, minimum, speed, order)
         self.split_static = split
 
+    def error(self, status):
+        """ Creates a CurveError with the standard message for a status. """
+        return CurveError(self.messages[status], code=status)
+
     def ts_easement_curve(self, curve, end_curv):
         """ Creates a TrackSection instance and returns its easement_curve
             method, for operational and reading ease.
         """
-        ts = TrackSection(curve, self.minimum_radius, self.speed_tolerance)
+        ts = TrackSection(curve, self.minimum_radius, self.speed_tolerance,
+                          self.order)
         return ts.easement_curve(end_curv)
 
     def ts_static_curve(self, curve, angle_diff=None, arc_length=None):
         """ Creates a TrackSection instance and returns its static_curve
             method with 'angle' type, for operational and reading ease.
         """
-        ts = TrackSection(curve, self.minimum_radius, self.speed_tolerance)
+        ts = TrackSection(curve, self.minimum_radius, self.speed_tolerance,
+                          self.order)
         return ts.static_curve(angle_diff, arc_length)
 
-    def find_diff_angle(self, other, apply_cw=False):
-        """ Finds the difference in bearing between the two tracks with
-            bearing A and B. If A-B > B-A then B is to the right with a
-            clockwise curve, and vice versa.
-            If apply_cw is True, will pick side depending on self.clockwise
-            already set, even if it has the bigger difference in bearing.
+    def ts_split_static_curve(self, curve, angle_diff):
+        """ Creates a TrackSection instance and returns its
+            split_static_curve method with sections of max_length.
+        """
+        ts = TrackSection(curve, self.minimum_radius, self.speed_tolerance,
+                          self.order)
+        return ts.split_static_curve(angle_diff, self.max_length)
+
+    def diff_angle_status(self, other, apply_cw=False):
+        """ Finds the difference in bearing between the two tracks without
+            raising any exceptions or setting self.clockwise. Returns a
+            tuple of Status, difference in bearing and whether the 2nd track
+            is to the right; the last two are None if the status is not OK.
         """
         # Checks how the 2nd track is aligned wrt the 1st
         if self.start.bearing.nearly_equal(other.bearing):
-            raise CurveError('Tracks 1 and 2 must not be parallel.')
+            return Status.PARALLEL, None, None
 
         elif (self.start.bearing - other.bearing).rad == math.pi:
             # The two tracks are in opposite directions
@@ -59,14 +97,11 @@ class TrackCurve(TrackSection):
                           start_point[1] + math.cos(self.start.bearing.rad))
 
             if start_line.dist((other.pos_x, other.pos_z)) == 0:
-                raise CurveError('The other track is on the same alignment'
-                                 ' as the starting track.')
+                return Status.SAME_ALIGNMENT, None, None
             diff_b = Bearing(math.pi, rad=True)
             cw = start_line.same_side((other.pos_x, other.pos_z), right_side)
             if apply_cw and cw is not self.clockwise:
-                raise CurveError('The starting track is curved away from the '
-                                 'other track - cannot make a suitable '
-                                 'alignment.')
+                return Status.CURVED_AWAY, None, None
 
         elif (self.start.bearing - other.bearing).rad > \
                 (other.bearing - self.start.bearing).rad:
@@ -77,11 +112,19 @@ class TrackCurve(TrackSection):
             # Otherwise 2nd track is aligned to the left
             diff_b, cw = self.start.bearing - other.bearing, False
 
-        if not apply_cw or self.clockwise is None:
-            self.clockwise = cw
-            return diff_b
-        else:
-            return diff_b if self.clockwise is cw else -diff_b
+        return Status.OK, diff_b, cw
+
+    def find_diff_angle(self, other, apply_cw=False):
+        """ Finds the difference in bearing between the two tracks with
+            bearing A and B. If A-B > B-A then B is to the right with a
+            clockwise curve, and vice versa.
+            If apply_cw is True, will pick side depending on self.clockwise
+            already set, even if it has the bigger difference in bearing.
+        """
+        status, diff_b = self._apply_diff_angle(other, apply_cw)
+        if status is not Status.OK:
+            raise self.error(status)
+        return diff_b
 
     def check_start_alignment(self, other):
         """ Checks whether the start point is aligned towards the other track -
@@ -93,47 +136,131 @@ class TrackCurve(TrackSection):
         """
 
         if self.start.bearing.nearly_equal(other.bearing):
-            raise CurveError('Tracks 1 and 2 must not be parallel.')
+            raise self.error(Status.PARALLEL)
         elif (self.start.bearing - other.bearing).rad == math.pi:
             # Difference 180 deg
             return False
         else:
             # Check how the two points are aligned to each other.
-            first = LinearEquation(other.bearing, (other.pos_x, other.pos_z))
-            start_point = (self.start.pos_x, self.start.pos_z)
-            second = LinearEquation(self.start.bearing, start_point)
-            intersect = first.intersect(second)
-            point_beyond = (intersect[0] + math.sin(self.start.bearing.rad),
-                            intersect[1] + math.cos(self.start.bearing.rad))
-
-            return not first.same_side(point_beyond, start_point)
-
-    def curve_fit_radius(self, other, radius, clockwise=None):
-        """ Finds a curve with easement sections and static curve of a certain
-            radius of curvature that fits the two straight tracks.
+            first = kernel.line(other.pos_x, other.pos_z, other.bearing.rad)
+            xs, zs = self.start.pos_x, self.start.pos_z
+            second = kernel.line(xs, zs, self.start.bearing.rad)
+            ix, iz = kernel.intersect(first, second)
+            beyond_x = ix + math.sin(self.start.bearing.rad)
+            beyond_z = iz + math.cos(self.start.bearing.rad)
+
+            return not kernel.same_side(first, beyond_x, beyond_z, xs, zs)
+
+    def straight_tracks_status(self, other):
+        """ Checks whether both tracks are straight and neither parallel nor
+            parallel in opposite directions, as needed for fitting a curve
+            with a set radius of curvature. Returns a Status.
         """
-        if radius < self.minimum_radius:
-            raise CurveError(
-                'Radius {0} must be greater than the minimum radius of '
-                'curvature.'.format(radius))
-
         try:
             if other.curvature != 0 or self.start.curvature != 0:
-                raise CurveError('Both tracks must be straight.')
+                return Status.NOT_STRAIGHT
 
             if self.start.bearing.nearly_equal(other.bearing):
-                raise CurveError('Tracks 1 and 2 must not be parallel.')
+                return Status.PARALLEL
             elif self.start.bearing.nearly_equal(other.bearing.flip()):
                 # Can't fit curve of specific radius to two parallel tracks -
                 # 1) only one valid radius value, 2) can be placed anywhere
                 # along tracks.
-                raise CurveError('This method does not work with tracks '
-                                 'parallel in opposite directions.')
+                return Status.REVERSE_PARALLEL
+
+        except AttributeError as err:
+            raise AttributeError('Tracks 1 and 2 need to be TrackCoord '
+                                 'objects.') from err
+
+        return Status.OK
 
+    def check_straight_tracks(self, other):
+        """ As straight_tracks_status, but raises CurveError if the tracks
+            are not suitable.
+        """
+        status = self.straight_tracks_status(other)
+        if status is not Status.OK:
+            raise self.error(status)
+
+    def check_feasibility(self, other, radius=None, clockwise=None):
+        """ Checks whether a curve can be fitted to the other track without
+            raising any exceptions, and returns a Status member. If radius is
+            given, checks for curve_fit_radius (and curve_fit_length with
+            that radius) without calculating the whole curve; otherwise
+            checks for curve_fit_point from the start track by running the
+            same search for the radius as the fit itself.
+            self.clockwise is left unchanged.
+        """
+        org_clockwise = self.clockwise
+        try:
+            if radius is not None:
+                return self._radius_status(other, radius, clockwise)
+            else:
+                return self._point_status(other)
+        finally:
+            self.clockwise = org_clockwise
+
+    def _radius_status(self, other, radius, clockwise):
+        if radius < self.minimum_radius:
+            return Status.RADIUS_BELOW_MINIMUM
+        status = self.straight_tracks_status(other)
+        if status is not Status.OK:
+            return status
+
+        self.clockwise = clockwise
+        status, diff_angle = self._apply_diff_angle(other, True)
+        if status is not Status.OK:
+            return status
+
+        easement_length = self.easement_length(1 / radius)
+        static_curve_angle = diff_angle.rad - 2 * self.easement_angle(
+            easement_length)
+        return Status.EASEMENTS_TOO_LONG if static_curve_angle < 0 \
+            else Status.OK
+
+    def _point_status(self, other):
+        try:
+            if other.curvature != 0:
+                return Status.NOT_STRAIGHT
         except AttributeError as err:
             raise AttributeError('Tracks 1 and 2 need to be TrackCoord '
                                  'objects.') from err
 
+        status, diff_angle = self._point_diff_angle(other)
+        if status is not Status.OK:
+            return status
+
+        # Follow the same search as curve_fit_point so the status matches
+        try:
+            self._point_search(other, diff_angle)
+        except CurveError as err:
+            return err.code
+        return Status.OK
+
+    def _apply_diff_angle(self, other, apply_cw=False):
+        """ As find_diff_angle, but returns a tuple of Status and the
+            difference in bearing instead of raising CurveError.
+        """
+        status, diff_b, cw = self.diff_angle_status(other, apply_cw)
+        if status is not Status.OK:
+            return status, None
+        if not apply_cw or self.clockwise is None:
+            self.clockwise = cw
+            return status, diff_b
+        else:
+            return status, diff_b if self.clockwise is cw else -diff_b
+
+    def curve_fit_radius(self, other, radius, clockwise=None):
+        """ Finds a curve with easement sections and static curve of a certain
+            radius of curvature that fits the two straight tracks.
+        """
+        if radius < self.minimum_radius:
+            raise CurveError(
+                'Radius {0} must be greater than the minimum radius of '
+                'curvature.'.format(radius),
+                code=Status.RADIUS_BELOW_MINIMUM)
+        self.check_straight_tracks(other)
+
         # Sets signed curvature and angle difference between 2 straight tracks
         self.clockwise = clockwise
         diff_angle = self.find_diff_angle(other, True)
@@ -145,9 +272,7 @@ class TrackCurve(TrackSection):
         if static_curve_angle < 0:
             # Angle diff from two easement curves bigger than angle between
             # the two straight tracks; can't fit them in
-            raise CurveError(
-                'The easement curves are too long to fit within the curve; '
-                'consider increasing the radius of curvature.')
+            raise self.error(Status.EASEMENTS_TOO_LONG)
 
         # Construct the 3 sections of curve
         ec1 = self.ts_easement_curve(self.start, curvature)
@@ -161,25 +286,16 @@ class TrackCurve(TrackSection):
             curve_data = [copy(s) for s in [self.start, ec1, static, ec2]]
 
         else:
-            sections = math.floor(static_length/self.max_length)
-            static = []
-            for s in range(sections):
-                next_section = static[s-1] if s != 0 else ec1
-                static += [self.ts_static_curve(next_section,
-                                                arc_length=self.max_length)]
-            remainder = static_length % self.max_length
-            static += [self.ts_static_curve(static[-1], arc_length=remainder)]
-
+            static = self.ts_split_static_curve(ec1, static_curve_angle)
             ec2 = self.ts_easement_curve(static[-1], 0)
             curve_data = [copy(s) for s in [self.start, ec1] + static + [ec2]]
 
         # Finds the required translation to align the curve with the 2 tracks
         # Should already be aligned with 1st
-        line_track = LinearEquation(other.bearing,
-                                    (other.pos_x, other.pos_z))
-        line_end_point = LinearEquation(self.start.bearing,
-                                        (ec2.pos_x, ec2.pos_z))
-        end_point = line_track.intersect(line_end_point)
+        line_track = kernel.line(other.pos_x, other.pos_z, other.bearing.rad)
+        line_end_point = kernel.line(ec2.pos_x, ec2.pos_z,
+                                     self.start.bearing.rad)
+        end_point = kernel.intersect(line_track, line_end_point)
 
         # Applies translation to each of the sections
         for ts in curve_data:
@@ -198,17 +314,13 @@ class TrackCurve(TrackSection):
         # Let initial curve_fit_radius eval handle all the CurveExceptions
         # Run loop for a set number of iterations
         for j in range(iterations):
-            try:
-                curve = self.curve_fit_radius(other=other, radius=roc,
-                                              clockwise=clockwise)
-
-            except CurveError as err:
-                if 'The easement curves are too long' in str(err):
-                    n_floor = roc
-                else:
-                    raise
+            status = self.check_feasibility(other, roc, clockwise)
+            if status is Status.EASEMENTS_TOO_LONG:
+                n_floor = roc
 
             else:
+                curve = self.curve_fit_radius(other=other, radius=roc,
+                                              clockwise=clockwise)
                 static_length = sum(i.org_length for i in curve if
                                     i.org_type == 'static')
                 if round(static_length - length, places) == 0:
@@ -231,60 +343,95 @@ class TrackCurve(TrackSection):
                 # Floor should have been set with first iteration
                 raise CurveError('The required radius of curvature for static '
                                  'curve of length {} is too small.'
-                                 ''.format(length))
+                                 ''.format(length),
+                                 code=Status.RADIUS_BELOW_MINIMUM)
 
         # Loop runs out of iterations
         else:
             raise CurveError(
                 'A suitable alignment was not found after {0} iterations. '
-                ''.format(iterations))
+                ''.format(iterations), code=Status.NO_SOLUTION)
 
-    def curve_fit_point(self, other, add_point=None, places=4, iterations=100):
-        """ Extends a curve with easement sections from a point on a track,
-            which can be curved, to join with a straight track. Uses the
-            bisection method to find the correct radius of curvature by
-            checking if the aligned curve has reached the second track or
-            overshot.
-            places: minimum distance between easement curve and 2nd track
-            iterations: maximum number of iterations before giving up
+    def _point_diff_angle(self, other):
+        """ Sets the direction of the curve for curve_fit_point and finds the
+            difference in bearing. Returns a tuple of Status and the
+            difference in bearing.
         """
-        try:
-            if other.curvature != 0:
-                raise CurveError('The end track must be straight.')
-            if self.start.bearing.nearly_equal(other.bearing):
-                raise CurveError('Tracks 1 and 2 must not be parallel.')
-
-        except AttributeError as err:
-            raise AttributeError('Tracks 1 and 2 need to be TrackCoord '
-                                 'objects.') from err
-
-        if add_point is not None:
-            try:
-                self.get_static_radius(add_point)
-            except AttributeError as err:
-                raise AttributeError('Add_point must be another TrackCoord '
-                                     'object.') from err
+        if self.start.bearing.nearly_equal(other.bearing):
+            return Status.PARALLEL, None
 
         # Setting clockwise direction if starting curvature is not straight
         if self.start.curvature != 0:
             self.clockwise = self.start.curvature < 0
-            diff_angle = self.find_diff_angle(other, True)
-            if diff_angle.rad > math.pi:
-                raise CurveError('The curved track is not aligned in the '
-                                 'same direction as the other track.')
+            status, diff_angle = self._apply_diff_angle(other, True)
+            if status is Status.OK and diff_angle.rad > math.pi:
+                return Status.NOT_ALIGNED, None
 
         else:
-            diff_angle = self.find_diff_angle(other)
-            if not self.check_start_alignment(other) and not \
+            status, diff_angle = self._apply_diff_angle(other)
+            if status is Status.OK and not \
+                    self.check_start_alignment(other) and not \
                     self.start.bearing.nearly_equal(other.bearing.flip()):
                 # Other track behind start point, so flip CW/ACW to create a
                 # balloon loop instead and recalculate diff_angle
                 self.clockwise = not self.clockwise
-                diff_angle = self.find_diff_angle(other, True)
+                status, diff_angle = self._apply_diff_angle(other, True)
+
+        return status, diff_angle
+
+    def _pre_angle(self):
+        """ Angle of the 'negative' section of easement curve if the starting
+            curvature is not zero.
+        """
+        if self.start.curvature != 0:
+            return self.easement_angle(self.easement_length(self.start.curvature))
+        else:
+            return 0
+
+    def _point_curve(self, diff_angle, curvature, pre_angle):
+        """ Creates the easement and static curves from the start point for
+            curve_fit_point with a set curvature. Returns the angle of the
+            static curve and the list of curve sections, or None if the
+            easement curves are too long to fit.
+        """
+        easement_length = self.easement_length(curvature)
+        static_curve_angle = diff_angle.rad - self.easement_angle(easement_length) \
+            - abs(self.easement_angle(easement_length) - pre_angle)
+
+        if static_curve_angle < 0:
+            return static_curve_angle, None
+
+        if self.start.curvature != curvature:
+            # Usual EC -> Static -> EC setup
+            ec1 = self.ts_easement_curve(self.start, curvature)
+            curve_data = [self.start, copy(ec1)]
+        else:
+            # Skip the first easement curve
+            curve_data = [self.start]
+
+        static_length = abs(static_curve_angle / curvature)
+        # Checking if static curve is longer than 500
+        if not self.split_static or static_length <= self.max_length:
+            # Single static section
+            static = self.ts_static_curve(curve_data[-1],
+                                          static_curve_angle)
+            ec2 = self.ts_easement_curve(static, 0)
+            curve_data += [copy(s) for s in [static, ec2]]
+        # If split_static is True and longer than 500m, split
+        else:
+            ls_static = self.ts_split_static_curve(curve_data[-1],
+                                                   static_curve_angle)
+            ec2 = self.ts_easement_curve(ls_static[-1], 0)
+            curve_data += [copy(s) for s in ls_static + [ec2]]
+
+        return static_curve_angle, curve_data
 
-        line_other = LinearEquation(bearing=other.bearing,
-                                    point=(other.pos_x, other.pos_z))
-        start_point = (self.start.pos_x, self.start.pos_z)
+    def _point_search(self, other, diff_angle, places=4, iterations=100):
+        """ Bisection search for the radius of curvature in curve_fit_point.
+            Returns the list of curve sections or raises CurveError.
+        """
+        line_other = kernel.line(other.pos_x, other.pos_z, other.bearing.rad)
+        xs, zs = self.start.pos_x, self.start.pos_z
         # Set upper and lower bounds, and set starting curvature
         n_floor, n_ceiling = None, None
         curvature = 1 / self.minimum_radius
@@ -292,79 +439,44 @@ class TrackCurve(TrackSection):
 
         # If starting curvature is not zero, adjust diff_angle to take into
         # account 'negative' section of easement curve
-        if self.start.curvature != 0:
-            pre_angle = self.easement_angle(self.easement_length(self.start.curvature))
-        else:
-            pre_angle = 0
+        pre_angle = self._pre_angle()
 
         # Ensuring it runs in a loop with a limited number of iterations
         for j in range(iterations):
-            easement_length = self.easement_length(curvature)
-            static_curve_angle = diff_angle.rad - self.easement_angle(easement_length) \
-                - abs(self.easement_angle(easement_length) - pre_angle)
+            static_curve_angle, curve_data = self._point_curve(
+                diff_angle, curvature, pre_angle)
 
-            if static_curve_angle < 0:
+            if curve_data is None:
                 # RoC too small; set a floor and repeat loop
                 n_floor = curvature
 
             else:
-                if self.start.curvature != curvature:
-                    # Usual EC -> Static -> EC setup
-                    ec1 = self.ts_easement_curve(self.start, curvature)
-                    curve_data = [self.start, copy(ec1)]
-                else:
-                    # Skip the first easement curve
-                    curve_data = [self.start]
-
-                static_length = abs(static_curve_angle / curvature)
-                # Checking if static curve is longer than 500
-                if not self.split_static or static_length <= self.max_length:
-                    # Single static section
-                    static = self.ts_static_curve(curve_data[-1],
-                                                  static_curve_angle)
-                    ec2 = self.ts_easement_curve(static, 0)
-                    curve_data += [copy(s) for s in [static, ec2]]
-                # If split_static is True and longer than 500m, split
-                else:
-                    sections = math.floor(static_length / self.max_length)
-                    ls_static = []
-                    for s in range(sections):
-                        next_section = ls_static[s-1] if s != 0 else \
-                            curve_data[-1]
-                        ls_static += [self.ts_static_curve(
-                            next_section, arc_length=self.max_length)]
-                    # Adding the remainder section
-                    remainder = static_length % self.max_length
-                    ls_static += [self.ts_static_curve(ls_static[-1],
-                                                       arc_length=remainder)]
-                    ec2 = self.ts_easement_curve(ls_static[-1], 0)
-                    curve_data += [copy(s) for s in ls_static + [ec2]]
-
-                end_point = (curve_data[-1].pos_x, curve_data[-1].pos_z)
-
-                if line_other.dist(end_point) < 10 ** (-places):
+                xe, ze = curve_data[-1].pos_x, curve_data[-1].pos_z
+                same_side = kernel.same_side(line_other, xs, zs, xe, ze)
+
+                if abs(kernel.dist(line_other, xe, ze)) < 10 ** (-places):
                     # Result accurate enough
                     return curve_data
 
-                elif line_other.same_side(start_point, end_point):
+                elif same_side:
                     # Same side, ie curve hasn't reached the other track -
                     # need larger RoC
                     n_floor = curvature
 
-                elif not line_other.same_side(start_point, end_point):
+                elif not same_side:
                     # Opposite sides, ie curve overshot - need smaller RoC
                     n_ceiling = curvature
 
                 # Zero length of static curve but still overshot - won't work
-                elif not line_other.same_side(start_point, end_point) \
-                        and static_curve_angle < 10 ** -3:
+                elif not same_side and static_curve_angle < 10 ** -3:
                     raise CurveError(
                         'The starting point is too close to the second track '
-                        'for this curve - try moving the start point away.')
+                        'for this curve - try moving the start point away.',
+                        code=Status.START_TOO_CLOSE)
 
                 else:
                     raise ValueError('Something went wrong here - dist',
-                                     line_other.dist(end_point))
+                                     kernel.dist(line_other, xe, ze))
 
             if n_floor is not None:
                 if n_ceiling is not None:
@@ -375,12 +487,43 @@ class TrackCurve(TrackSection):
                     curvature *= 1/2
             else:
                 # Floor should have been set with first iteration
-                raise CurveError(
-                    'Start point is too close to the straight track such that '
-                    'the required RoC is smaller than the minimum.')
+                raise self.error(Status.START_TOO_CLOSE)
 
         # Loop runs out of iterations
         else:
             raise CurveError(
                 'A suitable alignment was not found after {0} iterations. '
-                ''.format(iterations))
+                ''.format(iterations), code=Status.NO_SOLUTION)
+
+    def curve_fit_point(self, other, add_point=None, places=4, iterations=100):
+        """ Extends a curve with easement sections from a point on a track,
+            which can be curved, to join with a straight track. Uses the
+            bisection method to find the correct radius of curvature by
+            checking if the aligned curve has reached the second track or
+            overshot.
+            places: minimum distance between easement curve and 2nd track
+            iterations: maximum number of iterations before giving up
+        """
+        try:
+            if other.curvature != 0:
+                raise CurveError('The end track must be straight.',
+                                 code=Status.NOT_STRAIGHT)
+            if self.start.bearing.nearly_equal(other.bearing):
+                raise self.error(Status.PARALLEL)
+
+        except AttributeError as err:
+            raise AttributeError('Tracks 1 and 2 need to be TrackCoord '
+                                 'objects.') from err
+
+        if add_point is not None:
+            try:
+                self.get_static_radius(add_point)
+            except AttributeError as err:
+                raise AttributeError('Add_point must be another TrackCoord '
+                                     'object.') from err
+
+        status, diff_angle = self._point_diff_angle(other)
+        if status is not Status.OK:
+            raise self.error(status)
+
+        return self._point_search(other, diff_angle, places, iterations)
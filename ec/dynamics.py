@@ -0,0 +1,194 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Lateral acceleration and jerk along fitted curves
+
+from array import array
+from bisect import bisect_right
+import math
+
+
+class DynamicsError(Exception):
+    pass
+
+
+class SpeedProfile(object):
+    """ Speed (km/h) against chainage. Either a single speed, a sequence of
+        (chainage, speed) pairs in order of chainage with linear
+        interpolation between them and constant speed beyond either end, or
+        a function of chainage.
+    """
+    step = 0.5
+
+    def __init__(self, speed):
+        self.function, self.chainages, self.speeds = None, None, None
+        if callable(speed):
+            self.function = speed
+        else:
+            try:
+                pairs = [(float(c), float(v)) for c, v in speed]
+            except TypeError:
+                pairs = [(0.0, float(speed))]
+            if not pairs:
+                raise DynamicsError('The speed profile is empty.')
+            if any(a[0] >= b[0] for a, b in zip(pairs, pairs[1:])):
+                raise DynamicsError('Chainages in the speed profile must be '
+                                    'in ascending order.')
+            self.chainages = [p[0] for p in pairs]
+            self.speeds = [p[1] for p in pairs]
+
+    def __call__(self, chainage):
+        """ Returns the speed (km/h) and its rate of change with chainage
+            (km/h per m).
+        """
+        if self.function is not None:
+            h = self.step
+            rate = (self.function(chainage + h)
+                    - self.function(chainage - h)) / (2*h)
+            return self.function(chainage), rate
+
+        i = bisect_right(self.chainages, chainage)
+        if i == 0:
+            return self.speeds[0], 0
+        elif i == len(self.chainages):
+            return self.speeds[-1], 0
+        c0, c1 = self.chainages[i-1], self.chainages[i]
+        v0, v1 = self.speeds[i-1], self.speeds[i]
+        rate = (v1 - v0) / (c1 - c0)
+        return v0 + rate * (chainage - c0), rate
+
+
+class DynamicsProfile(object):
+    """ Speed (km/h), curvature (1/m), lateral acceleration (m/s^2) and jerk
+        (m/s^3) against chainage, stored as one array per column. The
+        acceleration is v^2 k with no allowance for cant, so it has the same
+        sign as the curvature.
+    """
+    columns = ('chainage', 'speed', 'curvature', 'acceleration', 'jerk')
+    # Default comfort limits for lateral acceleration and jerk
+    limits = {'acceleration': 0.65, 'jerk': 0.35}
+
+    def __init__(self):
+        self.data = {c: array('d') for c in self.columns}
+
+    def __len__(self):
+        return len(self.data['chainage'])
+
+    def __getitem__(self, column):
+        return self.data[column]
+
+    def rows(self):
+        """ Yields each row as a tuple, in the same order as columns. """
+        return zip(*(self.data[c] for c in self.columns))
+
+    def peak(self, column):
+        """ Largest magnitude in a column. """
+        return max(map(abs, self.data[column]), default=0)
+
+    def exceedances(self, limits=None):
+        """ Finds where the magnitude of the acceleration or jerk is greater
+            than its limit, using the limits attribute for any not given.
+            Returns a list of tuples (column, first chainage, last chainage,
+            peak) for each run of samples over the limit.
+        """
+        limits = dict(self.limits, **(limits or {}))
+        chainages = self.data['chainage']
+        result = []
+        for column, limit in sorted(limits.items()):
+            run = None
+            for c, value in zip(chainages, self.data[column]):
+                if abs(value) > limit:
+                    if run is None:
+                        run = [column, c, c, abs(value)]
+                    else:
+                        run[2], run[3] = c, max(run[3], abs(value))
+                elif run is not None:
+                    result.append(tuple(run))
+                    run = None
+            if run is not None:
+                result.append(tuple(run))
+        return result
+
+
+def _sections(sections):
+    """ Start chainage, length and start and end curvature of each section
+        in a list of TrackCoord objects.
+    """
+    result, chainage = [], 0
+    for start, end in zip(sections[:-1], sections[1:]):
+        if end.org_length is None:
+            raise DynamicsError('The section {!r} has no length.'.format(end))
+        k1 = end.curvature or 0
+        k0 = end.org_curvature if end.org_curvature is not None \
+            else (start.curvature or 0)
+        if end.org_type != 'easement':
+            k0 = k1
+        result.append((chainage, end.org_length, k0, k1))
+        chainage += end.org_length
+    return result, chainage
+
+
+def evaluate(sections, speed, spacing=1, start=0):
+    """ Evaluates the dynamics along a list of TrackCoord objects as
+        returned by the TrackCurve methods, at every multiple of spacing
+        from the start and at the end of each section. Curvature changes
+        linearly along easement curves, as with
+        TrackSection.easement_curvature. speed is anything accepted by
+        SpeedProfile, with chainage from start. Returns a DynamicsProfile.
+    """
+    if spacing <= 0:
+        raise DynamicsError('The spacing must be positive.')
+    parts, total = _sections(sections)
+    profile = SpeedProfile(speed) if not isinstance(speed, SpeedProfile) \
+        else speed
+
+    # Grid points and section boundaries, in order
+    n = int(total // spacing)
+    grid = [i * spacing for i in range(n + 1)]
+    ends = [p[0] + p[1] for p in parts]
+    chainages = sorted(set(grid + ends))
+    starts = [p[0] for p in parts]
+
+    result = DynamicsProfile()
+    data = result.data
+    last = len(parts) - 1
+    for s in chainages:
+        i = min(bisect_right(starts, s) - 1, last)
+        c0, length, k0, k1 = parts[i]
+        rate_k = (k1 - k0) / length if length else 0
+        k = k0 + rate_k * (s - c0)
+
+        v_kmh, rate_v = profile(start + s)
+        v, rate_v = v_kmh / 3.6, rate_v / 3.6
+        # a = v^2 k; da/dt = v da/ds = v^3 dk/ds + 2 v^2 k dv/ds
+        acceleration = v * v * k
+        jerk = v ** 3 * rate_k + 2 * v * v * k * rate_v
+
+        data['chainage'].append(start + s)
+        data['speed'].append(v_kmh)
+        data['curvature'].append(k)
+        data['acceleration'].append(acceleration)
+        data['jerk'].append(jerk)
+
+    return result
+
+
+def evaluate_many(curves, speed, spacing=1, limits=None):
+    """ Evaluates the dynamics along each of a sequence of section lists
+        with the same speed. Returns a list of tuples (DynamicsProfile,
+        exceedances).
+    """
+    result = []
+    for sections in curves:
+        dynamics = evaluate(sections, speed, spacing)
+        result.append((dynamics, dynamics.exceedances(limits)))
+    return result
+
+
+def steady_speed(curvature, limit=None):
+    """ Highest speed (km/h) at which the lateral acceleration on a curve
+        stays within the limit (m/s^2).
+    """
+    if limit is None:
+        limit = DynamicsProfile.limits['acceleration']
+    if curvature == 0:
+        return math.inf
+    return math.sqrt(limit / abs(curvature)) * 3.6
@@ -0,0 +1,167 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Least squares fitting of static curves to surveyed points
+
+import math
+
+
+class FitError(Exception):
+    pass
+
+
+class CircleFit(object):
+    """ Result of fitting a circle to a sequence of points along a track.
+        The curvature is negative for a clockwise curve, as with TrackCoord,
+        with the direction of travel taken from the order of the points.
+        start_bearing is the bearing (rad) of the curve at the first point
+        and rms the root mean square of the distances of the points from
+        the circle.
+    """
+
+    def __init__(self, centre, radius, clockwise, start_bearing, rms):
+        self.centre = centre
+        self.radius = radius
+        self.clockwise = clockwise
+        self.start_bearing = start_bearing
+        self.rms = rms
+
+    @property
+    def curvature(self):
+        return -1 / self.radius if self.clockwise else 1 / self.radius
+
+    def __repr__(self):
+        return 'CircleFit: centre ({0:.3f}, {1:.3f}), radius {2:.3f} {3}, ' \
+               'RMS {4:.3e}'.format(self.centre[0], self.centre[1],
+                                    self.radius,
+                                    'CW' if self.clockwise else 'ACW',
+                                    self.rms)
+
+
+def _solve(a, b):
+    """ Solves the linear equations a x = b for a 3x3 matrix a by Gaussian
+        elimination. Raises FitError if a is singular.
+    """
+    m = [list(row) + [v] for row, v in zip(a, b)]
+    for i in range(3):
+        p = max(range(i, 3), key=lambda r: abs(m[r][i]))
+        if abs(m[p][i]) < 1e-12 * max(1, max(abs(v) for v in m[p][:3])):
+            raise FitError('The points are collinear or coincident.')
+        m[i], m[p] = m[p], m[i]
+        for r in range(i + 1, 3):
+            f = m[r][i] / m[i][i]
+            for c in range(i, 4):
+                m[r][c] -= f * m[i][c]
+
+    x = [0, 0, 0]
+    for i in range(2, -1, -1):
+        x[i] = (m[i][3] - sum(m[i][c] * x[c] for c in range(i + 1, 3))) \
+            / m[i][i]
+    return x
+
+
+def _normal(rows, values):
+    """ Normal equations for the least squares solution of rows . x =
+        values, with 3 unknowns.
+    """
+    a = [[0.0] * 3 for _ in range(3)]
+    b = [0.0] * 3
+    for row, v in zip(rows, values):
+        for i in range(3):
+            b[i] += row[i] * v
+            for j in range(3):
+                a[i][j] += row[i] * row[j]
+    return a, b
+
+
+def kasa(xs, zs):
+    """ Algebraic circle fit, minimising the sum of (x^2 + z^2 + Dx + Ez +
+        F)^2 over all points. Coordinates are taken relative to their mean
+        to keep the equations well conditioned. Returns the centre (x, z)
+        and radius.
+    """
+    n = len(xs)
+    mx, mz = sum(xs) / n, sum(zs) / n
+    us, vs = [x - mx for x in xs], [z - mz for z in zs]
+    rows = [(u, v, 1) for u, v in zip(us, vs)]
+    d, e, f = _solve(*_normal(rows, [-(u*u + v*v) for u, v in zip(us, vs)]))
+    cu, cv = -d / 2, -e / 2
+    radius_sq = cu*cu + cv*cv - f
+    if radius_sq <= 0:
+        raise FitError('No circle fits the points.')
+    return (mx + cu, mz + cv), math.sqrt(radius_sq)
+
+
+def refine(xs, zs, centre, radius, iterations=20, tolerance=1e-10):
+    """ Improves a circle fit with the Gauss-Newton method, minimising the
+        sum of squared distances of the points from the circle. Returns the
+        centre (x, z) and radius.
+    """
+    cx, cz = centre
+    for _ in range(iterations):
+        rows, residuals = [], []
+        for x, z in zip(xs, zs):
+            d = math.hypot(x - cx, z - cz)
+            if d == 0:
+                raise FitError('A point lies on the centre of the circle.')
+            rows.append(((cx - x) / d, (cz - z) / d, -1))
+            residuals.append(radius - d)
+        dx, dz, dr = _solve(*_normal(rows, residuals))
+        cx, cz, radius = cx + dx, cz + dz, radius + dr
+        if abs(dx) + abs(dz) + abs(dr) < tolerance * radius:
+            break
+    return (cx, cz), radius
+
+
+def fit_circle(xs, zs, refined=True, iterations=20):
+    """ Fits a circle to a sequence of at least 3 points (xs, zs) along a
+        track, in order of travel, with kasa() and optionally refine().
+        Returns a CircleFit object.
+    """
+    if len(xs) != len(zs):
+        raise FitError('xs and zs must have the same length.')
+    if len(xs) < 3:
+        raise FitError('At least 3 points are needed to fit a circle.')
+
+    centre, radius = kasa(xs, zs)
+    if refined:
+        centre, radius = refine(xs, zs, centre, radius, iterations)
+
+    cx, cz = centre
+    rms = math.sqrt(sum((math.hypot(x - cx, z - cz) - radius) ** 2
+                        for x, z in zip(xs, zs)) / len(xs))
+
+    # Angle swept around the centre is negative for a clockwise curve
+    swept = 0
+    for x1, z1, x2, z2 in zip(xs, zs, xs[1:], zs[1:]):
+        u1, v1, u2, v2 = x1 - cx, z1 - cz, x2 - cx, z2 - cz
+        swept += math.atan2(u1 * v2 - v1 * u2, u1 * u2 + v1 * v2)
+    clockwise = swept < 0
+    ux, uz = xs[0] - cx, zs[0] - cz
+    # Tangent at the first point is perpendicular to the radius
+    if clockwise:
+        start_bearing = math.atan2(uz, -ux) % (2*math.pi)
+    else:
+        start_bearing = math.atan2(-uz, ux) % (2*math.pi)
+
+    return CircleFit(centre, radius, clockwise, start_bearing, rms)
+
+
+def fit_coords(coords, refined=True, iterations=20):
+    """ Fits a circle to a sequence of TrackCoord objects along a track, as
+        with fit_circle.
+    """
+    return fit_circle([c.pos_x for c in coords], [c.pos_z for c in coords],
+                      refined, iterations)
+
+
+def fit_circles(groups, refined=True, iterations=20):
+    """ Fits circles to each of a sequence of tuples (xs, zs), as with
+        fit_circle. Returns a list of CircleFit objects, with None for any
+        group where no circle can be fitted, eg collinear points.
+    """
+    result = []
+    for xs, zs in groups:
+        try:
+            result.append(fit_circle(xs, zs, refined, iterations))
+        except FitError:
+            result.append(None)
+    return result
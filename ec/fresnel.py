@@ -0,0 +1,305 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Series evaluation of the Fresnel integrals used for easement curves
+
+from array import array
+import math
+import mmap
+import struct
+import timeit
+
+# Order used to evaluate the clothoid exactly instead of a truncated series
+EXACT = 'exact'
+# Order used to interpolate the exact clothoid from a precomputed table
+TABLE = 'table'
+
+_coefficients = {}
+
+
+def coefficients(order):
+    """ Returns the coefficients for the Taylor series of the Fresnel
+        integrals truncated to a set order, as used by TrackSection.fresnel.
+        With u = (at)^2 and w = u^2:
+            x  = t * u * sum(cx[n] * w^n), n < order
+            z  = t * sum(cz[n] * w^n), n <= order
+        and the derivatives x' = u * sum(dx[n] * w^n), z' = sum(dz[n] * w^n)
+        with the same number of terms. Order 1 gives the original
+        polynomials x = a^2 t^3 / 3 and z = t - a^4 t^5 / 10.
+        Returns a tuple (cx, cz, dx, dz).
+    """
+    try:
+        return _coefficients[order]
+    except KeyError:
+        pass
+
+    if not isinstance(order, int) or order < 1:
+        raise ValueError('The series order must be a positive integer.')
+
+    f = math.factorial
+    cx = tuple((-1)**n / (f(2*n+1) * (4*n+3)) for n in range(order))
+    cz = tuple((-1)**n / (f(2*n) * (4*n+1)) for n in range(order+1))
+    dx = tuple((-1)**n / f(2*n+1) for n in range(order))
+    dz = tuple((-1)**n / f(2*n) for n in range(order+1))
+
+    # Horner's method starts with the highest power
+    _coefficients[order] = tuple(c[::-1] for c in (cx, cz, dx, dz))
+    return _coefficients[order]
+
+
+def horner(coeffs, w):
+    """ Evaluates a polynomial with coefficients in order of decreasing
+        power using Horner's method.
+    """
+    result = 0
+    for c in coeffs:
+        result = result * w + c
+    return result
+
+
+def _exact(t, a):
+    """ Sums the series for both Fresnel integrals until the terms no longer
+        change the result.
+    """
+    u = (a * t)**2
+    w = u * u
+    x_term, z_term = u / 3, 1
+    x_sum, z_sum = x_term, z_term
+    px, pz = u, 1
+    n = 0
+    while True:
+        n += 1
+        px *= -w / ((2*n) * (2*n+1))
+        pz *= -w / ((2*n-1) * (2*n))
+        x_term, z_term = px / (4*n+3), pz / (4*n+1)
+        if x_sum + x_term == x_sum and z_sum + z_term == z_sum:
+            break
+        x_sum += x_term
+        z_sum += z_term
+
+    return t * x_sum, t * z_sum
+
+
+def position(t, a, order=1):
+    """ Position (x, z) on the normalised easement curve at length t, with
+        x positive for a clockwise curve. a is 1 / sqrt(2 * factor).
+    """
+    if order == EXACT:
+        return _exact(t, a)
+    elif order == TABLE:
+        return table(a).position(t, a)
+    cx, cz, dx, dz = coefficients(order)
+    u = (a * t)**2
+    w = u * u
+    return t * u * horner(cx, w), t * horner(cz, w)
+
+
+def angle(t, a, order=1):
+    """ Tangential angle of the normalised easement curve at length t, in
+        radians, found from the derivatives of the truncated series.
+    """
+    u = (a * t)**2
+    if order == EXACT or order == TABLE:
+        return u
+    cx, cz, dx, dz = coefficients(order)
+    w = u * u
+    xp, zp = u * horner(dx, w), horner(dz, w)
+    return math.asin(xp / math.hypot(xp, zp))
+
+
+class ClothoidTable(object):
+    """ Normalised clothoid X(s) = integral of sin(v^2), Z(s) = integral of
+        cos(v^2) from 0 to s, tabulated on a uniform grid of s from 0 to
+        s_max along with the derivatives sin(s^2) and cos(s^2). Values are
+        found by cubic Hermite interpolation, with an error no greater than
+        error_bound = h^4 / 384 * (12 s_max + 8 s_max^3) for a step h. The
+        tangential angle is s^2 exactly and so is not tabulated.
+        Positions on an easement curve with factor a are X(at) / a and
+        Z(at) / a, so the error in metres is error_bound / a.
+    """
+    # Covers a change in bearing of up to 360 degrees
+    s_max = math.sqrt(2*math.pi)
+    _header = struct.Struct('<8sddq')
+    _magic = b'ECTABLE1'
+
+    def __init__(self, tolerance=1e-9, s_max=None):
+        if s_max is not None:
+            self.s_max = s_max
+        steps = math.ceil(self.s_max / (384 * tolerance
+                                        / self._bound(self.s_max)) ** 0.25)
+        self.step = self.s_max / steps
+        self.error_bound = self.step**4 / 384 * self._bound(self.s_max)
+
+        grid = [i * self.step for i in range(steps + 1)]
+        values = [_exact(s, 1) for s in grid]
+        self.x = array('d', (v[0] for v in values))
+        self.z = array('d', (v[1] for v in values))
+        self.dx = array('d', (math.sin(s*s) for s in grid))
+        self.dz = array('d', (math.cos(s*s) for s in grid))
+
+    @staticmethod
+    def _bound(s_max):
+        """ Upper bound of the 4th derivatives of X and Z up to s_max. """
+        return 12 * s_max + 8 * s_max**3
+
+    def __len__(self):
+        return len(self.x)
+
+    def evaluate(self, s):
+        """ Interpolates the normalised clothoid (X, Z) at s. Falls back to
+            the exact series beyond the end of the table.
+        """
+        if s >= self.s_max:
+            return _exact(s, 1)
+        h = self.step
+        i = int(s / h)
+        p = s / h - i
+        p2 = p * p
+        p3 = p2 * p
+        # Cubic Hermite basis functions
+        h00, h10 = 2*p3 - 3*p2 + 1, (p3 - 2*p2 + p) * h
+        h01, h11 = 3*p2 - 2*p3, (p3 - p2) * h
+        x = h00*self.x[i] + h10*self.dx[i] + h01*self.x[i+1] \
+            + h11*self.dx[i+1]
+        z = h00*self.z[i] + h10*self.dz[i] + h01*self.z[i+1] \
+            + h11*self.dz[i+1]
+        return x, z
+
+    def position(self, t, a):
+        """ Position (x, z) on the easement curve at length t, as with the
+            position function.
+        """
+        x, z = self.evaluate(a * t)
+        return x / a, z / a
+
+    def save(self, path):
+        """ Writes the table to a binary file which can be loaded with
+            memory mapping.
+        """
+        with open(path, 'wb') as f:
+            f.write(self._header.pack(self._magic, self.step, self.s_max,
+                                      len(self.x)))
+            for column in (self.x, self.z, self.dx, self.dz):
+                column.tofile(f)
+
+    @classmethod
+    def load(cls, path):
+        """ Loads a table saved with save(). The file is memory mapped, so
+            every process loading the same file shares one copy.
+        """
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, step, s_max, n = cls._header.unpack_from(mapped)
+        if magic != cls._magic:
+            raise ValueError('{!r} is not a clothoid table file.'
+                             ''.format(path))
+
+        table_ = cls.__new__(cls)
+        table_.step, table_.s_max = step, s_max
+        table_.error_bound = step**4 / 384 * cls._bound(s_max)
+        data = memoryview(mapped)[cls._header.size:].cast('d')
+        table_.x, table_.z, table_.dx, table_.dz = \
+            (data[i*n:(i+1)*n] for i in range(4))
+        return table_
+
+
+# Tables in use, and the table picked for each value of a and tolerance
+_tables = []
+_tables_a = {}
+
+
+def table(a, tolerance=1e-6):
+    """ Returns a clothoid table with a positional error within tolerance
+        (m) for easement curves with factor a, building one if none of the
+        tables in use are accurate enough. The table picked is cached for
+        each value of a, ie for each speed tolerance.
+    """
+    try:
+        return _tables_a[a, tolerance]
+    except KeyError:
+        pass
+
+    for t in _tables:
+        if t.error_bound / a <= tolerance:
+            break
+    else:
+        t = ClothoidTable(tolerance * a)
+        _tables.append(t)
+
+    _tables_a[a, tolerance] = t
+    return t
+
+
+def use_table(new_table):
+    """ Adds a table, eg one loaded from a file, to the tables in use so it
+        is picked by table() wherever it is accurate enough.
+    """
+    _tables.insert(0, new_table)
+    _tables_a.clear()
+
+
+def accuracy(a, length, orders=(1, 2, 3, 4, 5), samples=100):
+    """ Compares the truncated series with the exact clothoid over an
+        easement curve of a set length. Returns a dict of the maximum
+        positional error (m) and angular error (rad) for each order.
+    """
+    lengths = [length * i / samples for i in range(samples + 1)]
+    exact = [(_exact(t, a), (a * t)**2) for t in lengths]
+
+    result = {}
+    for order in orders:
+        pos_error, angle_error = 0, 0
+        for t, ((ex, ez), ea) in zip(lengths, exact):
+            x, z = position(t, a, order)
+            pos_error = max(pos_error, math.hypot(x - ex, z - ez))
+            angle_error = max(angle_error, abs(angle(t, a, order) - ea))
+        result[order] = (pos_error, angle_error)
+
+    return result
+
+
+def cheapest_order(a, length, tolerance, max_order=10):
+    """ Finds the lowest order with a positional error within tolerance (m)
+        over an easement curve of a set length. Returns EXACT if no order
+        up to max_order is accurate enough.
+    """
+    errors = accuracy(a, length, range(1, max_order + 1))
+    for order in range(1, max_order + 1):
+        if errors[order][0] <= tolerance:
+            return order
+    return EXACT
+
+
+def benchmark(a, length, orders=(1, 2, 3, 4, 5, EXACT), number=10000):
+    """ Times evaluation of position and angle for each order, returning a
+        dict of the mean time per call in microseconds.
+    """
+    result = {}
+    for order in orders:
+        timer = timeit.Timer(lambda: (position(length, a, order),
+                                      angle(length, a, order)))
+        result[order] = timer.timeit(number) / number * 1e6
+    return result
+
+
+def report(speed, radius, orders=(1, 2, 3, 4, 5), number=10000):
+    """ Returns a text table comparing accuracy and evaluation time of each
+        series order for an easement curve from straight to a set radius.
+    """
+    from ec.section import TrackSection
+
+    factor = (speed / TrackSection.n_speed) ** 3 \
+        * TrackSection.n_length * TrackSection.n_radius
+    a, length = 1 / math.sqrt(2 * factor), factor / radius
+    errors = accuracy(a, length, orders)
+    times = benchmark(a, length, tuple(orders) + (EXACT,), number)
+
+    lines = ['Easement curve of {0:.3f} m; speed tolerance {1}, radius {2}'
+             ''.format(length, speed, radius),
+             '{0:>6} {1:>12} {2:>12} {3:>10}'.format(
+                 'order', 'position/m', 'angle/rad', 'time/us')]
+    for order in orders:
+        lines.append('{0:>6} {1:>12.3e} {2:>12.3e} {3:>10.2f}'.format(
+            order, errors[order][0], errors[order][1], times[order]))
+    lines.append('{0:>6} {1:>12} {2:>12} {3:>10.2f}'.format(
+        EXACT, '-', '-', times[EXACT]))
+    return '\n'.join(lines)
@@ -0,0 +1,61 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Float-only geometry functions used internally by the curve calculations
+
+import math
+
+
+def rotation(t):
+    """ Precomputes the rotation for an angle t in radians, to be used with
+        transform(). Returns a tuple (cos t, sin t).
+    """
+    return math.cos(t), math.sin(t)
+
+
+def transform(x, y, rot, bx=0.0, by=0.0, cx=None, cy=None):
+    """ Same as ec.common.transform, taking floats only: rotates the point
+        (x, y) around (bx, by) clockwise with rot = rotation(t) and
+        translates it such that (bx, by) -> (cx, cy).
+    """
+    cos_t, sin_t = rot
+    if cx is None:
+        cx, cy = bx, by
+    return (cx + (x-bx) * cos_t + (y-by) * sin_t,
+            cy - (x-bx) * sin_t + (y-by) * cos_t)
+
+
+def line(u, v, b):
+    """ Line through the point (u, v) with bearing b in radians, as a tuple
+        (u, v, cos b, sin b) to be used with dist(), same_side() and
+        intersect().
+    """
+    return u, v, math.cos(b), math.sin(b)
+
+
+def dist(ln, x, y):
+    """ Signed distance between the point (x, y) and a line, with the same
+        arithmetic as LinearEquation.dist(absolute=False).
+    """
+    u, v, cos_b, sin_b = ln
+    return (x-u) * cos_b - (y-v) * sin_b
+
+
+def same_side(ln, x1, y1, x2, y2):
+    """ Same as LinearEquation.same_side: checks if both points are on the
+        same side of the line, or if either is on the line.
+    """
+    d1, d2 = dist(ln, x1, y1), dist(ln, x2, y2)
+    return d1 == 0 or d2 == 0 or (d1 > 0) == (d2 > 0)
+
+
+def intersect(l1, l2):
+    """ Finds the point where two lines intersect, from the cross product of
+        their homogeneous coefficients (cos b, -sin b, -dist(0, 0)). Returns
+        None if the lines are parallel.
+    """
+    u1, v1, c1, s1 = l1
+    u2, v2, c2, s2 = l2
+    r1, r2 = s1*v1 - c1*u1, s2*v2 - c2*u2
+    w = s1*c2 - c1*s2
+    if w == 0:
+        return None
+    return (s2*r1 - s1*r2) / w, (c2*r1 - c1*r2) / w
@@ -0,0 +1,187 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Layouts of multiple joins with incremental recalculation
+
+from copy import copy
+
+from ec.curve import CurveError, TrackCurve
+from ec.section import TrackError
+
+
+class LayoutError(Exception):
+    pass
+
+
+class Join(object):
+    """ A join between tracks within a layout. Stores the keys of the
+        TrackCoord inputs it depends on, the arguments for the curve fitting
+        method and the cached result.
+    """
+    methods = {
+        'radius': 'curve_fit_radius',
+        'length': 'curve_fit_length',
+        'point': 'curve_fit_point'
+    }
+
+    def __init__(self, start, end, method, add_point=None, **kwargs):
+        if method not in self.methods:
+            raise LayoutError('{!r} is not a valid method; must be one of '
+                              'radius, length or point.'.format(method))
+        if add_point is not None and method != 'point':
+            raise LayoutError('An additional point can only be used with '
+                              'the point method.')
+
+        self.start, self.end, self.add_point = start, end, add_point
+        self.method = method
+        self.kwargs = kwargs
+        self.dirty = True
+        self.result, self.error = None, None
+
+    def depends(self):
+        """ Set of coordinate keys this join depends on. """
+        keys = {self.start, self.end}
+        if self.add_point is not None:
+            keys.add(self.add_point)
+        return keys
+
+
+class Layout(object):
+    """ Collection of named track coordinates and the joins between them.
+        Each join records which coordinates it depends on, so changing a
+        coordinate only marks the joins using it as dirty. Dirty joins are
+        recalculated when they are next accessed.
+        stats: counters for joins computed, results taken from the cache,
+        joins invalidated and joins left untouched by a change.
+    """
+
+    def __init__(self, minimum, speed, split=True):
+        self.minimum_radius = minimum
+        self.speed_tolerance = speed
+        self.split_static = split
+
+        self.coords = {}
+        self.joins = {}
+        self._dependents = {}
+        self.stats = {'computed': 0, 'cached': 0, 'invalidated': 0,
+                      'skipped': 0}
+
+    def add_coord(self, key, coord):
+        """ Adds a TrackCoord object to the layout under key. """
+        if key in self.coords:
+            raise LayoutError('Coordinate {!r} already exists.'.format(key))
+        self.coords[key] = coord
+        self._dependents[key] = set()
+
+    def add_join(self, key, start, end, method='radius', add_point=None,
+                 **kwargs):
+        """ Adds a join from coordinate start to coordinate end, using one of
+            the curve fitting methods 'radius', 'length' or 'point'. Any
+            keyword arguments are passed to the method, eg radius=600.
+        """
+        if key in self.joins:
+            raise LayoutError('Join {!r} already exists.'.format(key))
+        join = Join(start, end, method, add_point, **kwargs)
+        missing = join.depends() - set(self.coords)
+        if missing:
+            raise LayoutError('Coordinates {!r} have not been added to the '
+                              'layout.'.format(sorted(missing, key=str)))
+
+        self.joins[key] = join
+        for c in join.depends():
+            self._dependents[c].add(key)
+
+    def remove_join(self, key):
+        """ Removes a join and its dependencies from the layout. """
+        join = self.joins.pop(key)
+        for c in join.depends():
+            self._dependents[c].discard(key)
+
+    def dependents(self, coord_key):
+        """ Set of join keys which depend on the coordinate coord_key. """
+        return set(self._dependents[coord_key])
+
+    def set_coord(self, key, coord):
+        """ Replaces the TrackCoord object at key and marks every join using
+            it as dirty.
+        """
+        if key not in self.coords:
+            raise LayoutError('Coordinate {!r} does not exist.'.format(key))
+        self.coords[key] = coord
+        self.invalidate(key)
+
+    def move_coord(self, key, mv_x, mv_z):
+        """ Moves the coordinate at key, marking joins using it as dirty. """
+        moved = copy(self.coords[key])
+        moved.move(mv_x, mv_z)
+        self.set_coord(key, moved)
+
+    def invalidate(self, coord_key):
+        """ Marks all joins depending on coord_key as dirty. """
+        affected = self._dependents[coord_key]
+        for j in affected:
+            if not self.joins[j].dirty:
+                self.joins[j].dirty = True
+                self.stats['invalidated'] += 1
+        self.stats['skipped'] += len(self.joins) - len(affected)
+
+    def dirty(self):
+        """ Set of join keys which need to be recalculated. """
+        return {k for k, j in self.joins.items() if j.dirty}
+
+    def _compute(self, join):
+        """ Runs the curve fitting method for a join. The input coordinates
+            are copied as the curve methods can modify them.
+        """
+        start = copy(self.coords[join.start])
+        track = TrackCurve(start, self.minimum_radius, self.speed_tolerance,
+                           self.split_static)
+        kwargs = dict(join.kwargs)
+        if join.add_point is not None:
+            kwargs['add_point'] = copy(self.coords[join.add_point])
+
+        fit = getattr(track, Join.methods[join.method])
+        return fit(copy(self.coords[join.end]), **kwargs)
+
+    def __getitem__(self, key):
+        """ Returns the curve data for a join, recalculating it only if one
+            of its coordinates has changed. If the calculation failed the
+            same exception is raised again until the inputs change.
+        """
+        join = self.joins[key]
+        if join.dirty:
+            self.stats['computed'] += 1
+            try:
+                join.result, join.error = self._compute(join), None
+            except (CurveError, TrackError, ValueError) as err:
+                join.result, join.error = None, err
+            join.dirty = False
+        else:
+            self.stats['cached'] += 1
+
+        if join.error is not None:
+            # Clear the traceback so it does not grow with each access
+            raise join.error.with_traceback(None)
+        return join.result
+
+    def results(self):
+        """ Dict of all joins and their curve data, skipping any which could
+            not be calculated; use errors for those.
+        """
+        ls_results = {}
+        for key in self.joins:
+            try:
+                ls_results[key] = self[key]
+            except (CurveError, TrackError, ValueError):
+                continue
+        return ls_results
+
+    def errors(self):
+        """ Dict of joins which could not be calculated and the exception
+            raised for each.
+        """
+        errors = {}
+        for key in self.joins:
+            try:
+                self[key]
+            except (CurveError, TrackError, ValueError) as err:
+                errors[key] = err
+        return errors
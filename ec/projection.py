@@ -0,0 +1,106 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Projection of points onto the nearest location on a list of track sections
+
+import math
+
+from ec.chainage import ChainageIndex
+
+
+class ProjectionError(Exception):
+    pass
+
+
+class Projector(object):
+    """ Finds the nearest location on a list of TrackCoord objects, as with
+        ChainageIndex, to any point. Each section is split into a number of
+        parts and given a bounding box around them, widened to cover the
+        curve between them, so only sections whose box is closer than the
+        best result so far are searched. Within a section the closest point
+        is found from the nearest part with Newton's method.
+    """
+    parts = 8
+    iterations = 10
+
+    def __init__(self, sections, start=0, order=1):
+        self.index = ChainageIndex(sections, start, order)
+        self.boxes, self.coarse = [], []
+        for g in self.index.geometry:
+            lengths = [g.length * i / self.parts
+                       for i in range(self.parts + 1)]
+            points = [g.point(s) for s in lengths]
+            k = max(abs(p[3]) for p in points)
+            # Furthest distance between curve and chord, c^2 k / 8
+            margin = (g.length / self.parts) ** 2 * k / 8
+            xs, zs = [p[0] for p in points], [p[1] for p in points]
+            self.boxes.append((min(xs) - margin, min(zs) - margin,
+                               max(xs) + margin, max(zs) + margin))
+            self.coarse.append([(s, p[0], p[1]) for s, p in
+                                zip(lengths, points)])
+
+    @staticmethod
+    def _box_dist(box, x, z):
+        dx = max(box[0] - x, 0, x - box[2])
+        dz = max(box[1] - z, 0, z - box[3])
+        return math.hypot(dx, dz)
+
+    def section_nearest(self, i, x, z):
+        """ Finds the length along section i closest to (x, z). Returns
+            the length and the squared distance.
+        """
+        g = self.index.geometry[i]
+        s = min(self.coarse[i],
+                key=lambda c: (c[1] - x) ** 2 + (c[2] - z) ** 2)[0]
+        for _ in range(self.iterations):
+            px, pz, b, k = g.point(s)
+            sin_b, cos_b = math.sin(b), math.cos(b)
+            # Distances along the tangent and the normal to the right
+            along = (x - px) * sin_b + (z - pz) * cos_b
+            across = (x - px) * cos_b - (z - pz) * sin_b
+            # Derivative of -along with respect to s
+            slope = 1 + k * across
+            step = along / slope if slope > 0 else along
+            s_new = min(max(s + step, 0), g.length)
+            if abs(s_new - s) < 1e-9:
+                s = s_new
+                break
+            s = s_new
+
+        px, pz, b, k = g.point(s)
+        return s, (x - px) ** 2 + (z - pz) ** 2
+
+    def project(self, x, z):
+        """ Projects the point (x, z) onto the nearest location. Returns a
+            tuple (chainage, offset, bearing), with the offset positive to
+            the right of the track and the bearing in radians. Points beyond
+            either end are projected onto that end.
+        """
+        order = sorted(range(len(self.boxes)),
+                       key=lambda j: self._box_dist(self.boxes[j], x, z))
+        best, best_dist = None, math.inf
+        for i in order:
+            if self._box_dist(self.boxes[i], x, z) ** 2 > best_dist:
+                break
+            s, dist = self.section_nearest(i, x, z)
+            if dist < best_dist:
+                best, best_dist = (i, s), dist
+
+        i, s = best
+        px, pz, b, k = self.index.geometry[i].point(s)
+        offset = (x - px) * math.cos(b) - (z - pz) * math.sin(b)
+        return self.index.starts[i] + s, offset, b
+
+    def project_many(self, xs, zs, out=None):
+        """ Projects each point from sequences of x and z coordinates. If
+            out is given, eg a preallocated array('d'), it is filled with
+            rows of 3 values; otherwise returns a list of tuples.
+        """
+        if len(xs) != len(zs):
+            raise ProjectionError('xs and zs must have the same length.')
+        result = [] if out is None else out
+        for n, (x, z) in enumerate(zip(xs, zs)):
+            row = self.project(x, z)
+            if out is None:
+                result.append(row)
+            else:
+                out[3*n], out[3*n+1], out[3*n+2] = row
+        return result
@@ -0,0 +1,260 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Sampling points along fitted curves
+
+import math
+
+from ec import fresnel, kernel
+
+
+class SampleError(Exception):
+    pass
+
+
+class SectionGeometry(object):
+    """ Geometry of one track section from the coordinates at its start and
+        at its end, as returned by the TrackCurve methods. The section type
+        is taken from end.org_type and its length from end.org_length. For
+        easement curves the normalisation factor is found from the length
+        and change in curvature, so the speed tolerance is not needed.
+        order is the Fresnel series order, as with TrackSection.
+    """
+
+    def __init__(self, start, end, order=1):
+        try:
+            self.length = end.org_length
+            self.x, self.z = start.pos_x, start.pos_z
+            self.bearing = start.bearing.rad
+        except AttributeError as err:
+            raise SampleError('Sections must be TrackCoord objects.') from err
+        if self.length is None:
+            raise SampleError('The section {!r} has no length; only the '
+                              'first section can be a starting point.'
+                              ''.format(end))
+
+        self.order = order
+        self.end = end
+        k0 = end.org_curvature if end.org_curvature is not None \
+            else start.curvature
+        k1 = end.curvature
+        self.curvature = k0 or 0
+        self.rot = kernel.rotation(self.bearing)
+
+        if end.org_type == 'easement' and k0 != k1 and self.length > 0:
+            # Change in curvature per unit length
+            self.rate = (k1 - k0) / self.length
+            self.a = math.sqrt(abs(self.rate) / 2)
+            # Position along the clothoid from the point of zero curvature
+            self.t0 = k0 / self.rate
+            self.sign = 1 if self.rate > 0 else -1
+            self.x0, self.z0 = self._clothoid(self.t0)
+            self.r0 = self._angle(self.t0)
+            self.kind = 'easement'
+        elif self.curvature != 0:
+            self.kind = 'static'
+        else:
+            self.kind = 'straight'
+
+    def _clothoid(self, t):
+        """ Position on the clothoid with zero curvature at t = 0 and
+            bearing 0 curving anticlockwise for a positive rate.
+        """
+        x, z = fresnel.position(abs(t), self.a, self.order)
+        if t < 0:
+            x, z = -x, -z
+        return -self.sign * x, z
+
+    def _angle(self, t):
+        return -self.sign * fresnel.angle(abs(t), self.a, self.order)
+
+    def point(self, s):
+        """ Returns (x, z, bearing, curvature) at length s along the
+            section, with the bearing in radians.
+        """
+        if self.kind == 'straight':
+            x, z = 0, s
+            r, k = 0, 0
+        elif self.kind == 'static':
+            k = self.curvature
+            r = -k * s
+            x, z = (math.cos(r) - 1) / k, math.sin(-r) / k
+        else:
+            t = self.t0 + s
+            x1, z1 = self._clothoid(t)
+            r = self._angle(t) - self.r0
+            # Rotate so the clothoid has the same bearing at the start
+            x, z = kernel.transform(x1, z1, kernel.rotation(-self.r0),
+                                    self.x0, self.z0, 0, 0)
+            k = self.rate * t
+
+        tx, tz = kernel.transform(x, z, self.rot, cx=self.x, cy=self.z)
+        return tx, tz, (self.bearing + r) % (2*math.pi), k
+
+    def fill(self, out, n, lengths):
+        """ Writes point(s) for each of a sequence of lengths s along the
+            section into out as rows of 4 values, starting at row n. Same
+            results as point(), with the series evaluated inline for speed.
+        """
+        if self.kind == 'easement' and isinstance(self.order, str):
+            # Exact and tabulated clothoids
+            for s in lengths:
+                out[4*n], out[4*n+1], out[4*n+2], out[4*n+3] = self.point(s)
+                n += 1
+            return n
+
+        ox, oz, b = self.x, self.z, self.bearing
+        cos_r, sin_r = self.rot
+        tau, cos, sin = 2*math.pi, math.cos, math.sin
+        if self.kind == 'straight':
+            b = b % tau
+            for s in lengths:
+                out[4*n], out[4*n+1] = ox + s * sin_r, oz + s * cos_r
+                out[4*n+2], out[4*n+3] = b, 0
+                n += 1
+        elif self.kind == 'static':
+            k = self.curvature
+            for s in lengths:
+                r = -k * s
+                x, z = (cos(r) - 1) / k, sin(-r) / k
+                out[4*n] = ox + x * cos_r + z * sin_r
+                out[4*n+1] = oz - x * sin_r + z * cos_r
+                out[4*n+2], out[4*n+3] = (b + r) % tau, k
+                n += 1
+        else:
+            cx, cz, dx, dz = fresnel.coefficients(self.order)
+            a, t0, rate, r0 = self.a, self.t0, self.rate, self.r0
+            m, x0, z0 = -self.sign, self.x0, self.z0
+            cos_0, sin_0 = kernel.rotation(-r0)
+            asin, hypot = math.asin, math.hypot
+            for s in lengths:
+                t = t0 + s
+                at = abs(t)
+                u = (a * at)**2
+                w = u * u
+                hx = hz = hdx = hdz = 0
+                for c in cx:
+                    hx = hx * w + c
+                for c in cz:
+                    hz = hz * w + c
+                for c in dx:
+                    hdx = hdx * w + c
+                for c in dz:
+                    hdz = hdz * w + c
+                x1, z1 = at * u * hx, at * hz
+                if t < 0:
+                    x1, z1 = -x1, -z1
+                xp = u * hdx
+                r = m * asin(xp / hypot(xp, hdz)) - r0
+                x1, z1 = m * x1 - x0, z1 - z0
+                x = x1 * cos_0 + z1 * sin_0
+                z = -x1 * sin_0 + z1 * cos_0
+                out[4*n] = ox + x * cos_r + z * sin_r
+                out[4*n+1] = oz - x * sin_r + z * cos_r
+                out[4*n+2], out[4*n+3] = (b + r) % tau, rate * t
+                n += 1
+        return n
+
+
+def _geometry(sections, order):
+    return [SectionGeometry(start, end, order)
+            for start, end in zip(sections[:-1], sections[1:])]
+
+
+def _steps(geometry, chord_error):
+    """ Number of equal steps for a section such that the distance between
+        each chord and the curve is within chord_error.
+    """
+    k = max(abs(geometry.curvature), abs(geometry.end.curvature or 0))
+    if k == 0 or geometry.length == 0:
+        return 1
+    # Sagitta of a chord c on a circle of radius r is c^2 / 8r
+    return max(1, math.ceil(geometry.length / math.sqrt(8 * chord_error / k)))
+
+
+def sample(sections, spacing=None, chord_error=None, chainage=0, order=1):
+    """ Walks a list of TrackCoord objects as returned by the TrackCurve
+        methods, yielding tuples (chainage, x, z, bearing, curvature) with
+        the bearing in radians. Either:
+            spacing: points at every multiple of spacing from the start
+            chainage, or
+            chord_error: each section split into equal parts with chords
+            no further than chord_error from the curve.
+        The end of the last section is always included.
+    """
+    if (spacing is None) == (chord_error is None):
+        raise SampleError('Either spacing or chord_error must be given.')
+    if (spacing or chord_error) <= 0:
+        raise SampleError('The spacing or chord error must be positive.')
+    if not sections:
+        return
+
+    position, i, last = chainage, 0, None
+    for geometry in _geometry(sections, order):
+        end = position + geometry.length
+        if spacing is not None:
+            # Points on the grid from chainage within this section; the
+            # grid index carries on from the previous section so a point
+            # near a boundary is only yielded once
+            while True:
+                g = chainage + i * spacing
+                if g >= end:
+                    break
+                last = g
+                yield (g,) + geometry.point(g - position)
+                i += 1
+        else:
+            n = _steps(geometry, chord_error)
+            for j in range(n):
+                s = geometry.length * j / n
+                yield (position + s,) + geometry.point(s)
+        position = end
+
+    if last is None or not _near(last, position, spacing):
+        end = sections[-1]
+        yield position, end.pos_x, end.pos_z, end.bearing.rad, \
+            end.curvature or 0
+
+
+def _near(a, b, spacing):
+    """ Checks if two chainages differ only by rounding error. """
+    return abs(b - a) <= 1e-9 * max(spacing, abs(a), abs(b))
+
+
+def sample_count(sections, spacing=None, chord_error=None, chainage=0):
+    """ Number of points sample() yields for a list of sections, to size
+        the output for sample_into().
+    """
+    if (spacing is None) == (chord_error is None):
+        raise SampleError('Either spacing or chord_error must be given.')
+    if len(sections) < 2:
+        return len(sections)
+    if spacing is None:
+        return sum(_steps(g, chord_error) for g in
+                   _geometry(sections, 1)) + 1
+
+    # Same sums and comparisons as sample() so rounding errors match
+    end = chainage
+    for section in sections[1:]:
+        end = end + section.org_length
+    n = max(0, math.ceil((end - chainage) / spacing))
+    while chainage + n * spacing < end:
+        n += 1
+    while n > 0 and chainage + (n - 1) * spacing >= end:
+        n -= 1
+    if n > 0 and _near(chainage + (n - 1) * spacing, end, spacing):
+        return n
+    return n + 1
+
+
+def sample_into(out, sections, spacing=None, chord_error=None, chainage=0,
+                order=1):
+    """ Fills a preallocated sequence of floats, eg array('d'), with the
+        points from sample() as consecutive rows of 5 values. Returns the
+        number of rows written.
+    """
+    n = 0
+    for row in sample(sections, spacing, chord_error, chainage, order):
+        if 5*n + 5 > len(out):
+            raise SampleError('The output is too small for the samples.')
+        out[5*n], out[5*n+1], out[5*n+2], out[5*n+3], out[5*n+4] = row
+        n += 1
+    return n
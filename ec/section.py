@@ -3,26 +3,37 @@
 
 import math
 
+from ec import fresnel, kernel
 from ec.coord import Q, TrackCoord
-from ec.common import Bearing, transform, LinearEquation
+from ec.common import Bearing, LinearEquation, Status
 
 
 class TrackError(Exception):
-    pass
+    """ Error with a track section. code is a Status member describing
+        the problem.
+    """
+
+    def __init__(self, *args, code=Status.INVALID):
+        super(TrackError, self).__init__(*args)
+        self.code = code
 
 
 class TrackSection(object):
     """ Section of track, either straight, curve with constant curvature
         or easement curve. Takes a set of coordinates as input, and another
         set of coordinates as output, to join with another track.
+        order: number of terms used for the Fresnel integrals (see
+        ec.fresnel.coefficients), fresnel.EXACT for the exact clothoid or
+        fresnel.TABLE to interpolate the exact clothoid from a table.
     """
     # Base measurements for normalisation
     n_speed, n_radius, n_length = 200, 800, 298.507
 
-    def __init__(self, curve, minimum, speed):
+    def __init__(self, curve, minimum, speed, order=1):
         self.clockwise = None
         self.minimum_radius = minimum
         self.speed_tolerance = speed
+        self.order = order
         self.start = curve
 
         try:
@@ -31,7 +42,8 @@ class TrackSection(object):
                                  'be a positive non-zero number.')
             if abs(self.start.curvature) > 1 / self.minimum_radius:
                 raise TrackError('Radius must be equal or greater than '
-                                 'the minimum radius of curvature.')
+                                 'the minimum radius of curvature.',
+                                 code=Status.RADIUS_BELOW_MINIMUM)
 
         except AttributeError as err:
             raise AttributeError('TrackCoord object required.') from err
@@ -46,14 +58,15 @@ class TrackSection(object):
             based on the Taylor series for the Fresnel integrals used for the
             Euler spiral, and normalised - each variable t is multiplied by
             factor a, and then the overall result is divided by a.
-            z-axis: C(L) with 2 terms; x-axis: S(L) with 1 term
+            With order n - z-axis: C(L) with n+1 terms; x-axis: S(L) with n
+            terms.
         """
         if self.clockwise is None:
             raise AttributeError('The clockwise attribute has not been set'
                                  'yet.')
 
         a, t = 1 / math.sqrt(2*self.factor()), length
-        x, z = a**2*t**3 / 3, t - a**4*t**5 / 10
+        x, z = fresnel.position(t, a, self.order)
 
         return (-x, z) if not self.clockwise else (x, z)
 
@@ -64,10 +77,8 @@ class TrackSection(object):
         """
 
         a, t = 1 / math.sqrt(2 * self.factor()), length
-        # Derivatives of the polynomials from fresnel()
-        xp, zp = a**2*t**2, 1 - a**4*t**4 / 2
-
-        return math.asin(xp / math.hypot(xp, zp))
+        # Uses derivatives of the polynomials from fresnel()
+        return fresnel.angle(t, a, self.order)
 
     def easement_curvature(self, length):
         """ Returns the signed curvature at a length on the easement curve
@@ -105,7 +116,8 @@ class TrackSection(object):
         dist_align = align.dist(end_point)
         if 0 <= dist_align < 0.0005:
             raise TrackError('A curve cannot be formed from a pair of '
-                             'coordinates already on the same line.')
+                             'coordinates already on the same line.',
+                             code=Status.SAME_ALIGNMENT)
 
         chord_length = math.hypot(self.start.pos_x - add.pos_x,
                                   self.start.pos_z - add.pos_z)
@@ -133,7 +145,8 @@ class TrackSection(object):
         if abs(end_curv) > 1 / self.minimum_radius:
             raise TrackError(
                 'Ending radius of curvature must be at least {0},'
-                'the minimum RoC.'.format(self.minimum_radius))
+                'the minimum RoC.'.format(self.minimum_radius),
+                code=Status.RADIUS_BELOW_MINIMUM)
 
         start_curv = self.start.curvature
         # Checking if curvature are aligned correctly for both start and end
@@ -183,7 +196,8 @@ class TrackSection(object):
             r0, r1 = r0.flip(), r1.flip()
 
         # Transform the end point
-        tx, tz = transform(a=(x1, z1), r=rs-r0, b=(x0, z0), c=(xs, zs))
+        tx, tz = kernel.transform(x1, z1, kernel.rotation((rs-r0).rad),
+                                  x0, z0, xs, zs)
         ry = rs + r1 - r0
 
         return TrackCoord(pos_x=tx, pos_z=tz, rotation=ry, quad=Q.NONE,
@@ -220,7 +234,8 @@ class TrackSection(object):
 
         # Moving curve to starting coordinates
         xs, zs, rs = self.start.pos_x, self.start.pos_z, self.start.bearing
-        tx, tz = transform(a=(x, z), r=rs, c=(xs, zs))
+        tx, tz = kernel.transform(x, z, kernel.rotation(rs.rad),
+                                  cx=xs, cy=zs)
         ry = rs + r
 
         return TrackCoord(pos_x=tx, pos_z=tz, rotation=ry, quad=Q.NONE,
@@ -228,13 +243,55 @@ class TrackSection(object):
                           org_curvature=self.start.curvature,
                           org_type='static')
 
+    def split_static_curve(self, angle_diff, max_length):
+        """ Creates a static curve as with static_curve, split into sections
+            of length max_length followed by a section with the remainder.
+            Each end point is found directly from the starting coordinates
+            rather than from the previous section, so rounding errors do not
+            build up. Outputs a list of TrackCoord objects.
+        """
+        if self.start.curvature == 0:
+            raise TrackError('Angle cannot be specified if the track is '
+                             'already straight.')
+
+        curvature = abs(self.start.curvature)
+        length = angle_diff / curvature
+        sections = math.floor(length / max_length)
+        remainder = length % max_length
+
+        self.clockwise = False if self.start.curvature > 0 else True
+        radius = self.start.radius
+        xs, zs, rs = self.start.pos_x, self.start.pos_z, self.start.bearing
+        rot = kernel.rotation(rs.rad)
+
+        curve_data = []
+        for s in range(sections + 1):
+            if s < sections:
+                t, section_length = (s + 1) * max_length * curvature, \
+                    max_length
+            else:
+                t, section_length = angle_diff, remainder
+
+            x, z = radius * (1 - math.cos(t)), radius * math.sin(t)
+            r = Bearing(t, rad=True)
+            x, r = (-x, -r) if not self.clockwise else (x, r)
+            tx, tz = kernel.transform(x, z, rot, cx=xs, cy=zs)
+
+            curve_data.append(TrackCoord(
+                pos_x=tx, pos_z=tz, rotation=rs + r, quad=Q.NONE,
+                curvature=self.start.curvature, org_length=section_length,
+                org_curvature=self.start.curvature, org_type='static'))
+
+        return curve_data
+
     def straight_line(self, length):
         """ Creates a straight line with zero curvature. Outputs another
             TrackCoord object.
         """
         if self.start.curvature != 0:
             raise TrackError('The starting curvature must be zero to '
-                             'create a straight line.')
+                             'create a straight line.',
+                             code=Status.NOT_STRAIGHT)
 
         line = LinearEquation(self.start.bearing,
                               (self.start.pos_x, self.start.pos_z))
@@ -0,0 +1,272 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Segmentation of surveyed polylines into track sections
+
+from collections import deque
+import math
+
+from ec.coord import Q, TrackCoord
+
+
+class SegmentError(Exception):
+    pass
+
+
+class Segmenter(object):
+    """ Splits a polyline, given one point at a time, into straight, static
+        and easement sections. Works in stages, each holding a fixed number
+        of points so memory use does not grow with the length of the
+        polyline:
+            1. Curvature at each point from the circle through the points
+            window places before and after it, and bearing from the chord
+            between them.
+            2. Each point is classed as constant or changing curvature from
+            the least squares slope of curvature over the same window.
+            3. Runs of points in the same class form sections, with a new
+            run starting after patience points in a different class.
+            4. Each section is emitted as a TrackCoord at its end once the
+            next section is known, so easement curves can be joined exactly
+            to the curvature of the static curves on either side.
+        Curvature is negative for clockwise curves, and curvature within
+        tolerance (1/m) of zero or of a constant value counts as zero or
+        constant respectively.
+    """
+
+    def __init__(self, window=5, tolerance=1e-4, patience=3):
+        if window < 1 or patience < 1:
+            raise SegmentError('The window and patience must be at least 1.')
+        self.window, self.tolerance, self.patience = window, tolerance, patience
+        self.length = 0
+        self._points = deque(maxlen=2*window + 1)
+        self._samples = deque(maxlen=2*window + 1)
+        self._count = 0
+        self._run, self._pending = None, []
+        self._last = None
+        self._started = False
+
+    # Stage 1: curvature and bearing
+
+    def feed(self, x, z):
+        """ Adds the next point of the polyline. Returns a list of any
+            TrackCoord objects completed, starting with the starting point.
+        """
+        points = self._points
+        if points:
+            self.length += math.hypot(x - points[-1][1], z - points[-1][2])
+        points.append((self.length, x, z))
+        self._count += 1
+
+        output = []
+        w = self.window
+        if len(points) == 2*w + 1:
+            k, b = self._estimate(points[0], points[w], points[-1])
+            if self._count == 2*w + 1:
+                # First points, before the first full window
+                for i in range(w):
+                    self._classify(points[i] + (k, self._chord(
+                        points[i], points[i+1])), output)
+            self._classify(points[w] + (k, b), output)
+        return output
+
+    def finish(self):
+        """ Ends the polyline, returning a list of the remaining TrackCoord
+            objects.
+        """
+        points, w = self._points, self.window
+        if self._count < 2:
+            raise SegmentError('At least two points are needed.')
+
+        output = []
+        if self._count < 2*w + 1:
+            # Polyline too short for a full window; use a smaller one
+            m = (len(points) - 1) // 2
+            if m > 0:
+                k, b = self._estimate(points[0], points[m], points[2*m])
+            else:
+                k = 0
+            for i in range(len(points)):
+                j = min(i, len(points) - 2)
+                self._classify(points[i] + (k, self._chord(
+                    points[j], points[j+1])), output)
+        else:
+            k = self._samples[-1][3] if self._samples else 0
+            for i in range(w + 1, len(points)):
+                self._classify(points[i] + (k, self._chord(
+                    points[i-1], points[i])), output)
+
+        self._flush_classes(output)
+        self._close_run(None, output)
+        self._emit(None, output)
+        return output
+
+    @staticmethod
+    def _chord(p1, p2):
+        return math.atan2(p2[1] - p1[1], p2[2] - p1[2]) % (2*math.pi)
+
+    def _estimate(self, p1, p2, p3):
+        """ Signed curvature of the circle through three points, positive
+            for turning anticlockwise, and the bearing at the middle point.
+        """
+        ax, az = p2[1] - p1[1], p2[2] - p1[2]
+        bx, bz = p3[1] - p2[1], p3[2] - p2[2]
+        cross = ax * bz - az * bx
+        lengths = math.hypot(ax, az) * math.hypot(bx, bz) \
+            * math.hypot(ax + bx, az + bz)
+        k = 2 * cross / lengths if lengths else 0
+        return k, self._chord(p1, p3)
+
+    # Stage 2: class of each point
+
+    def _classify(self, sample, output):
+        samples, w = self._samples, self.window
+        samples.append(sample)
+        if len(samples) == 2*w + 1:
+            cls = self._slope_class(samples)
+            if not self._started:
+                for i in range(w):
+                    self._add(samples[i], cls, output)
+                self._started = True
+            self._add(samples[w], cls, output)
+
+    def _slope_class(self, samples):
+        n = len(samples)
+        ms = sum(p[0] for p in samples) / n
+        mk = sum(p[3] for p in samples) / n
+        sss = sum((p[0] - ms) ** 2 for p in samples)
+        if sss == 0:
+            return 'constant'
+        slope = sum((p[0] - ms) * (p[3] - mk) for p in samples) / sss
+        span = samples[-1][0] - samples[0][0]
+        return 'changing' if abs(slope) * span > self.tolerance \
+            else 'constant'
+
+    def _flush_classes(self, output):
+        """ Adds the points left in the classification window. """
+        samples, w = self._samples, self.window
+        if not samples:
+            return
+        cls = self._slope_class(samples)
+        start = w + 1 if self._started else 0
+        for sample in list(samples)[start:]:
+            self._add(sample, cls, output)
+
+    # Stage 3: runs of points in the same class
+
+    def _add(self, sample, cls, output):
+        if self._run is None:
+            self._run = _Run(sample, cls)
+        elif cls == self._run.cls:
+            for p in self._pending:
+                self._run.add(p)
+            self._pending = []
+            self._run.add(sample)
+        else:
+            self._pending.append(sample)
+            if len(self._pending) >= self.patience:
+                pending, self._pending = self._pending, []
+                boundary = self._run.end
+                self._close_run(_Run(boundary, cls), output)
+                for p in pending:
+                    self._run.add(p)
+
+    def _close_run(self, new_run, output):
+        run = self._run
+        for p in self._pending:
+            run.add(p)
+        self._pending = []
+        self._run = new_run
+        if run.n > 1:
+            self._emit(run.section(self.tolerance), output)
+
+    # Stage 4: joining sections and creating TrackCoord objects
+
+    def _emit(self, section, output):
+        last = self._last
+        if last is not None and section is not None \
+                and last['type'] == section['type'] != 'easement' \
+                and abs(last['k1'] - section['k0']) < self.tolerance:
+            # Merge with the previous section, weighting by length
+            l0 = last['end'][0] - last['start'][0]
+            l1 = section['end'][0] - section['start'][0]
+            if l0 + l1 > 0:
+                k = (last['k0'] * l0 + section['k0'] * l1) / (l0 + l1)
+                last['k0'] = last['k1'] = k
+            last['end'] = section['end']
+            return
+
+        if last is not None and section is not None:
+            # Join easement curves to adjacent constant curvature
+            if last['type'] != 'easement' and section['type'] == 'easement':
+                section['k0'] = last['k1']
+            elif last['type'] == 'easement' and \
+                    section['type'] != 'easement':
+                last['k1'] = section['k0']
+
+        if last is None and section is not None:
+            s, x, z, k, b = section['start']
+            output.append(TrackCoord(pos_x=x, pos_z=z, rotation=b,
+                                     quad=Q.NONE, curvature=section['k0']))
+        elif last is not None:
+            s, x, z, k, b = last['end']
+            k0 = 0 if last['type'] == 'straight' else last['k0']
+            k1 = 0 if last['type'] == 'straight' else last['k1']
+            output.append(TrackCoord(
+                pos_x=x, pos_z=z, rotation=b, quad=Q.NONE, curvature=k1,
+                org_curvature=k0, org_length=s - last['start'][0],
+                org_type=last['type']))
+        self._last = section
+
+
+class _Run(object):
+    """ Points with the same class, with running sums for a least squares
+        fit of curvature against length.
+    """
+
+    def __init__(self, sample, cls):
+        self.cls = cls
+        self.start = self.end = sample
+        self.n = 0
+        self.s = self.k = self.ss = self.sk = 0
+        self.add(sample)
+
+    def add(self, sample):
+        s, k = sample[0], sample[3]
+        self.n += 1
+        self.s += s
+        self.k += k
+        self.ss += s * s
+        self.sk += s * k
+        self.end = sample
+
+    def section(self, tolerance):
+        """ Returns a dict describing the section. """
+        n = self.n
+        mean = self.k / n
+        s0, s1 = self.start[0], self.end[0]
+        var = self.ss - self.s * self.s / n
+        if self.cls == 'changing' and var > 0:
+            slope = (self.sk - self.s * self.k / n) / var
+            k0 = mean + slope * (s0 - self.s / n)
+            k1 = mean + slope * (s1 - self.s / n)
+            if abs(k1 - k0) > tolerance:
+                if abs(k0) < tolerance:
+                    k0 = 0
+                if abs(k1) < tolerance:
+                    k1 = 0
+                return {'type': 'easement', 'k0': k0, 'k1': k1,
+                        'start': self.start, 'end': self.end}
+        if abs(mean) < tolerance:
+            return {'type': 'straight', 'k0': 0, 'k1': 0,
+                    'start': self.start, 'end': self.end}
+        return {'type': 'static', 'k0': mean, 'k1': mean,
+                'start': self.start, 'end': self.end}
+
+
+def segment(points, window=5, tolerance=1e-4, patience=3):
+    """ Splits a polyline, given as an iterable of (x, z) points, into
+        track sections as with Segmenter. Yields the starting point followed
+        by a TrackCoord at the end of each section.
+    """
+    segmenter = Segmenter(window, tolerance, patience)
+    for x, z in points:
+        yield from segmenter.feed(x, z)
+    yield from segmenter.finish()
@@ -0,0 +1,360 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Local HTTP/JSON service for the curve solvers, with micro-batching
+
+import argparse
+import asyncio
+from bisect import bisect_left
+import json
+import math
+import time
+
+from ec import batch
+from ec.common import Status
+from ec.coord import CoordError, Q, TrackCoord
+from ec.curve import TrackCurve
+
+ENDPOINTS = {'/curve_fit_radius': batch.Method.RADIUS,
+             '/curve_fit_length': batch.Method.LENGTH,
+             '/curve_fit_point': batch.Method.POINT}
+_values = {batch.Method.RADIUS: 'radius', batch.Method.LENGTH: 'length'}
+_reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+            405: 'Method Not Allowed', 413: 'Payload Too Large',
+            422: 'Unprocessable Entity', 500: 'Internal Server Error'}
+
+
+class ServiceError(Exception):
+    """ Error with a request. status is the HTTP status code to respond
+        with.
+    """
+
+    def __init__(self, *args, status=400):
+        super(ServiceError, self).__init__(*args)
+        self.status = status
+
+
+class Histogram(object):
+    """ Counts of latencies in milliseconds, with each bucket counting
+        values up to and including its bound.
+    """
+    bounds = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000,
+              math.inf)
+
+    def __init__(self):
+        self.counts = [0] * len(self.bounds)
+        self.count, self.total, self.maximum = 0, 0.0, 0.0
+
+    def record(self, ms):
+        self.counts[bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.maximum = max(self.maximum, ms)
+
+    def percentile(self, p):
+        """ Upper bound of the bucket containing the pth percentile. """
+        if not self.count:
+            return None
+        target, running = p / 100 * self.count, 0
+        for bound, n in zip(self.bounds, self.counts):
+            running += n
+            if running >= target:
+                return min(bound, self.maximum)
+
+    def as_dict(self):
+        return {'count': self.count,
+                'mean_ms': self.total / self.count if self.count else None,
+                'max_ms': self.maximum, 'p50_ms': self.percentile(50),
+                'p99_ms': self.percentile(99),
+                'buckets': {'le_' + str(b): n for b, n
+                            in zip(self.bounds, self.counts)}}
+
+
+def _coord(data, name):
+    """ Creates a TrackCoord from a JSON object with x, z and either
+        rotation and quad as shown in the editor, or bearing in degrees.
+    """
+    try:
+        item = data[name]
+        x, z = float(item['x']), float(item['z'])
+        curvature = float(item.get('curvature', 0))
+        if 'quad' in item:
+            quad = Q[str(item['quad']).upper()]
+            return TrackCoord(x, z, float(item['rotation']), quad,
+                              curvature=curvature)
+        return TrackCoord(x, z, math.radians(float(item['bearing'])), Q.NONE,
+                          curvature=curvature)
+    except (KeyError, TypeError, ValueError, AttributeError,
+            CoordError) as err:
+        raise ServiceError('{!r} must be an object with x, z and either '
+                           'rotation and quad or bearing.'.format(name)) \
+            from err
+
+
+def parse_request(method, data):
+    """ Converts a JSON request for a method to a row of batch inputs. """
+    if not isinstance(data, dict):
+        raise ServiceError('The request body must be a JSON object.')
+    start, end = _coord(data, 'start'), _coord(data, 'end')
+    if end.curvature != 0:
+        # The batch engine only takes a straight end track
+        raise ServiceError('The end track must be straight.')
+    try:
+        value = float(data[_values[method]]) if method in _values else 0.0
+        minimum, speed = float(data['minimum']), float(data['speed'])
+        clockwise = data.get('clockwise')
+    except (KeyError, TypeError, ValueError) as err:
+        raise ServiceError('The request needs minimum, speed and {}.'
+                           ''.format(_values.get(method, 'no other values'))) \
+            from err
+    if clockwise not in (None, True, False):
+        raise ServiceError('clockwise must be true, false or null.')
+    return {'method': method.value, 'start_x': start.pos_x,
+            'start_z': start.pos_z, 'start_bearing': start.bearing.rad,
+            'start_curvature': start.curvature, 'end_x': end.pos_x,
+            'end_z': end.pos_z, 'end_bearing': end.bearing.rad,
+            'value': value, 'minimum': minimum, 'speed': speed,
+            'clockwise': {None: -1, False: 0, True: 1}[clockwise]}
+
+
+def format_result(status, curve):
+    """ Converts a result from the batch solver to a JSON object. """
+    if status is not Status.OK:
+        return {'status': status.name,
+                'message': TrackCurve.messages.get(status, status.name)}
+    sections = [{'x': s.pos_x, 'z': s.pos_z, 'bearing': s.bearing.deg,
+                 'rotation': s.quad[0], 'quad': s.quad[1],
+                 'curvature': s.curvature, 'length': s.org_length,
+                 'type': s.org_type}
+                for s in curve]
+    return {'status': status.name, 'start': sections[0],
+            'sections': sections[1:]}
+
+
+def solve_batch(rows, order=1):
+    """ Solves a list of input rows together with the batch engine,
+        returning a list of (Status, list of TrackCoord) tuples. If the batch
+        fails each row is solved on its own, so a bad row only gets
+        Status.INVALID itself.
+    """
+    try:
+        return _solve_rows(rows, order)
+    except (batch.BatchError, KeyError, ValueError, TypeError,
+            ArithmeticError):
+        if len(rows) == 1:
+            return [(Status.INVALID, [])]
+    return [r for row in rows for r in solve_batch([row], order)]
+
+
+def _solve_rows(rows, order):
+    n = len(rows)
+    inputs = {c: [r[c] for r in rows] for c in batch.INPUT_COLUMNS}
+    results = {c: [0] * n for c in batch.RESULT_COLUMNS}
+    batch.solve(inputs, results, order=order)
+    return [batch.read_result(results, i) for i in range(n)]
+
+
+class Batcher(object):
+    """ Collects rows submitted within window seconds of the first, or up
+        to size rows, and solves them together in an executor thread.
+    """
+
+    def __init__(self, window=0.005, size=256, order=1):
+        self.window, self.size, self.order = window, size, order
+        self.pending = []
+        self.timer = None
+        self.batches = self.rows = 0
+
+    def submit(self, row):
+        """ Adds a row, returning a future for its result. """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((row, future))
+        if len(self.pending) >= self.size:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        self.batches += 1
+        self.rows += len(pending)
+        asyncio.ensure_future(self._solve(pending))
+
+    async def _solve(self, pending):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                None, solve_batch, [p[0] for p in pending], self.order)
+        except Exception as err:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(err)
+            return
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class Service(object):
+    """ HTTP/1.1 server using asyncio streams. POST a JSON object to one of
+        ENDPOINTS to fit a curve; GET /stats for the latency histogram of
+        each endpoint and batch counts. Requests to the same endpoint
+        arriving within window seconds are solved as one batch.
+    """
+    max_body = 1 << 20
+
+    def __init__(self, host='127.0.0.1', port=8080, window=0.005,
+                 batch_size=256, order=1):
+        self.host, self.port = host, port
+        self.batchers = {path: Batcher(window, batch_size, order)
+                         for path in ENDPOINTS}
+        self.histograms = {path: Histogram() for path in ENDPOINTS}
+        self.server = None
+        self.connections = set()
+
+    async def start(self):
+        """ Starts listening, setting port to the one used if it was 0. """
+        self.server = await asyncio.start_server(self._connection, self.host,
+                                                 self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        """ Stops listening and closes any open connections. """
+        self.server.close()
+        for task in list(self.connections):
+            task.cancel()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+        await self.server.wait_closed()
+
+    def stats(self):
+        return {'endpoints': {p: h.as_dict()
+                              for p, h in self.histograms.items()},
+                'batches': {p: {'batches': b.batches, 'rows': b.rows}
+                            for p, b in self.batchers.items()}}
+
+    async def _connection(self, reader, writer):
+        self.connections.add(asyncio.current_task())
+        try:
+            while True:
+                keep_alive = await self._request(reader, writer)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # Service closed while waiting for the next request
+            pass
+        finally:
+            self.connections.discard(asyncio.current_task())
+            writer.close()
+
+    async def _request(self, reader, writer):
+        line = await reader.readline()
+        if not line:
+            return False
+        received = time.perf_counter()
+        try:
+            method, path, version = line.decode('latin-1').split()
+        except ValueError:
+            await self._respond(writer, 400, {'error': 'Bad request line.'},
+                                False)
+            return False
+
+        headers = {}
+        while True:
+            header = await reader.readline()
+            if header in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = header.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get('connection', '').lower() != 'close' \
+            and version == 'HTTP/1.1'
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            length = -1
+        if not 0 <= length <= self.max_body:
+            await self._respond(writer, 413 if length > 0 else 400,
+                                {'error': 'Invalid content length.'}, False)
+            return False
+        body = await reader.readexactly(length) if length else b''
+
+        try:
+            status, response = await self._dispatch(method, path, body)
+        except Exception as err:
+            status, response = 500, {'error': 'Internal error: {!r}.'
+                                     ''.format(err)}
+        await self._respond(writer, status, response, keep_alive)
+        if path in self.histograms:
+            self.histograms[path].record(
+                (time.perf_counter() - received) * 1000)
+        return keep_alive
+
+    async def _dispatch(self, method, path, body):
+        if path == '/stats':
+            if method != 'GET':
+                return 405, {'error': 'Use GET for /stats.'}
+            return 200, self.stats()
+        if path not in ENDPOINTS:
+            return 404, {'error': 'No endpoint {}.'.format(path)}
+        if method != 'POST':
+            return 405, {'error': 'Use POST for {}.'.format(path)}
+
+        try:
+            try:
+                data = json.loads(body.decode('utf-8'))
+            except (UnicodeDecodeError, ValueError) as err:
+                raise ServiceError('The request body is not valid JSON.') \
+                    from err
+            row = parse_request(ENDPOINTS[path], data)
+        except ServiceError as err:
+            return err.status, {'error': str(err)}
+
+        status, curve = await self.batchers[path].submit(row)
+        return 200 if status is Status.OK else 422, \
+            format_result(status, curve)
+
+    @staticmethod
+    async def _respond(writer, status, data, keep_alive):
+        body = json.dumps(data).encode('utf-8')
+        head = ('HTTP/1.1 {0} {1}\r\nContent-Type: application/json\r\n'
+                'Content-Length: {2}\r\nConnection: {3}\r\n\r\n'
+                ''.format(status, _reasons[status], len(body),
+                          'keep-alive' if keep_alive else 'close'))
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+
+async def serve(host='127.0.0.1', port=8080, window=0.005, batch_size=256,
+                order=1):
+    """ Runs the service until cancelled. """
+    service = await Service(host, port, window, batch_size, order).start()
+    async with service.server:
+        await service.server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Local HTTP/JSON service for fitting easement curves.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--window', type=float, default=5,
+                        help='batching window in milliseconds')
+    parser.add_argument('--batch-size', type=int, default=256)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.window / 1000,
+                          args.batch_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
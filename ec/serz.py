@@ -0,0 +1,232 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Streaming import of route and track rule XML files exported by serz.exe
+
+from array import array
+import math
+import re
+import xml.etree.ElementTree as ET
+
+from ec.coord import Q, TrackCoord
+import ec.tile
+
+# Curve elements in the track network of a route, and the type of section
+CURVES = {'cCurveStraight': 'straight', 'cCurveArc': 'static',
+          'cCurveEasement': 'easement'}
+
+# serz.exe names classes with a lowercase 'c' followed by the class name
+_re_class = re.compile(r'^c[A-Z]')
+
+
+class SerzError(Exception):
+    pass
+
+
+class CurveRecord(object):
+    """ A track curve read from a route: its type ('straight', 'static' or
+        'easement'), length, start tile (x, z), start position local to that
+        tile, bearing (rad) and curvature at the start and end.
+    """
+    __slots__ = ('kind', 'length', 'tile', 'pos_x', 'pos_z', 'bearing',
+                 'start_curvature', 'end_curvature')
+
+    def __init__(self, kind, length, tile, pos_x, pos_z, bearing,
+                 start_curvature=0.0, end_curvature=0.0):
+        self.kind, self.length, self.tile = kind, length, tile
+        self.pos_x, self.pos_z, self.bearing = pos_x, pos_z, bearing
+        self.start_curvature = start_curvature
+        self.end_curvature = end_curvature
+
+    def __repr__(self):
+        return ('<CurveRecord {0} {1:.3f} m at {2} ({3:.3f}, {4:.3f})>'
+                ''.format(self.kind, self.length, ec.tile.format_tile(
+                    self.tile), self.pos_x, self.pos_z))
+
+
+def _float(elem, path, default=None):
+    child = elem.find(path)
+    if child is None or child.text is None:
+        if default is None:
+            raise SerzError('Element {!r} not found in {!r}.'
+                            ''.format(path, elem.tag))
+        return default
+    try:
+        return float(child.text)
+    except ValueError as err:
+        raise SerzError('{!r} in {!r} is not a number.'
+                        ''.format(child.text, elem.tag)) from err
+
+
+def _far_coordinate(elem):
+    """ Tile and distance within the tile from an axis element holding a
+        cFarCoordinate.
+    """
+    far = elem.find('cFarCoordinate')
+    if far is not None:
+        elem = far
+    tile = _float(elem, './RouteCoordinate/cRouteCoordinate/Distance')
+    distance = _float(elem, './TileCoordinate/cTileCoordinate/Distance')
+    return int(tile), distance
+
+
+def _vector(elem):
+    """ The X and Z (or Y) children of a vector element. """
+    z = elem.find('Z')
+    return elem.find('X'), z if z is not None else elem.find('Y')
+
+
+def _curve(elem):
+    """ Reads a curve element. The start position is a cFarVector2 with a
+        cFarCoordinate for each axis, and the start tangent a vector of
+        floats. Arcs have a Curvature and easements a StartCurvature and
+        EndCurvature, with positive curvature turning anticlockwise.
+    """
+    kind = CURVES[elem.tag]
+    pos = elem.find('./StartPos/cFarVector2')
+    tangent = elem.find('./StartTangent/*')
+    if pos is None or tangent is None:
+        raise SerzError('{!r} has no start position or tangent.'
+                        ''.format(elem.tag))
+    px, pz = _vector(pos)
+    if px is None or pz is None:
+        raise SerzError('The start position of {!r} is missing an axis.'
+                        ''.format(elem.tag))
+    (tx, x), (tz, z) = _far_coordinate(px), _far_coordinate(pz)
+    dx, dz = _vector(tangent)
+    if dx is None or dz is None:
+        raise SerzError('The start tangent of {!r} is missing an axis.'
+                        ''.format(elem.tag))
+    bearing = math.atan2(float(dx.text), float(dz.text)) % (2*math.pi)
+
+    k0 = k1 = 0.0
+    if kind == 'static':
+        k0 = k1 = _float(elem, 'Curvature')
+    elif kind == 'easement':
+        k0 = _float(elem, 'StartCurvature')
+        k1 = _float(elem, 'EndCurvature')
+
+    return CurveRecord(kind, _float(elem, 'Length'), (tx, tz), x, z, bearing,
+                       k0, k1)
+
+
+def _stream(source, handle):
+    """ Parses an XML file or file object, calling handle(path, elem) at the
+        end of every element outside a curve element, where path is the list
+        of tags from the root. Elements are removed from the tree once they
+        are handled, so memory use does not grow with the size of the file.
+    """
+    stack, path = [], []
+    inside = 0
+    try:
+        for event, elem in ET.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                stack.append(elem)
+                path.append(elem.tag)
+                if elem.tag in CURVES:
+                    inside += 1
+                continue
+
+            stack.pop()
+            if elem.tag in CURVES:
+                inside -= 1
+            if inside:
+                # Part of a curve; kept until the whole curve is read
+                path.pop()
+                continue
+            result = handle(path, elem)
+            path.pop()
+            if stack:
+                stack[-1].remove(elem)
+            else:
+                elem.clear()
+            if result is not None:
+                yield result
+    except ET.ParseError as err:
+        raise SerzError('Could not parse XML: {}'.format(err)) from err
+
+
+def iter_curves(source):
+    """ Yields a CurveRecord for each track curve in a route XML file, in the
+        order they appear.
+    """
+    def handle(path, elem):
+        return _curve(elem) if elem.tag in CURVES else None
+    return _stream(source, handle)
+
+
+def read_curves(source):
+    """ Reads all track curves from a route XML file into a dict of arrays:
+        type as index into CURVES values, tile x and z, length, local
+        position x and z, bearing and start and end curvature.
+    """
+    kinds = list(CURVES.values())
+    data = {'kind': array('b'), 'tile_x': array('l'), 'tile_z': array('l')}
+    for c in ('length', 'pos_x', 'pos_z', 'bearing', 'start_curvature',
+              'end_curvature'):
+        data[c] = array('d')
+
+    for r in iter_curves(source):
+        data['kind'].append(kinds.index(r.kind))
+        data['tile_x'].append(r.tile[0])
+        data['tile_z'].append(r.tile[1])
+        data['length'].append(r.length)
+        data['pos_x'].append(r.pos_x)
+        data['pos_z'].append(r.pos_z)
+        data['bearing'].append(r.bearing)
+        data['start_curvature'].append(r.start_curvature)
+        data['end_curvature'].append(r.end_curvature)
+    return data
+
+
+def track_coords(source, origin=None, batch=1000):
+    """ Yields lists of up to batch TrackCoord objects at the start of each
+        track curve, with positions relative to the origin tile (by default
+        the tile of the first curve) so they can be used with the curve
+        calculations.
+    """
+    if batch < 1:
+        raise SerzError('The batch size must be at least 1.')
+    records = []
+    for r in iter_curves(source):
+        if origin is None:
+            origin = r.tile
+        records.append(r)
+        if len(records) == batch:
+            yield _coords(records, origin)
+            records = []
+    if records:
+        yield _coords(records, origin)
+
+
+def _coords(records, origin):
+    origin, xs, zs = ec.tile.normalise([r.tile for r in records],
+                                       [r.pos_x for r in records],
+                                       [r.pos_z for r in records], origin)
+    return [TrackCoord(pos_x=x, pos_z=z, rotation=r.bearing, quad=Q.NONE,
+                       curvature=r.start_curvature)
+            for r, x, z in zip(records, xs, zs)]
+
+
+def speed_tolerances(source):
+    """ Reads the speed tolerances from a TrackRule XML file, returning a
+        dict with the name of the property holding each, eg 'MainLine', as
+        key. Where the same name is used more than once the last is kept.
+    """
+    result = {}
+
+    def handle(path, elem):
+        if elem.tag != 'SpeedTolerance':
+            return
+        # Nearest property element above, skipping class elements
+        names = [t for t in path[:-1] if not _re_class.match(t)]
+        name = names[-1] if names else elem.tag
+        try:
+            result[name] = float(elem.text)
+        except (TypeError, ValueError) as err:
+            raise SerzError('Speed tolerance {!r} is not a number.'
+                            ''.format(elem.text)) from err
+
+    for _ in _stream(source, handle):
+        pass
+    if not result:
+        raise SerzError('No speed tolerances found.')
+    return result
@@ -0,0 +1,200 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Spatial index of track ends for finding pairs of tracks to join
+
+import heapq
+import math
+
+from ec.tile import TILE_SIZE
+
+
+class SpatialError(Exception):
+    pass
+
+
+def bearing_compatible(first, second, places=7, both=False):
+    """ Checks if two bearings in radians are almost equal to a number of
+        decimal places, in the same way as Bearing.nearly_equal but also
+        accepting values either side of 0 / 2pi.
+        If both: also accepts the second bearing flipped.
+    """
+    diff = (first - second + math.pi) % (2*math.pi) - math.pi
+    if round(diff, places) == 0:
+        return True
+    elif both:
+        return round(math.pi - abs(diff), places) == 0
+    else:
+        return False
+
+
+class TrackIndex(object):
+    """ Spatial index of track ends. Positions are grouped by the 1,024 m
+        tiles used in TS2016 routes, and each tile is split into a uniform
+        grid of square cells. Supports queries within a radius and for the
+        k nearest track ends, optionally filtered by bearing.
+        cell: width of grid cells in metres; must divide 1,024 exactly.
+    """
+    tile_size = TILE_SIZE
+
+    def __init__(self, cell=64):
+        if cell <= 0 or self.tile_size % cell != 0:
+            raise SpatialError('The cell size must divide the tile size of '
+                               '{} m exactly.'.format(self.tile_size))
+        self.cell = cell
+        self.per_tile = self.tile_size // cell
+        self.tiles = {}
+        self.keys, self.xs, self.zs, self.bearings = [], [], [], []
+        self._bounds = None
+
+    @classmethod
+    def from_arrays(cls, xs, zs, bearings, keys=None, cell=64):
+        """ Builds an index from sequences of x and z positions and bearings
+            in radians. If keys is None the keys are the row indices.
+        """
+        index = cls(cell)
+        xs, zs, bearings = list(xs), list(zs), list(bearings)
+        if not len(xs) == len(zs) == len(bearings):
+            raise SpatialError('Position and bearing sequences must be of '
+                               'the same length.')
+        keys = range(len(xs)) if keys is None else list(keys)
+        if len(keys) != len(xs):
+            raise SpatialError('There must be one key for every position.')
+
+        for k, x, z, b in zip(keys, xs, zs, bearings):
+            index._add(k, float(x), float(z), float(b) % (2*math.pi))
+        return index
+
+    def __len__(self):
+        return len(self.keys)
+
+    def insert(self, key, coord):
+        """ Adds a TrackCoord object to the index under key. """
+        try:
+            self._add(key, coord.pos_x, coord.pos_z, coord.bearing.rad)
+        except AttributeError as err:
+            raise AttributeError('coord must be a TrackCoord object.') \
+                from err
+
+    def _cell(self, x, z):
+        """ Global cell indices for a position. """
+        return math.floor(x / self.cell), math.floor(z / self.cell)
+
+    def _split(self, cx, cz):
+        """ Splits global cell indices into tile and local cell indices. """
+        return ((cx // self.per_tile, cz // self.per_tile),
+                (cx % self.per_tile, cz % self.per_tile))
+
+    def _add(self, key, x, z, bearing):
+        i = len(self.keys)
+        self.keys.append(key)
+        self.xs.append(x)
+        self.zs.append(z)
+        self.bearings.append(bearing)
+
+        cx, cz = self._cell(x, z)
+        tile, local = self._split(cx, cz)
+        self.tiles.setdefault(tile, {}).setdefault(local, []).append(i)
+
+        if self._bounds is None:
+            self._bounds = [cx, cz, cx, cz]
+        else:
+            b = self._bounds
+            b[0], b[1] = min(b[0], cx), min(b[1], cz)
+            b[2], b[3] = max(b[2], cx), max(b[3], cz)
+
+    def _cell_items(self, cx, cz):
+        tile, local = self._split(cx, cz)
+        return self.tiles.get(tile, {}).get(local, ())
+
+    def _ring(self, cx, cz, r):
+        """ Yields row indices from cells forming a square ring r cells away
+            from cell (cx, cz).
+        """
+        if r == 0:
+            yield from self._cell_items(cx, cz)
+            return
+        for i in range(cx - r, cx + r + 1):
+            yield from self._cell_items(i, cz - r)
+            yield from self._cell_items(i, cz + r)
+        for j in range(cz - r + 1, cz + r):
+            yield from self._cell_items(cx - r, j)
+            yield from self._cell_items(cx + r, j)
+
+    def _max_ring(self, cx, cz):
+        """ Number of rings needed to cover every occupied cell. """
+        if self._bounds is None:
+            return -1
+        x0, z0, x1, z1 = self._bounds
+        return max(cx - x0, x1 - cx, cz - z0, z1 - cz)
+
+    def _accept(self, i, bearing, places, both):
+        return bearing is None or bearing_compatible(
+            self.bearings[i], bearing, places, both)
+
+    def radius(self, x, z, distance, bearing=None, places=7, both=False):
+        """ Finds all track ends within distance of (x, z). If bearing (in
+            radians) is given, only track ends with a compatible bearing are
+            returned. Returns a list of (distance, key) tuples, nearest
+            first.
+        """
+        cx0, cz0 = self._cell(x - distance, z - distance)
+        cx1, cz1 = self._cell(x + distance, z + distance)
+        result = []
+        for cx in range(cx0, cx1 + 1):
+            for cz in range(cz0, cz1 + 1):
+                for i in self._cell_items(cx, cz):
+                    d = math.hypot(self.xs[i] - x, self.zs[i] - z)
+                    if d <= distance and \
+                            self._accept(i, bearing, places, both):
+                        result.append((d, i))
+
+        return [(d, self.keys[i]) for d, i in sorted(result)]
+
+    def nearest(self, x, z, k=1, bearing=None, places=7, both=False,
+                max_distance=None):
+        """ Finds the k nearest track ends to (x, z), searching outwards ring
+            by ring of cells. If bearing (in radians) is given, only track
+            ends with a compatible bearing are returned. Returns a list of
+            (distance, key) tuples, nearest first.
+        """
+        cx, cz = self._cell(x, z)
+        heap = []
+        for r in range(self._max_ring(cx, cz) + 1):
+            for i in self._ring(cx, cz, r):
+                if not self._accept(i, bearing, places, both):
+                    continue
+                d = math.hypot(self.xs[i] - x, self.zs[i] - z)
+                if max_distance is not None and d > max_distance:
+                    continue
+                if len(heap) < k:
+                    heapq.heappush(heap, (-d, i))
+                elif d < -heap[0][0]:
+                    heapq.heapreplace(heap, (-d, i))
+
+            # Any cell beyond this ring is at least r cells away
+            reach = r * self.cell
+            if len(heap) == k and -heap[0][0] <= reach:
+                break
+            if max_distance is not None and reach > max_distance:
+                break
+
+        return [(-d, self.keys[i]) for d, i in sorted(heap, reverse=True)]
+
+    def pairs(self, distance, places=7, both=False):
+        """ Yields (key, key, distance) for every pair of track ends within
+            distance of each other and with compatible bearings, each pair
+            only once.
+        """
+        for i in range(len(self.keys)):
+            x, z = self.xs[i], self.zs[i]
+            cx0, cz0 = self._cell(x - distance, z - distance)
+            cx1, cz1 = self._cell(x + distance, z + distance)
+            for cx in range(cx0, cx1 + 1):
+                for cz in range(cz0, cz1 + 1):
+                    for j in self._cell_items(cx, cz):
+                        if j <= i:
+                            continue
+                        d = math.hypot(self.xs[j] - x, self.zs[j] - z)
+                        if d <= distance and bearing_compatible(
+                                self.bearings[i], self.bearings[j], places,
+                                both):
+                            yield self.keys[i], self.keys[j], d
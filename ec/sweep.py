@@ -0,0 +1,111 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Parameter sweeps of radius and speed tolerance for a pair of tracks
+
+from copy import copy
+import csv
+import math
+
+from ec import kernel
+from ec.curve import TrackCurve
+from ec.section import TrackSection
+
+
+class SweepResult(object):
+    """ Results of a sweep, stored as one list per column with a row for
+        every combination of radius and speed tolerance. Infeasible rows
+        have None for the lengths and end points.
+    """
+    columns = ('radius', 'speed', 'feasible', 'easement_length',
+               'easement_angle', 'static_length', 'static_angle', 'start_x',
+               'start_z', 'end_x', 'end_z')
+
+    def __init__(self):
+        self.data = {c: [] for c in self.columns}
+
+    def __len__(self):
+        return len(self.data['radius'])
+
+    def __getitem__(self, column):
+        return self.data[column]
+
+    def append(self, **row):
+        for c in self.columns:
+            self.data[c].append(row.get(c))
+
+    def rows(self):
+        """ Yields each row as a tuple, in the same order as columns. """
+        return zip(*(self.data[c] for c in self.columns))
+
+    def write_csv(self, csv_file, header=True):
+        """ Writes the results to an open file object as CSV. """
+        writer = csv.writer(csv_file)
+        if header:
+            writer.writerow(self.columns)
+        writer.writerows(self.rows())
+
+
+def sweep(start, other, radii, speeds, minimum, clockwise=None, order=1):
+    """ Evaluates curve_fit_radius for the two straight tracks start and
+        other over every combination of radii and speed tolerances, in
+        radius-major order. The difference in bearing and direction of the
+        curve are found once; each combination is then solved directly
+        from the easement and static curve geometry without creating any
+        TrackCoord objects. A combination is feasible if the radius is at
+        least the minimum and the easement curves fit within the angle
+        between the tracks. order is the Fresnel series order, as with
+        TrackSection.
+        Returns a SweepResult object.
+    """
+    track = TrackCurve(copy(start), minimum, 0)
+    track.check_straight_tracks(other)
+    track.clockwise = clockwise
+    diff_angle = track.find_diff_angle(other, True).rad
+    cw = track.clockwise
+
+    xs, zs, rs = start.pos_x, start.pos_z, start.bearing.rad
+    u, v, b = other.pos_x, other.pos_z, other.bearing.rad
+    sin_diff = math.sin(rs - b)
+    rot_start, rot_diff = kernel.rotation(rs), kernel.rotation(diff_angle)
+
+    # Use the easement methods from TrackSection for each speed tolerance
+    sections = []
+    for speed in speeds:
+        ts = TrackSection(track.start, minimum, speed, order)
+        ts.clockwise = True
+        sections.append(ts)
+
+    result = SweepResult()
+    for radius in radii:
+        for ts in sections:
+            speed = ts.speed_tolerance
+            ease_length = ts.easement_length(1 / radius)
+            ease_angle = ts.easement_angle(ease_length)
+            static_angle = diff_angle - 2 * ease_angle
+            if radius < minimum or static_angle < 0:
+                result.append(radius=radius, speed=speed, feasible=False)
+                continue
+
+            # Curve starting at origin with bearing 0, curving clockwise
+            x1, z1 = ts.fresnel(ease_length)
+            arc_x = radius * (1 - math.cos(static_angle))
+            arc_z = radius * math.sin(static_angle)
+            x2, z2 = kernel.transform(arc_x, arc_z,
+                                      kernel.rotation(ease_angle), cx=x1, cy=z1)
+            x3, z3 = kernel.transform(-x1, z1, rot_diff, cx=x2, cy=z2)
+            if not cw:
+                x3 = -x3
+
+            # Rotate to the starting track and slide along it to meet other
+            ex, ez = kernel.transform(x3, z3, rot_start, cx=xs, cy=zs)
+            dist = (ex - u) * math.cos(b) - (ez - v) * math.sin(b)
+            t = -dist / sin_diff
+            mx, mz = t * math.sin(rs), t * math.cos(rs)
+
+            result.append(radius=radius, speed=speed, feasible=True,
+                          easement_length=ease_length,
+                          easement_angle=ease_angle,
+                          static_length=static_angle * radius,
+                          static_angle=static_angle, start_x=xs + mx,
+                          start_z=zs + mz, end_x=ex + mx, end_z=ez + mz)
+
+    return result
@@ -0,0 +1,118 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Conversion between TS2016 tile coordinates and global positions
+
+import math
+import re
+
+# Width of the square tiles making up a route, in metres
+TILE_SIZE = 1024
+
+_re_tile = re.compile(r'^\s*([+-]\d+)\s*([+-]\d+)\s*$')
+
+
+class TileError(Exception):
+    pass
+
+
+def parse_tile(tile):
+    """ Converts a tile identifier as shown in the route editor, eg
+        '+00000000-00000001', to a tuple of integers (x, z). Tuples of
+        integers are returned unchanged.
+    """
+    try:
+        match = _re_tile.match(tile)
+    except TypeError:
+        try:
+            tx, tz = tile
+            return int(tx), int(tz)
+        except (TypeError, ValueError) as err:
+            raise TileError('{!r} is not a valid tile identifier.'
+                            ''.format(tile)) from err
+
+    if match is None:
+        raise TileError('{!r} is not a valid tile identifier.'.format(tile))
+    return int(match.group(1)), int(match.group(2))
+
+
+def format_tile(tile, width=8):
+    """ Converts a tile tuple (x, z) to an identifier such as
+        '+00000000-00000001'.
+    """
+    tx, tz = parse_tile(tile)
+    return '{x:+0{w}d}{z:+0{w}d}'.format(x=tx, z=tz, w=width + 1)
+
+
+def tile_of(x, z):
+    """ Returns the tile (x, z) containing a global position. """
+    return math.floor(x / TILE_SIZE), math.floor(z / TILE_SIZE)
+
+
+def to_global(tiles, xs, zs):
+    """ Converts sequences of tiles and positions local to those tiles into
+        lists of global x and z positions. Tiles can be identifiers or
+        tuples; a single tile is used for every position.
+    """
+    xs, zs = list(xs), list(zs)
+    if len(xs) != len(zs):
+        raise TileError('Position sequences must be of the same length.')
+
+    if isinstance(tiles, str) or _is_pair(tiles):
+        ls_tiles = [parse_tile(tiles)] * len(xs)
+    else:
+        cache = {}
+        ls_tiles = []
+        for t in tiles:
+            key = t if isinstance(t, str) else tuple(t)
+            if key not in cache:
+                cache[key] = parse_tile(t)
+            ls_tiles.append(cache[key])
+        if len(ls_tiles) != len(xs):
+            raise TileError('There must be one tile for every position.')
+
+    gx = [tx * TILE_SIZE + x for (tx, tz), x in zip(ls_tiles, xs)]
+    gz = [tz * TILE_SIZE + z for (tx, tz), z in zip(ls_tiles, zs)]
+    return gx, gz
+
+
+def to_local(xs, zs):
+    """ Converts sequences of global positions into lists of tiles (as
+        tuples) and positions local to those tiles, in the range [0, 1024).
+    """
+    xs, zs = list(xs), list(zs)
+    if len(xs) != len(zs):
+        raise TileError('Position sequences must be of the same length.')
+
+    tiles = [tile_of(x, z) for x, z in zip(xs, zs)]
+    lx = [x - tx * TILE_SIZE for (tx, tz), x in zip(tiles, xs)]
+    lz = [z - tz * TILE_SIZE for (tx, tz), z in zip(tiles, zs)]
+    return tiles, lx, lz
+
+
+def normalise(tiles, xs, zs, origin=None):
+    """ Converts positions relative to different tiles so they are all
+        relative to the same origin tile, ready to be used together in the
+        curve calculations. By default the origin is the first tile.
+        Returns the origin tile and lists of x and z positions.
+    """
+    if origin is None:
+        if isinstance(tiles, str) or _is_pair(tiles):
+            origin = tiles
+        else:
+            try:
+                origin = next(iter(tiles))
+            except StopIteration:
+                raise TileError('No tiles given.')
+    ox, oz = parse_tile(origin)
+
+    gx, gz = to_global(tiles, xs, zs)
+    return ((ox, oz), [x - ox * TILE_SIZE for x in gx],
+            [z - oz * TILE_SIZE for z in gz])
+
+
+def _is_pair(tiles):
+    """ Checks if tiles is a single (x, z) tuple of integers. """
+    try:
+        tx, tz = tiles
+    except (TypeError, ValueError):
+        return False
+    return isinstance(tx, int) and isinstance(tz, int)
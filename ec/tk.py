@@ -356,12 +356,7 @@ class MainWindow(ttk.Frame):
                            '{:.3f}'.format(ts.pos_z)
 
             # Setting rotation and quad values to 3 decimal places
-            rotation, quad = '{:.3f}'.format(ts.quad[0]), ts.quad[1]
-            if rotation in ['0.000', '360.000']:
-                rotation = '0.000'
-                quad = 'N' if quad in ['NE', 'NW'] else 'S'
-            elif rotation == '90.000':
-                quad = 'W' if quad in ['NW', 'SW'] else 'E'
+            rotation, quad = coord.format_quad(*ts.quad)
 
             data.append((section_name, length, roc_text,
                          pos_x, pos_z, rotation, quad))
@@ -0,0 +1,137 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Fixed-width binary encoding of lists of track sections
+
+import copyreg
+import io
+import math
+import pickle
+import struct
+import timeit
+
+from ec.common import Bearing
+from ec.coord import TrackCoord, _restore
+
+MAGIC = b'ECW'
+VERSION = 1
+# Magic, version and number of sections
+_header = struct.Struct('<3sBI')
+# Position x and z, bearing (rad), curvature, original curvature and length,
+# and type of section; None is stored as NaN or 0 for the type
+_section = struct.Struct('<6dB')
+TYPES = (None, 'straight', 'static', 'easement')
+_type_codes = {t: i for i, t in enumerate(TYPES)}
+_nan = math.nan
+
+
+class WireError(Exception):
+    pass
+
+
+def encoded_size(n):
+    """ Number of bytes needed to encode n sections. """
+    return _header.size + n * _section.size
+
+
+def _none(value):
+    return _nan if value is None else value
+
+
+def encode(sections):
+    """ Encodes a list of TrackCoord objects to bytes. """
+    data = bytearray(encoded_size(len(sections)))
+    _header.pack_into(data, 0, MAGIC, VERSION, len(sections))
+    pack, size = _section.pack_into, _section.size
+    offset = _header.size
+    try:
+        for s in sections:
+            pack(data, offset, s.pos_x, s.pos_z, s.bearing.rad,
+                 _none(s.curvature), _none(s.org_curvature),
+                 _none(s.org_length), _type_codes[s.org_type])
+            offset += size
+    except KeyError as err:
+        raise WireError('{!r} is not a valid section type.'
+                        ''.format(err.args[0])) from err
+    except (AttributeError, struct.error) as err:
+        raise WireError('Sections must be TrackCoord objects.') from err
+    return bytes(data)
+
+
+def decode(data):
+    """ Decodes bytes created by encode to a list of TrackCoord objects. """
+    try:
+        magic, version, n = _header.unpack_from(data)
+    except struct.error as err:
+        raise WireError('The header is incomplete.') from err
+    if magic != MAGIC:
+        raise WireError('Not encoded track sections.')
+    if version != VERSION:
+        raise WireError('Unsupported version {}.'.format(version))
+    if len(data) != encoded_size(n):
+        raise WireError('Expected {0} bytes for {1} sections but got {2}.'
+                        ''.format(encoded_size(n), n, len(data)))
+
+    result = []
+    body = memoryview(data)[_header.size:]
+    for x, z, b, k, ok, ol, t in _section.iter_unpack(body):
+        try:
+            org_type = TYPES[t]
+        except IndexError as err:
+            raise WireError('{!r} is not a valid section type code.'
+                            ''.format(t)) from err
+        if not 0 <= b < 2*math.pi:
+            raise WireError('Bearing {!r} is not within [0, 2pi).'.format(b))
+        result.append(_restore(x, z, b, None if k != k else k,
+                               None if ok != ok else ok,
+                               None if ol != ol else ol, org_type))
+    body.release()
+    return result
+
+
+class _DefaultPickler(pickle.Pickler):
+    """ Pickles TrackCoord and Bearing objects with their whole __dict__, as
+        the default protocol does for classes without __reduce__.
+    """
+
+    def reducer_override(self, obj):
+        if type(obj) in (TrackCoord, Bearing):
+            return copyreg.__newobj__, (type(obj),), obj.__dict__
+        return NotImplemented
+
+
+def default_dumps(obj):
+    """ pickle.dumps without the compact __reduce__ methods of TrackCoord
+        and Bearing, for comparison.
+    """
+    f = io.BytesIO()
+    _DefaultPickler(f).dump(obj)
+    return f.getvalue()
+
+
+def benchmark(sections, number=1000):
+    """ Compares the encoding with pickle for a list of sections, both with
+        the compact __reduce__ methods ('pickle') and without ('default').
+        Returns a dict of method name to a tuple of (encoded size in bytes,
+        mean time to encode and mean time to decode in microseconds).
+    """
+    methods = {'wire': (encode, decode),
+               'pickle': (pickle.dumps, pickle.loads),
+               'default': (default_dumps, pickle.loads)}
+    result = {}
+    for name, (dumps, loads) in methods.items():
+        data = dumps(sections)
+        t_dumps = timeit.Timer(lambda: dumps(sections)).timeit(number)
+        t_loads = timeit.Timer(lambda: loads(data)).timeit(number)
+        result[name] = (len(data), t_dumps / number * 1e6,
+                        t_loads / number * 1e6)
+    return result
+
+
+def report(sections, number=1000):
+    """ Returns a text table of the results from benchmark. """
+    lines = ['{0} sections'.format(len(sections)),
+             '{0:>8} {1:>8} {2:>12} {3:>12}'.format(
+                 'method', 'bytes', 'encode (us)', 'decode (us)')]
+    for name, (size, t_dumps, t_loads) in benchmark(sections, number).items():
+        lines.append('{0:>8} {1:>8d} {2:>12.2f} {3:>12.2f}'.format(
+            name, size, t_dumps, t_loads))
+    return '\n'.join(lines)
@@ -0,0 +1,60 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for the IPChain class
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.alignment
+import ec.coord
+import ec.curve
+from tests.tests_common import CustomAssertions
+
+
+class IPChainTests(unittest.TestCase, CustomAssertions):
+
+    def setUp(self):
+        self.points = [(0, 0), (0, 1000), (800, 1800), (800, 3000)]
+        self.chain = ec.alignment.IPChain(self.points, 600, 120)
+
+    def tearDown(self):
+        del self.points, self.chain
+
+    def test_exception_too_few_points(self):
+        with self.assertRaisesRegex(ec.alignment.AlignmentError, 'At least 3'):
+            ec.alignment.IPChain(self.points[:2], 600, 120)
+
+    def test_exception_radii_length(self):
+        with self.assertRaisesRegex(ec.alignment.AlignmentError, 'one value per'):
+            ec.alignment.IPChain(self.points, [600], 120)
+
+    def test_exception_collinear(self):
+        with self.assertRaisesRegex(ec.alignment.AlignmentError, 'IP 1: .*parallel'):
+            ec.alignment.IPChain([(0, 0), (0, 100), (0, 300)], 600, 120).transitions()
+
+    def test_exception_overlap(self):
+        points = [(0, 0), (0, 100), (100, 200), (100, 300)]
+        with self.assertRaisesRegex(ec.alignment.AlignmentError, 'overlap'):
+            ec.alignment.IPChain(points, 600, 120).transitions()
+
+    def test_transition_matches_curve_fit_radius(self):
+        start = ec.coord.TrackCoord(0, 0, 0, ec.coord.Q.NE, curvature=0)
+        other = ec.coord.TrackCoord(800, 1800, 45, ec.coord.Q.NE, curvature=0)
+        curve = ec.curve.TrackCurve(start, 600, 120).curve_fit_radius(other, 600)
+        result = self.chain.transitions()[0]
+        self.assertDataAlmostEqual([(s.pos_x, s.pos_z) for s in curve][-1],
+                                   [(s.pos_x, s.pos_z) for s in result][-1])
+
+    def test_sections_continuous(self):
+        sections, chainage = self.chain.sections()
+        self.assertEqual(len(sections), len(chainage))
+        self.assertDataAlmostEqual((sections[-1].pos_x, sections[-1].pos_z),
+                                   self.points[-1], places=3)
+        self.assertAlmostEqual(chainage[-1], sum(s.org_length for s in sections[1:]))
+
+    def test_sections_aligned_to_legs(self):
+        sections, _ = self.chain.sections()
+        straights = [s for s in sections if s.org_type == 'straight']
+        self.assertEqual([round(s.bearing.deg, 3) for s in straights], [0, 45, 0])
+        self.assertAlmostEqual(straights[0].pos_x, 0)
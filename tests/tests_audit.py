@@ -0,0 +1,128 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for auditing track sections against speed tolerance
+
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.audit
+import ec.coord
+import ec.curve
+import ec.sample
+import ec.section
+
+
+class InferredSpeedTests(unittest.TestCase):
+
+    def test_speed_of_factor(self):
+        ts = ec.section.TrackSection(ec.coord.TrackCoord(
+            pos_x=0, pos_z=0, rotation=0, quad=ec.coord.Q.NE, curvature=0), 500, 120)
+        self.assertAlmostEqual(ec.audit.speed_of(ts.factor()), 120)
+
+    def test_factor_of(self):
+        self.assertAlmostEqual(ec.audit.factor_of(50, 0, -1/500), 25000)
+        self.assertAlmostEqual(ec.audit.factor_of(50, 1/1000, 1/500), 50000)
+
+    def test_factor_of_reverse(self):
+        self.assertAlmostEqual(ec.audit.factor_of(50, 1/1000, -1/1000), 25000)
+
+    def test_exception_no_change(self):
+        with self.assertRaisesRegex(ValueError, 'must change'):
+            ec.audit.factor_of(50, 1/500, 1/500)
+
+
+class AuditTests(unittest.TestCase):
+
+    def setUp(self):
+        start = ec.coord.TrackCoord(
+            pos_x=217.027, pos_z=34.523, rotation=48.882, quad=ec.coord.Q.NE, curvature=0)
+        end_left = ec.coord.TrackCoord(
+            pos_x=467.962, pos_z=465.900, rotation=12.762, quad=ec.coord.Q.NE, curvature=0)
+        self.curve = ec.curve.TrackCurve(start, 500, 120).curve_fit_radius(
+            end_left, 600)
+
+    def tearDown(self):
+        del self.curve
+
+    def test_inferred_speed(self):
+        for section in self.curve[1:]:
+            if section.org_type == 'easement':
+                self.assertAlmostEqual(ec.audit.inferred_speed(section), 120)
+
+    def test_clean(self):
+        auditor = ec.audit.Auditor(speed=120)
+        self.assertEqual(list(auditor.audit(ec.audit.chain(self.curve))), [])
+        self.assertEqual(auditor.summary()['sections'], len(self.curve) - 1)
+
+    def test_easement_too_short(self):
+        auditor = ec.audit.Auditor(speed=140)
+        result = list(auditor.audit(ec.audit.chain(self.curve)))
+        self.assertEqual({f.check for f in result},
+                         {ec.audit.Check.EASEMENT_SPEED})
+        self.assertEqual(len(result), 2)
+        self.assertAlmostEqual(result[0].value, 120)
+        self.assertEqual(result[0].limit, 140)
+
+    def test_reverse_curve(self):
+        # Easement from a left hand to a right hand curve
+        start = ec.coord.TrackCoord(0, 0, 0, ec.coord.Q.NONE,
+                                    curvature=1/1000)
+        ts = ec.section.TrackSection(start, 500, 120)
+        length = ts.easement_length(2/1000)
+        end = ec.coord.TrackCoord(0, 0, 0, ec.coord.Q.NONE, curvature=-1/1000,
+                                  org_curvature=1/1000, org_length=length,
+                                  org_type='easement')
+        x, z, b, _ = ec.sample.SectionGeometry(start, end).point(length)
+        end = ec.coord.TrackCoord(x, z, b, ec.coord.Q.NONE, curvature=-1/1000,
+                                  org_curvature=1/1000, org_length=length,
+                                  org_type='easement')
+        self.assertAlmostEqual(ec.audit.inferred_speed(end), 120)
+        auditor = ec.audit.Auditor(speed=120)
+        self.assertEqual(list(auditor.audit([(start, end)])), [])
+
+    def test_speed_per_section(self):
+        pairs = [(s, e, 160 if i == 0 else 100) for i, (s, e)
+                 in enumerate(ec.audit.chain(self.curve))]
+        result = list(ec.audit.Auditor().audit(pairs))
+        self.assertEqual([f.index for f in result], [0])
+
+    def test_discontinuity(self):
+        pairs = list(ec.audit.chain(self.curve))
+        moved = ec.coord.TrackCoord(
+            pos_x=pairs[1][0].pos_x + 0.5, pos_z=pairs[1][0].pos_z,
+            rotation=pairs[1][0].bearing.rad + 0.01, quad=ec.coord.Q.NONE,
+            curvature=0)
+        pairs[1] = (moved, pairs[1][1])
+        auditor = ec.audit.Auditor(speed=120)
+        checks = {f.check for f in auditor.audit(pairs)}
+        self.assertEqual(checks, {ec.audit.Check.POSITION,
+                                  ec.audit.Check.BEARING,
+                                  ec.audit.Check.CURVATURE,
+                                  ec.audit.Check.GEOMETRY})
+        summary = auditor.summary()
+        self.assertEqual(summary['POSITION'], 1)
+        self.assertEqual(summary['EASEMENT_SPEED'], 0)
+
+    def test_streaming(self):
+        auditor = ec.audit.Auditor(speed=140)
+        findings = auditor.audit(ec.audit.chain(self.curve))
+        first = next(findings)
+        # Only the first section has been checked so far
+        self.assertEqual(first.index, 0)
+        self.assertEqual(auditor.sections, 1)
+
+    def test_write_report(self):
+        auditor = ec.audit.Auditor(speed=140)
+        output = io.StringIO()
+        n = ec.audit.write_report(auditor.audit(ec.audit.chain(self.curve)),
+                                  output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(n, 2)
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith('0,EASEMENT_SPEED,'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for batch curve fitting
+
+from array import array
+import math
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.batch
+import ec.chainage
+import ec.columnar
+import ec.common
+import ec.coord
+import ec.curve
+from tests.tests_common import CustomAssertions
+
+
+class BatchTests(unittest.TestCase, CustomAssertions):
+
+    def setUp(self):
+        super(BatchTests, self).setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.inputs = os.path.join(self.directory.name, 'inputs.bin')
+        self.results = os.path.join(self.directory.name, 'results.bin')
+
+        self.start = ec.coord.TrackCoord(
+            pos_x=217.027, pos_z=34.523, rotation=48.882, quad=ec.coord.Q.NE, curvature=0)
+        self.end_left = ec.coord.TrackCoord(
+            pos_x=467.962, pos_z=465.900, rotation=12.762, quad=ec.coord.Q.NE, curvature=0)
+        self.end_right = ec.coord.TrackCoord(
+            pos_x=582.769, pos_z=223.772, rotation=75.449, quad=ec.coord.Q.NE, curvature=0)
+
+        rows = [(ec.batch.Method.RADIUS, self.end_left, 600, -1),
+                (ec.batch.Method.LENGTH, self.end_right, 300, -1),
+                (ec.batch.Method.POINT, self.end_left, 0, -1),
+                (ec.batch.Method.RADIUS, self.end_left, 350, -1),
+                (ec.batch.Method.RADIUS, self.end_left, 600, 0)]
+        self.columns = {n: [] for n in ec.batch.INPUT_COLUMNS}
+        for method, end, value, clockwise in rows:
+            row = {'method': method.value, 'start_x': self.start.pos_x,
+                   'start_z': self.start.pos_z,
+                   'start_bearing': self.start.bearing.rad,
+                   'start_curvature': 0, 'end_x': end.pos_x,
+                   'end_z': end.pos_z, 'end_bearing': end.bearing.rad,
+                   'value': value, 'minimum': 500, 'speed': 120,
+                   'clockwise': clockwise}
+            for n in self.columns:
+                self.columns[n].append(row[n])
+
+    def tearDown(self):
+        self.directory.cleanup()
+        del self.directory, self.inputs, self.results, self.columns
+        del self.start, self.end_left, self.end_right
+
+    def fitted(self, method, end, value):
+        track = ec.curve.TrackCurve(self.start, 500, 120, split=False)
+        return getattr(track, method)(end, *value)
+
+    def test_run(self):
+        ec.batch.write_inputs(self.inputs, self.columns)
+        self.assertEqual(ec.batch.run(self.inputs, self.results), 4)
+        with ec.columnar.Table.open(self.results) as results:
+            self.assertEqual(list(results['status']),
+                             [ec.common.Status.OK.value] * 3 + [
+                                 ec.common.Status.RADIUS_BELOW_MINIMUM.value,
+                                 ec.common.Status.OK.value])
+            self.assertEqual(list(results['sections']), [3, 3, 3, 0, 3])
+            self.assertTrue(math.isnan(results['x4'][0]))
+            self.assertTrue(math.isnan(results['start_x'][3]))
+
+    def test_same_as_curve(self):
+        ec.batch.write_inputs(self.inputs, self.columns)
+        ec.batch.run(self.inputs, self.results)
+        expected = [self.fitted('curve_fit_radius', self.end_left, [600]),
+                    self.fitted('curve_fit_length', self.end_right, [300]),
+                    self.fitted('curve_fit_point', self.end_left, [])]
+        with ec.columnar.Table.open(self.results) as results:
+            for i, curve in enumerate(expected):
+                status, sections = ec.batch.read_result(results, i)
+                self.assertEqual(status, ec.common.Status.OK)
+                self.assertEqual(len(sections), len(curve))
+                for s, t in zip(sections, curve):
+                    self.assertTrackAlign(s, t)
+
+    def test_geometry_round_trip(self):
+        # Curves read back by row give the same geometry as the originals
+        ec.batch.write_inputs(self.inputs, self.columns)
+        ec.batch.run(self.inputs, self.results)
+        expected = [self.fitted('curve_fit_radius', self.end_left, [600]),
+                    self.fitted('curve_fit_length', self.end_right, [300])]
+        with ec.columnar.Table.open(self.results) as results:
+            for i, curve in enumerate(expected):
+                sections = ec.batch.read_result(results, i)[1]
+                self.assertEqual([s.org_type for s in sections],
+                                 [s.org_type for s in curve])
+                self.assertEqual(sections[0].curvature, curve[0].curvature)
+                index = ec.chainage.ChainageIndex(sections)
+                chainage = 0
+                for s in curve[1:]:
+                    chainage += s.org_length
+                    x, z, b, k = index.at(chainage)
+                    self.assertAlmostEqual(x, s.pos_x, places=6)
+                    self.assertAlmostEqual(z, s.pos_z, places=6)
+                    self.assertAlmostEqual(k, s.curvature)
+
+    def test_overflow(self):
+        row = {n: c[0] for n, c in self.columns.items()}
+        self.assertEqual(ec.batch.solve_row(dict(row, speed=1e200)),
+                         (ec.common.Status.INVALID, []))
+        self.columns['speed'][1] = 1e200
+        ok, result = ec.batch.execute(self.columns, processes=1)
+        self.assertEqual(ok, 3)
+        self.assertEqual(result['status'][1], ec.common.Status.INVALID.value)
+
+    def test_read_result_failed(self):
+        ec.batch.write_inputs(self.inputs, self.columns)
+        ec.batch.run(self.inputs, self.results)
+        with ec.columnar.Table.open(self.results) as results:
+            self.assertEqual(ec.batch.read_result(results, 3),
+                             (ec.common.Status.RADIUS_BELOW_MINIMUM, []))
+
+    def test_solve_slice(self):
+        ec.batch.write_inputs(self.inputs, self.columns)
+        with ec.columnar.Table.open(self.inputs) as inputs, \
+                ec.columnar.Table.create(self.results, ec.batch.RESULT_COLUMNS,
+                                         len(inputs), ec.batch.RESULT_TYPES) \
+                as results:
+            self.assertEqual(ec.batch.solve(inputs, results, 1, 2), 1)
+            self.assertEqual(results['sections'][0], 0)
+            self.assertEqual(results['sections'][1], 3)
+
+    def test_execute(self):
+        ok, result = ec.batch.execute(self.columns, processes=2, chunk=2)
+        self.assertEqual(ok, 4)
+        ec.batch.write_inputs(self.inputs, self.columns)
+        ec.batch.run(self.inputs, self.results)
+        expected = ec.columnar.read(self.results)
+        self.assertEqual(set(result), set(ec.batch.RESULT_COLUMNS))
+        for n in ec.batch.RESULT_COLUMNS:
+            self.assertEqual(result[n].tobytes(), expected[n].tobytes())
+
+    def test_execute_table(self):
+        ec.batch.write_inputs(self.inputs, self.columns)
+        with ec.columnar.Table.open(self.inputs) as inputs:
+            ok, result = ec.batch.execute(inputs, processes=1)
+        self.assertEqual(ok, 4)
+        self.assertEqual(list(result['sections']), [3, 3, 3, 0, 3])
+
+    def test_execute_arrays(self):
+        columns = {
+            n: array(ec.batch.INPUT_TYPES.get(n, 'd'), v)
+            for n, v in self.columns.items()}
+        self.assertEqual(ec.batch.execute(columns, processes=1)[0], 4)
+
+    def test_exception_chunk(self):
+        with self.assertRaisesRegex(ec.batch.BatchError, 'chunk'):
+            ec.batch.execute(self.columns, chunk=0)
+
+    def test_exception_columns(self):
+        del self.columns['speed']
+        with self.assertRaisesRegex(ec.batch.BatchError, 'speed'):
+            ec.batch.write_inputs(self.inputs, self.columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@
 
 import math
 import os
+import pickle
 import sys
 import unittest
 
@@ -107,3 +108,53 @@ class BearingTests(unittest.TestCase):
     def test_nearly_equal_not_approx(self):
         t1, t2 = ec.common.Bearing(90.001), ec.common.Bearing(90.002)
         self.assertFalse(t1.nearly_equal(t2))
+
+
+class BearingPickleTests(unittest.TestCase):
+
+    def test_round_trip(self):
+        b = ec.common.Bearing(1.234, rad=True)
+        new = pickle.loads(pickle.dumps(b))
+        self.assertEqual(new.rad, b.rad)
+        self.assertEqual(new.__dict__, b.__dict__)
+
+
+class BearingArrayTests(unittest.TestCase):
+
+    def setUp(self):
+        self.values = [0, 0.3, math.pi, 4, 2*math.pi - 1e-9, 7, -1, 2*math.pi]
+        self.bearings = [ec.common.Bearing(v, rad=True) for v in self.values]
+
+    def tearDown(self):
+        del self.values, self.bearings
+
+    def test_normalise_rad(self):
+        self.assertEqual(list(ec.common.normalise_bearings(self.values)),
+                         [b.rad for b in self.bearings])
+
+    def test_normalise_deg(self):
+        degrees = [-10, 0, 90, 370, 359.9999]
+        self.assertEqual(
+            list(ec.common.normalise_bearings(degrees, rad=False)),
+            [ec.common.Bearing(d).rad for d in degrees])
+
+    def test_flip(self):
+        rads = [b.rad for b in self.bearings]
+        self.assertEqual(list(ec.common.flip_bearings(rads)),
+                         [b.flip().rad for b in self.bearings])
+
+    def test_abs(self):
+        rads = [b.rad for b in self.bearings]
+        self.assertEqual(list(ec.common.abs_bearings(rads)),
+                         [abs(b).rad for b in self.bearings])
+
+    def test_nearly_equal(self):
+        first = [ec.common.Bearing(d) for d in (90, 90.00000001, 10, 10)]
+        second = [ec.common.Bearing(d) for d in (90, 90, 190, 10.001)]
+        for both in (False, True):
+            self.assertEqual(
+                ec.common.bearings_nearly_equal(
+                    [b.rad for b in first], [b.rad for b in second],
+                    both=both),
+                [a.nearly_equal(b, both=both)
+                 for a, b in zip(first, second)])
@@ -0,0 +1,125 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for the chainage index
+
+from array import array
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.chainage
+import ec.coord
+import ec.curve
+import ec.fresnel
+import ec.sample
+from tests.tests_common import CustomAssertions
+
+
+class ChainageIndexTests(unittest.TestCase, CustomAssertions):
+
+    def setUp(self):
+        start = ec.coord.TrackCoord(
+            pos_x=217.027, pos_z=34.523, rotation=48.882, quad=ec.coord.Q.NE, curvature=0)
+        end_left = ec.coord.TrackCoord(
+            pos_x=467.962, pos_z=465.900, rotation=12.762, quad=ec.coord.Q.NE, curvature=0)
+        self.curve = ec.curve.TrackCurve(start, 200, 80).curve_fit_radius(
+            end_left, 3000)
+        self.index = ec.chainage.ChainageIndex(self.curve, start=50)
+
+    def tearDown(self):
+        del self.curve, self.index
+
+    def test_exception_too_short(self):
+        with self.assertRaisesRegex(ec.chainage.ChainageError, 'At least two'):
+            ec.chainage.ChainageIndex(self.curve[:1])
+
+    def test_length(self):
+        self.assertEqual(len(self.index), len(self.curve) - 1)
+        self.assertAlmostEqual(self.index.length,
+                               sum(s.org_length for s in self.curve[1:]))
+
+    def test_section(self):
+        first = self.curve[1].org_length
+        self.assertEqual(self.index.section(50), 0)
+        self.assertEqual(self.index.section(50 + first / 2), 0)
+        self.assertEqual(self.index.section(50 + first), 1)
+        self.assertEqual(self.index.section(self.index.end), len(self.index) - 1)
+
+    def test_exception_out_of_range(self):
+        with self.assertRaisesRegex(ec.chainage.ChainageError, 'outside'):
+            self.index.at(49)
+        with self.assertRaisesRegex(ec.chainage.ChainageError, 'outside'):
+            self.index.at(self.index.end + 1)
+
+    def test_at_ends(self):
+        end = self.curve[-1]
+        x, z, b, k = self.index.at(self.index.end)
+        self.assertDataAlmostEqual((x, z, k), (end.pos_x, end.pos_z, 0))
+        self.assertTrue(end.bearing.nearly_equal(b))
+
+    def test_same_as_sample(self):
+        points = list(ec.sample.sample(self.curve, spacing=7, chainage=50))
+        for p in points:
+            self.assertDataAlmostEqual(self.index.at(p[0]), p[1:])
+
+    def test_query_sorted_and_unsorted(self):
+        chainages = [50 + i * 13.5 for i in range(int(self.index.length / 13.5))]
+        expected = [self.index.at(c) for c in chainages]
+        self.assertEqual(self.index.query(chainages), expected)
+        self.assertEqual(self.index.query(chainages[::-1]), expected[::-1])
+
+    def test_query_out(self):
+        chainages = [60, 500, 70, 1200]
+        out = array('d', bytes(8 * 4 * len(chainages)))
+        self.index.query(chainages, out)
+        self.assertEqual(list(out), [v for c in chainages
+                                     for v in self.index.at(c)])
+
+    def test_exception_query_out_of_range(self):
+        with self.assertRaisesRegex(ec.chainage.ChainageError, 'outside'):
+            self.index.query([60, self.index.end + 1])
+
+    def test_query_out_sorted(self):
+        # Sorted chainages are evaluated a section at a time with fill()
+        for order in (1, 3, ec.fresnel.EXACT, ec.fresnel.TABLE):
+            index = ec.chainage.ChainageIndex(self.curve, start=50,
+                                              order=order)
+            chainages = [50 + i * 7.25 for i in
+                         range(int(index.length / 7.25))] + [index.end]
+            out = array('d', bytes(8 * 4 * len(chainages)))
+            index.query(chainages, out)
+            expected = [v for c in chainages for v in index.at(c)]
+            for a, b in zip(out, expected):
+                self.assertAlmostEqual(a, b, places=9)
+
+    def test_query_out_generator(self):
+        for chainages in ([60, 75.5, 120], [120, 60, 75.5]):
+            out = array('d', bytes(8 * 4 * len(chainages)))
+            self.index.query((c for c in chainages), out)
+            expected = [v for c in chainages for v in self.index.at(c)]
+            for a, b in zip(out, expected):
+                self.assertAlmostEqual(a, b, places=9)
+
+    def test_exception_query_out_sorted(self):
+        out = array('d', bytes(8 * 8))
+        with self.assertRaisesRegex(ec.chainage.ChainageError, 'outside'):
+            self.index.query([60, self.index.end + 1], out)
+        with self.assertRaisesRegex(ec.chainage.ChainageError, 'outside'):
+            self.index.query([49, 60], out)
+
+    def test_from_curves(self):
+        second = ec.coord.TrackCoord(
+            pos_x=0, pos_z=100, rotation=0, quad=ec.coord.Q.NONE, curvature=0,
+            org_length=100, org_curvature=0, org_type='straight')
+        start = ec.coord.TrackCoord(0, 0, 0, ec.coord.Q.NONE, curvature=0)
+        index = ec.chainage.ChainageIndex.from_curves(
+            [[start, second], [second, ec.coord.TrackCoord(
+                pos_x=0, pos_z=150, rotation=0, quad=ec.coord.Q.NONE,
+                curvature=0, org_length=50, org_curvature=0,
+                org_type='straight')]])
+        self.assertEqual(len(index), 2)
+        self.assertDataAlmostEqual(index.at(120), (0, 120, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
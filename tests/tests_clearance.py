@@ -0,0 +1,85 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for clearance checks between alignments
+
+from copy import copy
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.clearance
+import ec.coord
+import ec.curve
+import ec.projection
+
+
+def straight(x, z, bearing, length):
+    start = ec.coord.TrackCoord(x, z, bearing, ec.coord.Q.NONE, curvature=0)
+    end = ec.coord.TrackCoord(
+        x + length * math.sin(bearing), z + length * math.cos(bearing),
+        bearing, ec.coord.Q.NONE, curvature=0, org_length=length,
+        org_curvature=0, org_type='straight')
+    return [start, end]
+
+
+class ClearanceTests(unittest.TestCase):
+
+    def setUp(self):
+        self.alignments = [straight(0, 0, 0, 100), straight(4, 10, 0, 100),
+                           straight(-20, 50, math.pi / 2, 100),
+                           straight(50, 0, 0, 10)]
+
+    def tearDown(self):
+        del self.alignments
+
+    def test_exception_keys(self):
+        with self.assertRaisesRegex(ec.clearance.ClearanceError, 'one key'):
+            ec.clearance.ClearanceChecker(self.alignments, keys='ab')
+
+    def test_candidates(self):
+        checker = ec.clearance.ClearanceChecker(self.alignments)
+        self.assertEqual(checker.candidates(5),
+                         {(0, 0, 1, 0), (0, 0, 2, 0), (1, 0, 2, 0)})
+
+    def test_parallel(self):
+        result = ec.clearance.check_clearance(self.alignments[:2], 5)
+        self.assertEqual(len(result), 1)
+        self.assertAlmostEqual(result[0].distance, 4)
+        self.assertFalse(result[0].crossing)
+
+    def test_spacing(self):
+        self.assertEqual(ec.clearance.check_clearance(self.alignments[:2], 4),
+                         [])
+
+    def test_crossing(self):
+        result = ec.clearance.check_clearance(self.alignments, 5, keys='abcd')
+        crossings = {(c.first, c.second): c for c in result if c.crossing}
+        self.assertEqual(set(crossings), {('a', 'c'), ('b', 'c')})
+        self.assertAlmostEqual(crossings['a', 'c'].first_chainage, 50)
+        self.assertAlmostEqual(crossings['a', 'c'].second_chainage, 20)
+        self.assertEqual(result[-1].distance, 4)
+
+    def test_curves(self):
+        start = ec.coord.TrackCoord(
+            pos_x=217.027, pos_z=34.523, rotation=48.882, quad=ec.coord.Q.NE, curvature=0)
+        end_left = ec.coord.TrackCoord(
+            pos_x=467.962, pos_z=465.900, rotation=12.762, quad=ec.coord.Q.NE, curvature=0)
+        curve = ec.curve.TrackCurve(start, 200, 80).curve_fit_radius(
+            end_left, 3000)
+        moved = [copy(s) for s in curve]
+        for s in moved:
+            s.move(5, 0)
+
+        result = ec.clearance.check_clearance([curve, moved], 6)
+        self.assertEqual(len(result), 1)
+        # Check against the projection of the closest point
+        c = result[0]
+        x, z = ec.projection.Projector(moved).index.at(c.second_chainage)[:2]
+        chainage, offset, b = ec.projection.Projector(curve).project(x, z)
+        self.assertAlmostEqual(chainage, c.first_chainage, places=4)
+        self.assertAlmostEqual(abs(offset), c.distance, places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
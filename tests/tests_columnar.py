@@ -0,0 +1,98 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for columnar binary tables
+
+from array import array
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.columnar
+
+
+class ColumnarTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'table.bin')
+        self.columns = {'x': [1.5, 2.5, -3.0], 'id': array('q', [7, 8, 9])}
+
+    def tearDown(self):
+        self.directory.cleanup()
+        del self.directory, self.path, self.columns
+
+    def test_round_trip(self):
+        ec.columnar.write(self.path, self.columns)
+        result = ec.columnar.read(self.path)
+        self.assertEqual(result['x'], array('d', [1.5, 2.5, -3.0]))
+        self.assertEqual(result['id'], array('q', [7, 8, 9]))
+
+    def test_size(self):
+        ec.columnar.write(self.path, self.columns)
+        self.assertEqual(os.path.getsize(self.path),
+                         ec.columnar.table_size(2, 3))
+
+    def test_random_row(self):
+        ec.columnar.write(self.path, self.columns)
+        with ec.columnar.Table.open(self.path) as table:
+            self.assertEqual(table.names, ['x', 'id'])
+            self.assertEqual(table.types, ['d', 'q'])
+            self.assertEqual(table.row(1), {'x': 2.5, 'id': 8})
+            self.assertEqual(table.row(-1), {'x': -3.0, 'id': 9})
+            self.assertEqual(list(table.rows(1)), [(2.5, 8), (-3.0, 9)])
+
+    def test_write_in_place(self):
+        with ec.columnar.Table.create(self.path, ['a', 'b'], 4) as table:
+            self.assertEqual(list(table['a']), [0.0] * 4)
+            table['b'][2] = 6.25
+            table['a'][1:3] = array('d', [1, 2])
+        with ec.columnar.Table.open(self.path) as table:
+            self.assertEqual(list(table['a']), [0, 1, 2, 0])
+            self.assertEqual(table['b'][2], 6.25)
+
+    def test_read_only(self):
+        ec.columnar.write(self.path, self.columns)
+        with ec.columnar.Table.open(self.path) as table:
+            with self.assertRaises(TypeError):
+                table['x'][0] = 1
+
+    def test_from_buffer(self):
+        header = ec.columnar.make_header(['a'], ['d'], 2)
+        buffer = bytearray(ec.columnar.table_size(1, 2))
+        buffer[:len(header)] = header
+        table = ec.columnar.Table.from_buffer(buffer)
+        table['a'][1] = 3
+        table.close()
+        self.assertEqual(buffer[-8:], array('d', [3]).tobytes())
+
+    def test_exception_not_table(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'x' * 32)
+        with self.assertRaisesRegex(ec.columnar.ColumnarError, 'Not a'):
+            ec.columnar.Table.open(self.path)
+
+    def test_exception_truncated(self):
+        ec.columnar.write(self.path, self.columns)
+        with open(self.path, 'r+b') as f:
+            f.truncate(ec.columnar.table_size(2, 3) - 8)
+        with self.assertRaisesRegex(ec.columnar.ColumnarError, 'shorter'):
+            ec.columnar.Table.open(self.path)
+
+    def test_exception_lengths(self):
+        with self.assertRaisesRegex(ec.columnar.ColumnarError, 'same length'):
+            ec.columnar.write(self.path, {'a': [1], 'b': [1, 2]})
+
+    def test_exception_name(self):
+        with self.assertRaisesRegex(ec.columnar.ColumnarError, 'too long'):
+            ec.columnar.write(self.path, {'a' * 16: [1]})
+
+    def test_exception_row(self):
+        ec.columnar.write(self.path, self.columns)
+        with ec.columnar.Table.open(self.path) as table:
+            with self.assertRaisesRegex(ec.columnar.ColumnarError, 'range'):
+                table.row(3)
+
+
+if __name__ == '__main__':
+    unittest.main()
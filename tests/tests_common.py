@@ -247,7 +247,83 @@ class LinearEquationIntersectTests(unittest.TestCase, CustomAssertions):
         le1 = ec.common.LinearEquation(self.b[3], (3, -1))
         self.assertDataAlmostEqual(le0.intersect(le1), (-7, 4.7735026919))
 
+    def test_intersect_one_north(self):
+        le0 = ec.common.LinearEquation(self.b[1], (10, -3))
+        le1 = ec.common.LinearEquation(self.b[0], (3, 0))
+        self.assertDataAlmostEqual(le0.intersect(le1), (3, -3-7/math.sqrt(3)))
+
     def test_intersect_none_orthogonal(self):
         le0 = ec.common.LinearEquation(self.b[1], (10, -3))
         le1 = ec.common.LinearEquation(self.b[3], (-5, -2))
         self.assertDataAlmostEqual(le0.intersect(le1), (3.36602540378, -6.83012701892))
+
+
+class LinearEquationArrayTests(unittest.TestCase, CustomAssertions):
+
+    def setUp(self):
+        self.b = [ec.common.Bearing(i) for i in [0, 60, 90, 120, 180, 270]]
+        self.points = [(-4, 5), (10, -3), (3, 0), (-5, -2), (1, 1), (2, -7)]
+        self.lines = [ec.common.LinearEquation(b, p)
+                      for b, p in zip(self.b, self.points)]
+        self.la = ec.common.LinearEquationArray.from_lines(self.lines)
+
+    def tearDown(self):
+        del self.b, self.points, self.lines, self.la
+
+    def test_length(self):
+        self.assertEqual(len(self.la), 6)
+        with self.assertRaisesRegex(ValueError, 'same length'):
+            ec.common.LinearEquationArray([0, 1], [0], [0, 1])
+
+    def test_getitem(self):
+        line = self.la[3]
+        self.assertAlmostEqual(line.b, self.lines[3].b)
+        self.assertEqual((line.u, line.v), self.points[3])
+
+    def test_move(self):
+        xs, ys = self.la.move(range(6))
+        for i, ln in enumerate(self.lines):
+            self.assertDataAlmostEqual((xs[i], ys[i]), ln.move(i))
+
+    def test_move_single_length(self):
+        xs, ys = self.la.move(-2.5)
+        for i, ln in enumerate(self.lines):
+            self.assertDataAlmostEqual((xs[i], ys[i]), ln.move(-2.5))
+
+    def test_dist(self):
+        xs, ys = [3, -1, 0, 4, 1, 9], [2, 2, -6, 0, 5, 1]
+        result = self.la.dist(xs, ys, absolute=False)
+        for i, ln in enumerate(self.lines):
+            self.assertAlmostEqual(result[i], ln.dist((xs[i], ys[i]), False))
+        self.assertTrue(all(d >= 0 for d in self.la.dist(xs, ys)))
+
+    def test_same_side(self):
+        x1s, y1s = [3, -1, 0, 4, 1, 9], [2, 2, -6, 0, 5, 1]
+        result = self.la.same_side(x1s, y1s, 0, 0)
+        for i, ln in enumerate(self.lines):
+            self.assertEqual(result[i], ln.same_side((x1s[i], y1s[i]),
+                                                     (0, 0)))
+
+    def test_same_side_on_line(self):
+        la = ec.common.LinearEquationArray([0], [0], [0])
+        self.assertEqual(la.same_side([0], [5], [-3], [1]), [True])
+
+    def test_intersect_single(self):
+        other = ec.common.LinearEquation(self.b[1], (-4, 5))
+        xs, ys = self.la.intersect(other)
+        for i in (0, 2, 3, 4, 5):
+            self.assertDataAlmostEqual((xs[i], ys[i]),
+                                       self.lines[i].intersect(other))
+
+    def test_intersect_elementwise(self):
+        others = [self.lines[2], self.lines[0], self.lines[3], self.lines[5],
+                  self.lines[2], self.lines[4]]
+        xs, ys = self.la.intersect(
+            ec.common.LinearEquationArray.from_lines(others))
+        for i, (ln, other) in enumerate(zip(self.lines, others)):
+            self.assertDataAlmostEqual((xs[i], ys[i]), ln.intersect(other))
+
+    def test_intersect_parallel(self):
+        xs, ys = self.la.intersect(self.la)
+        self.assertTrue(all(math.isnan(x) for x in xs))
+        self.assertTrue(all(math.isnan(y) for y in ys))
@@ -1,13 +1,16 @@
 # MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
 # Test script for the TrackCoord class
 
+from copy import copy
 import math
 import os
+import pickle
 import sys
 import unittest
 
 sys.path.insert(0, os.path.abspath('..'))
 import ec.coord
+from ec.common import Bearing
 
 
 class CoordGeneralTests(unittest.TestCase):
@@ -21,6 +24,37 @@ class CoordGeneralTests(unittest.TestCase):
             ec.coord.TrackCoord(None, 5, 0, ec.coord.Q.NONE, curvature=0)
 
 
+class CoordPickleTests(unittest.TestCase):
+
+    def test_round_trip(self):
+        tc = ec.coord.TrackCoord(5.5, -3, 12.5, ec.coord.Q.SE, curvature=-1/600,
+                                 org_curvature=0, org_length=48.2,
+                                 org_type='easement')
+        new = pickle.loads(pickle.dumps(tc))
+        self.assertEqual(new.__dict__.keys(), tc.__dict__.keys())
+        self.assertEqual(new.bearing.rad, tc.bearing.rad)
+        self.assertEqual(new.quad, tc.quad)
+        self.assertEqual((new.pos_x, new.pos_z), (5.5, -3))
+        self.assertEqual((new.curvature, new.org_curvature, new.org_length,
+                          new.org_type), (-1/600, 0, 48.2, 'easement'))
+
+    def test_smaller(self):
+        tc = ec.coord.TrackCoord(5, 5, 0, ec.coord.Q.NONE, curvature=0)
+        state = pickle.dumps((tc.pos_x, tc.pos_z, tc.bearing.rad,
+                              tc.curvature))
+        self.assertLess(len(pickle.dumps(tc)), len(state) + 40)
+
+    def test_copy(self):
+        tc = ec.coord.TrackCoord(5, 5, 1, ec.coord.Q.NONE, curvature=0)
+        tc.extra = 'kept'
+        new = copy(tc)
+        new.move(1, 1)
+        self.assertEqual((tc.pos_x, new.pos_x), (5, 6))
+        self.assertEqual(new.extra, 'kept')
+        # Shallow copy shares the Bearing object
+        self.assertIs(new.bearing, tc.bearing)
+
+
 class CoordBearingTests(unittest.TestCase):
 
     def test_exception_rotation_over_range(self):
@@ -113,3 +147,53 @@ class CoordCurvatureTests(unittest.TestCase):
         r, q = tc.quad
         self.assertAlmostEqual(r, 30)
         self.assertEqual(q, ec.coord.Q.NW.name)
+
+
+class QuadArrayTests(unittest.TestCase):
+
+    def test_quads_to_bearings(self):
+        rotations = [30, 30, 30, 30, -60, 0, 90, 0]
+        quads = [ec.coord.Q.NE, ec.coord.Q.SE, ec.coord.Q.SW, ec.coord.Q.NW,
+                 ec.coord.Q.NE, 'NW', 'SE', 'SW']
+        result = ec.coord.quads_to_bearings(rotations, quads)
+        for r, q, b in zip(rotations, quads, result):
+            if isinstance(q, str):
+                q = ec.coord.Q[q]
+            tc = ec.coord.TrackCoord(0, 0, r, q, curvature=0)
+            self.assertEqual(b, tc.bearing.rad)
+
+    def test_exception_quads_rotation(self):
+        with self.assertRaisesRegex(ec.coord.CoordError, 'y-axis rotation'):
+            ec.coord.quads_to_bearings([10, -100], ['NE', 'NE'])
+
+    def test_exception_quads_quad(self):
+        with self.assertRaisesRegex(ec.coord.CoordError, 'valid quadrant'):
+            ec.coord.quads_to_bearings([10], [ec.coord.Q.NONE])
+
+    def test_bearings_to_quads(self):
+        bearings = [0, 0.5, math.pi / 2, 2, math.pi, 4, 1.5 * math.pi, 6,
+                    2*math.pi - 1e-15]
+        rotations, quads = ec.coord.bearings_to_quads(bearings)
+        for i, b in enumerate(bearings):
+            tc = ec.coord.TrackCoord(0, 0, 0, ec.coord.Q.NONE, curvature=0)
+            tc._bearing = Bearing.__new__(Bearing)
+            tc._bearing._rad = b
+            self.assertEqual((rotations[i], quads[i]), tc.quad)
+
+    def test_exception_bearings_to_quads(self):
+        with self.assertRaisesRegex(ValueError, 'not within'):
+            ec.coord.bearings_to_quads([-0.5])
+
+    def test_format_quad(self):
+        self.assertEqual(ec.coord.format_quad(30.12345, 'SE'),
+                         ('30.123', 'SE'))
+        self.assertEqual(ec.coord.format_quad(359.9999, 'NE'),
+                         ('0.000', 'N'))
+        self.assertEqual(ec.coord.format_quad(0.0001, 'SW'), ('0.000', 'S'))
+        self.assertEqual(ec.coord.format_quad(89.9999, 'NW'),
+                         ('90.000', 'W'))
+        self.assertEqual(ec.coord.format_quad(90, 'SE'), ('90.000', 'E'))
+
+    def test_format_quads(self):
+        self.assertEqual(ec.coord.format_quads([0, math.pi / 2, math.pi]),
+                         [('0.000', 'N'), ('90.000', 'E'), ('0.000', 'S')])
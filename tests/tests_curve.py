@@ -277,3 +277,83 @@ class CurveFitPointTests(BaseTCTests):
     def test_curve_point_curved_right(self):
         curve = self.right.curve_fit_point(self.end_right, self.start_curved_add)
         self.assertTrackAlign(curve[-1], self.end_right)
+
+
+class FeasibilityTests(BaseTCTests):
+
+    def test_radius_ok(self):
+        self.assertIs(self.straight_high.check_feasibility(self.end_left, 600),
+                      ec.common.Status.OK)
+
+    def test_radius_below_minimum(self):
+        self.assertIs(self.straight_high.check_feasibility(self.end_left, 350),
+                      ec.common.Status.RADIUS_BELOW_MINIMUM)
+
+    def test_radius_easements_too_long(self):
+        self.assertIs(self.straight_high.check_feasibility(self.end_low_angle, 500),
+                      ec.common.Status.EASEMENTS_TOO_LONG)
+
+    def test_radius_not_straight(self):
+        self.assertIs(self.right.check_feasibility(self.end_left, 500),
+                      ec.common.Status.NOT_STRAIGHT)
+
+    def test_radius_reverse(self):
+        self.assertIs(self.straight_high.check_feasibility(self.end_reverse_left, 500),
+                      ec.common.Status.REVERSE_PARALLEL)
+
+    def test_radius_parallel(self):
+        self.assertIs(self.straight_high.check_feasibility(self.start_straight, 500),
+                      ec.common.Status.PARALLEL)
+
+    def test_clockwise_unchanged(self):
+        self.straight_low.check_feasibility(self.end_far_right, 225, True)
+        self.assertIsNone(self.straight_low.clockwise)
+
+    def test_point_ok(self):
+        self.assertIs(self.straight_low.check_feasibility(self.end_far_left),
+                      ec.common.Status.OK)
+
+    def test_point_too_close(self):
+        self.assertIs(self.straight_high.check_feasibility(self.end_reverse_left),
+                      ec.common.Status.START_TOO_CLOSE)
+
+    def test_point_not_aligned(self):
+        self.right.get_static_radius(self.start_curved_add)
+        self.assertIs(self.right.check_feasibility(self.end_left),
+                      ec.common.Status.NOT_ALIGNED)
+
+    def test_matches_error_code(self):
+        for other, radius in [(self.end_left, 350), (self.end_low_angle, 500),
+                              (self.end_reverse_left, 500), (self.end_left, 600)]:
+            status = self.straight_high.check_feasibility(other, radius)
+            try:
+                self.straight_high.curve_fit_radius(other, radius)
+            except ec.curve.CurveError as err:
+                self.assertIs(err.code, status)
+            else:
+                self.assertIs(status, ec.common.Status.OK)
+
+    def test_point_no_solution(self):
+        # Curved start for which the first minimum radius curve does not reach
+        # the other track but the search does not converge
+        start = ec.coord.TrackCoord(-366.738, 377.015, 2.235, ec.coord.Q.NONE,
+                                    curvature=-0.001092)
+        end = ec.coord.TrackCoord(-110.758, 397.506, 5.1734, ec.coord.Q.NONE,
+                                  curvature=0)
+        track = ec.curve.TrackCurve(start, 500, 120, split=False)
+        self.assertIs(track.check_feasibility(end),
+                      ec.common.Status.NO_SOLUTION)
+        with self.assertRaises(ec.curve.CurveError) as cm:
+            ec.curve.TrackCurve(start, 500, 120, split=False)\
+                .curve_fit_point(end)
+        self.assertIs(cm.exception.code, ec.common.Status.NO_SOLUTION)
+
+    def test_point_error_code(self):
+        with self.assertRaises(ec.curve.CurveError) as cm:
+            self.straight_high.curve_fit_point(self.end_reverse_left)
+        self.assertIs(cm.exception.code, ec.common.Status.START_TOO_CLOSE)
+
+    def test_track_error_code(self):
+        with self.assertRaises(ec.section.TrackError) as cm:
+            ec.section.TrackSection(self.start_curved, 800, 120)
+        self.assertIs(cm.exception.code, ec.common.Status.RADIUS_BELOW_MINIMUM)
@@ -0,0 +1,125 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for lateral acceleration and jerk along curves
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.coord
+import ec.curve
+import ec.dynamics
+
+
+class SpeedProfileTests(unittest.TestCase):
+
+    def test_constant(self):
+        profile = ec.dynamics.SpeedProfile(100)
+        self.assertEqual(profile(50), (100, 0))
+
+    def test_pairs(self):
+        profile = ec.dynamics.SpeedProfile([(0, 60), (100, 100)])
+        self.assertEqual(profile(-10), (60, 0))
+        self.assertEqual(profile(25), (70, 0.4))
+        self.assertEqual(profile(150), (100, 0))
+
+    def test_function(self):
+        profile = ec.dynamics.SpeedProfile(lambda c: 50 + c / 10)
+        speed, rate = profile(100)
+        self.assertAlmostEqual(speed, 60)
+        self.assertAlmostEqual(rate, 0.1)
+
+    def test_exception_order(self):
+        with self.assertRaisesRegex(ec.dynamics.DynamicsError, 'ascending'):
+            ec.dynamics.SpeedProfile([(10, 60), (0, 100)])
+
+
+class DynamicsTests(unittest.TestCase):
+
+    def setUp(self):
+        start = ec.coord.TrackCoord(
+            pos_x=217.027, pos_z=34.523, rotation=48.882, quad=ec.coord.Q.NE, curvature=0)
+        end_left = ec.coord.TrackCoord(
+            pos_x=467.962, pos_z=465.900, rotation=12.762, quad=ec.coord.Q.NE, curvature=0)
+        self.speed = 120
+        self.ts = ec.curve.TrackCurve(start, 500, self.speed)
+        self.curve = self.ts.curve_fit_radius(end_left, 600)
+
+    def tearDown(self):
+        del self.speed, self.ts, self.curve
+
+    def test_exception_spacing(self):
+        with self.assertRaisesRegex(ec.dynamics.DynamicsError, 'positive'):
+            ec.dynamics.evaluate(self.curve, 100, spacing=0)
+
+    def test_chainages(self):
+        profile = ec.dynamics.evaluate(self.curve, 100, spacing=10)
+        chainages = list(profile['chainage'])
+        self.assertEqual(chainages, sorted(chainages))
+        ends, total = [], 0
+        for s in self.curve[1:]:
+            total += s.org_length
+            ends.append(total)
+        for end in ends:
+            self.assertIn(end, chainages)
+
+    def test_static_acceleration(self):
+        profile = ec.dynamics.evaluate(self.curve, self.speed)
+        v = self.speed / 3.6
+        self.assertAlmostEqual(profile.peak('acceleration'), v * v / 600)
+        self.assertAlmostEqual(profile.peak('curvature'), 1 / 600)
+
+    def test_easement_jerk(self):
+        # Jerk along an easement curve is v^3 / factor at constant speed
+        profile = ec.dynamics.evaluate(self.curve, self.speed)
+        v = self.speed / 3.6
+        self.assertAlmostEqual(profile.peak('jerk'), v ** 3 / self.ts.factor())
+
+    def test_curvature_same_as_easement(self):
+        profile = ec.dynamics.evaluate(self.curve, self.speed)
+        self.ts.clockwise = False
+        for s, k in zip(profile['chainage'], profile['curvature']):
+            if s < self.curve[1].org_length:
+                self.assertAlmostEqual(k, self.ts.easement_curvature(s))
+
+    def test_straight_zero(self):
+        profile = ec.dynamics.evaluate(self.curve, self.speed)
+        self.assertEqual(profile['acceleration'][0], 0)
+        self.assertEqual(profile['acceleration'][-1], 0)
+
+    def test_speed_profile_jerk(self):
+        # Decelerating through the static curve gives jerk from dv/ds
+        profile = ec.dynamics.evaluate(self.curve, [(100, 120), (300, 80)])
+        i = list(profile['chainage']).index(200)
+        v, rate = 100 / 3.6, -0.2 / 3.6
+        self.assertAlmostEqual(profile['jerk'][i], 2 * v * v / 600 * rate)
+
+    def test_exceedances(self):
+        profile = ec.dynamics.evaluate(self.curve, self.speed)
+        result = profile.exceedances()
+        self.assertEqual({r[0] for r in result}, {'acceleration', 'jerk'})
+        self.assertEqual(profile.exceedances({'acceleration': 10, 'jerk': 10}),
+                         [])
+        slow = ec.dynamics.evaluate(self.curve, 40)
+        self.assertEqual(slow.exceedances(), [])
+
+    def test_exceedance_range(self):
+        profile = ec.dynamics.evaluate(self.curve, self.speed)
+        (column, first, last, peak), = profile.exceedances({'jerk': 10})
+        self.assertEqual(column, 'acceleration')
+        self.assertAlmostEqual(peak, profile.peak('acceleration'))
+        self.assertLess(first, self.curve[1].org_length + 1)
+
+    def test_evaluate_many(self):
+        result = ec.dynamics.evaluate_many([self.curve, self.curve], 40)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[0][1], [])
+
+    def test_steady_speed(self):
+        speed = ec.dynamics.steady_speed(1 / 600, 0.65)
+        profile = ec.dynamics.evaluate(self.curve, speed)
+        self.assertAlmostEqual(profile.peak('acceleration'), 0.65)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for fitting circles to points along a track
+
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.common
+import ec.coord
+import ec.fit
+from tests.tests_common import CustomAssertions
+
+
+def arc(cx, cz, radius, start, end, n):
+    """ Points on a circle from angle start to end, measured as bearings
+        from the centre.
+    """
+    angles = [start + (end - start) * i / (n - 1) for i in range(n)]
+    return ([cx + radius * math.sin(t) for t in angles],
+            [cz + radius * math.cos(t) for t in angles])
+
+
+class CircleFitTests(unittest.TestCase, CustomAssertions):
+
+    def test_exception_too_few(self):
+        with self.assertRaisesRegex(ec.fit.FitError, 'At least 3'):
+            ec.fit.fit_circle([0, 1], [0, 1])
+
+    def test_exception_length(self):
+        with self.assertRaisesRegex(ec.fit.FitError, 'same length'):
+            ec.fit.fit_circle([0, 1, 2], [0, 1])
+
+    def test_exception_collinear(self):
+        with self.assertRaisesRegex(ec.fit.FitError, 'collinear'):
+            ec.fit.fit_circle([0, 1, 2, 3], [0, 2, 4, 6])
+
+    def test_exact_points(self):
+        xs, zs = arc(100, -200, 600, 0.2, 0.7, 20)
+        for refined in (False, True):
+            result = ec.fit.fit_circle(xs, zs, refined)
+            self.assertDataAlmostEqual(result.centre, (100, -200))
+            self.assertAlmostEqual(result.radius, 600)
+            self.assertAlmostEqual(result.rms, 0)
+
+    def test_clockwise(self):
+        # Bearings from the centre increasing, ie moving clockwise
+        xs, zs = arc(0, 0, 500, 0.2, 0.7, 10)
+        result = ec.fit.fit_circle(xs, zs)
+        self.assertTrue(result.clockwise)
+        self.assertAlmostEqual(result.curvature, -1 / 500)
+        # Tangent is 90 degrees clockwise from the radius
+        self.assertTrue(ec.common.Bearing(result.start_bearing, rad=True)
+                        .nearly_equal(ec.common.Bearing(0.2 + math.pi / 2, rad=True)))
+
+    def test_anticlockwise(self):
+        xs, zs = arc(0, 0, 500, 0.7, 0.2, 10)
+        result = ec.fit.fit_circle(xs, zs)
+        self.assertFalse(result.clockwise)
+        self.assertAlmostEqual(result.curvature, 1 / 500)
+        self.assertTrue(ec.common.Bearing(result.start_bearing, rad=True)
+                        .nearly_equal(ec.common.Bearing(0.7 - math.pi / 2, rad=True)))
+
+    def test_semicircle(self):
+        result = ec.fit.fit_circle([2, 1, 0], [0, 1, 0])
+        self.assertFalse(result.clockwise)
+        result = ec.fit.fit_circle([0, 1, 2], [0, 1, 0])
+        self.assertTrue(result.clockwise)
+
+    def test_rounded_points(self):
+        xs, zs = arc(354.667, 137.112, 1200, 1.0, 1.15, 50)
+        xs, zs = [round(x, 3) for x in xs], [round(z, 3) for z in zs]
+        result = ec.fit.fit_circle(xs, zs)
+        self.assertAlmostEqual(result.radius, 1200, places=1)
+        self.assertLess(result.rms, 1e-3)
+        algebraic = ec.fit.fit_circle(xs, zs, refined=False)
+        self.assertLessEqual(result.rms, algebraic.rms + 1e-12)
+
+    def test_fit_coords(self):
+        xs, zs = arc(0, 0, 800, 3, 3.5, 5)
+        coords = [ec.coord.TrackCoord(x, z, 0, ec.coord.Q.NONE, curvature=0)
+                  for x, z in zip(xs, zs)]
+        self.assertAlmostEqual(ec.fit.fit_coords(coords).radius, 800)
+
+    def test_fit_circles(self):
+        groups = [arc(0, 0, r, 0, 0.5, 8) for r in (300, 600, 900)]
+        groups.append(([0, 1, 2], [0, 1, 2]))
+        result = ec.fit.fit_circles(groups)
+        self.assertEqual([round(f.radius, 6) for f in result[:3]],
+                         [300, 600, 900])
+        self.assertIsNone(result[3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for the Fresnel integral series
+
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.coord
+import ec.curve
+import ec.fresnel
+import ec.section
+from tests.tests_common import CustomAssertions
+
+
+def simpson(f, length, n=2000):
+    h = length / n
+    total = f(0) + f(length)
+    total += sum((4 if i % 2 else 2) * f(i * h) for i in range(1, n))
+    return total * h / 3
+
+
+class FresnelSeriesTests(unittest.TestCase, CustomAssertions):
+
+    def setUp(self):
+        self.a, self.t = 1 / math.sqrt(2 * 66883.5), 400
+
+    def tearDown(self):
+        del self.a, self.t
+
+    def test_exception_order(self):
+        with self.assertRaisesRegex(ValueError, 'positive integer'):
+            ec.fresnel.coefficients(0)
+
+    def test_order_one_polynomials(self):
+        a, t = self.a, self.t
+        expected = (a**2*t**3 / 3, t - a**4*t**5 / 10)
+        self.assertDataAlmostEqual(ec.fresnel.position(t, a), expected)
+
+    def test_order_one_angle(self):
+        a, t = self.a, self.t
+        xp, zp = a**2*t**2, 1 - a**4*t**4 / 2
+        self.assertAlmostEqual(ec.fresnel.angle(t, a), math.asin(xp / math.hypot(xp, zp)))
+
+    def test_exact_integral(self):
+        a, t = self.a, self.t
+        expected = (simpson(lambda s: math.sin((a*s)**2), t),
+                    simpson(lambda s: math.cos((a*s)**2), t))
+        self.assertDataAlmostEqual(ec.fresnel.position(t, a, ec.fresnel.EXACT), expected)
+
+    def test_error_decreases(self):
+        errors = ec.fresnel.accuracy(self.a, self.t, orders=range(1, 6))
+        self.assertEqual(sorted(errors[o][0] for o in errors),
+                         [errors[o][0] for o in range(5, 0, -1)])
+
+    def test_cheapest_order(self):
+        order = ec.fresnel.cheapest_order(self.a, self.t, 0.001)
+        errors = ec.fresnel.accuracy(self.a, self.t, orders=[order - 1, order])
+        self.assertGreater(errors[order - 1][0], 0.001)
+        self.assertLessEqual(errors[order][0], 0.001)
+
+
+class SectionOrderTests(unittest.TestCase, CustomAssertions):
+
+    def setUp(self):
+        self.start = ec.coord.TrackCoord(
+            pos_x=217.027, pos_z=34.523, rotation=48.882, quad=ec.coord.Q.NE, curvature=0)
+        self.end = ec.coord.TrackCoord(
+            pos_x=467.962, pos_z=465.900, rotation=12.762, quad=ec.coord.Q.NE, curvature=0)
+
+    def tearDown(self):
+        del self.start, self.end
+
+    def test_exact_curvature(self):
+        ts = ec.section.TrackSection(self.start, 300, 160, ec.fresnel.EXACT)
+        length = ts.easement_length(1/300)
+        self.assertAlmostEqual(ts.easement_angle(length), length**2 / (2 * ts.factor()))
+
+    def test_curve_orders_aligned(self):
+        for order in [1, 3, ec.fresnel.EXACT, ec.fresnel.TABLE]:
+            track = ec.curve.TrackCurve(self.start, 500, 120, order=order)
+            curve = track.curve_fit_radius(self.end, 600)
+            self.assertTrackAlign(curve[-1], self.end)
+
+
+class ClothoidTableTests(unittest.TestCase, CustomAssertions):
+
+    def setUp(self):
+        self.a = 1 / math.sqrt(2 * 122268)
+        self.table = ec.fresnel.table(self.a)
+
+    def tearDown(self):
+        del self.a, self.table
+
+    def test_cached(self):
+        self.assertIs(ec.fresnel.table(self.a), self.table)
+
+    def test_error_bound(self):
+        self.assertLessEqual(self.table.error_bound / self.a, 1e-6)
+        for t in [0, 0.3, 17.5, 123.4, 300, 407.5, 900]:
+            exact = ec.fresnel.position(t, self.a, ec.fresnel.EXACT)
+            result = ec.fresnel.position(t, self.a, ec.fresnel.TABLE)
+            self.assertDataAlmostEqual(result, exact, places=6)
+
+    def test_beyond_table(self):
+        t = 2 * self.table.s_max / self.a
+        self.assertEqual(self.table.position(t, self.a), ec.fresnel.position(t, self.a, ec.fresnel.EXACT))
+
+    def test_save_load(self):
+        path = os.path.join(os.path.dirname(__file__), 'table.tmp')
+        try:
+            self.table.save(path)
+            loaded = ec.fresnel.ClothoidTable.load(path)
+            self.assertEqual(len(loaded), len(self.table))
+            self.assertEqual(loaded.position(250, self.a), self.table.position(250, self.a))
+            self.assertEqual(loaded.error_bound, self.table.error_bound)
+            del loaded
+        finally:
+            os.remove(path)
@@ -0,0 +1,72 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for the float-only geometry functions
+
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.kernel as kernel
+from ec.common import Bearing, LinearEquation, transform
+from tests.tests_common import CustomAssertions
+
+
+class TransformTests(unittest.TestCase):
+
+    def test_same_as_transform(self):
+        for t in (0, 0.3, math.pi / 2, 2, -1.2):
+            rot = kernel.rotation(t)
+            self.assertEqual(kernel.transform(3, -4, rot, 1, 2, 5, 6),
+                             transform(a=(3, -4), r=t, b=(1, 2), c=(5, 6)))
+            self.assertEqual(kernel.transform(3, -4, rot, cx=5, cy=6),
+                             transform(a=(3, -4), r=t, c=(5, 6)))
+
+    def test_axis_default(self):
+        self.assertEqual(kernel.transform(2, 1, kernel.rotation(0.5), 1, 1),
+                         transform(a=(2, 1), r=0.5, b=(1, 1)))
+
+
+class LineTests(unittest.TestCase, CustomAssertions):
+
+    def setUp(self):
+        self.lines = [((1, 2), 0.4), ((-3, 5), 2.1), ((0, 0), math.pi / 2),
+                      ((4, -1), 0), ((2, 2), 5.5)]
+
+    def test_dist(self):
+        for (u, v), b in self.lines:
+            eq = LinearEquation(Bearing(b, rad=True), (u, v))
+            ln = kernel.line(u, v, b)
+            self.assertEqual(kernel.dist(ln, 7, -3),
+                             eq.dist((7, -3), absolute=False))
+
+    def test_same_side(self):
+        ln = kernel.line(0, 0, 0)
+        self.assertTrue(kernel.same_side(ln, 1, 0, 2, 5))
+        self.assertFalse(kernel.same_side(ln, 1, 0, -2, 5))
+        self.assertTrue(kernel.same_side(ln, 0, 3, -2, 5))
+
+    def test_intersect(self):
+        for (u1, v1), b1 in self.lines:
+            for (u2, v2), b2 in self.lines:
+                if b1 == b2:
+                    continue
+                first = LinearEquation(Bearing(b1, rad=True), (u1, v1))
+                second = LinearEquation(Bearing(b2, rad=True), (u2, v2))
+                self.assertDataAlmostEqual(
+                    kernel.intersect(kernel.line(u1, v1, b1),
+                                     kernel.line(u2, v2, b2)),
+                    first.intersect(second))
+
+    def test_intersect_north(self):
+        self.assertDataAlmostEqual(
+            kernel.intersect(kernel.line(0, 0, 0),
+                             kernel.line(3, 4, math.pi / 4)), (0, 1))
+
+    def test_intersect_parallel(self):
+        self.assertIsNone(kernel.intersect(kernel.line(0, 0, 0.5),
+                                           kernel.line(3, 1, 0.5)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for the Layout class
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.coord
+import ec.curve
+import ec.layout
+from tests.tests_common import CustomAssertions
+
+
+class LayoutTests(unittest.TestCase, CustomAssertions):
+
+    def setUp(self):
+        self.layout = ec.layout.Layout(500, 120)
+        self.layout.add_coord('start', ec.coord.TrackCoord(
+            pos_x=217.027, pos_z=34.523, rotation=48.882, quad=ec.coord.Q.NE, curvature=0))
+        self.layout.add_coord('left', ec.coord.TrackCoord(
+            pos_x=467.962, pos_z=465.900, rotation=12.762, quad=ec.coord.Q.NE, curvature=0))
+        self.layout.add_coord('right', ec.coord.TrackCoord(
+            pos_x=582.769, pos_z=223.772, rotation=75.449, quad=ec.coord.Q.NE, curvature=0))
+        self.layout.add_join('a', 'start', 'left', radius=600)
+        self.layout.add_join('b', 'start', 'right', method='point')
+
+    def tearDown(self):
+        del self.layout
+
+    def test_exception_missing_coord(self):
+        with self.assertRaisesRegex(ec.layout.LayoutError, 'have not been added'):
+            self.layout.add_join('c', 'start', 'nowhere', radius=600)
+
+    def test_exception_wrong_method(self):
+        with self.assertRaisesRegex(ec.layout.LayoutError, 'not a valid method'):
+            self.layout.add_join('c', 'start', 'left', method='spline')
+
+    def test_lazy_result(self):
+        self.assertEqual(self.layout.dirty(), {'a', 'b'})
+        curve = self.layout['a']
+        self.assertTrackAlign(curve[-1], self.layout.coords['left'])
+        self.assertEqual(self.layout.dirty(), {'b'})
+
+    def test_error_traceback(self):
+        self.layout.add_join('c', 'start', 'left', radius=100)
+        depths = []
+        for i in range(3):
+            try:
+                self.layout['c']
+            except ec.curve.CurveError as err:
+                tb, depth = err.__traceback__, 0
+                while tb is not None:
+                    tb, depth = tb.tb_next, depth + 1
+                depths.append(depth)
+        self.assertEqual(depths[1], depths[2])
+
+    def test_errors(self):
+        self.layout.add_join('c', 'start', 'left', radius=100)
+        self.assertEqual(set(self.layout.results()), {'a', 'b'})
+        errors = self.layout.errors()
+        self.assertEqual(set(errors), {'c'})
+        self.assertIsInstance(errors['c'], ec.curve.CurveError)
+
+    def test_cached_result(self):
+        first = self.layout['a']
+        self.assertIs(self.layout['a'], first)
+        self.assertEqual(self.layout.stats['computed'], 1)
+        self.assertEqual(self.layout.stats['cached'], 1)
+
+    def test_move_only_affects_dependents(self):
+        self.layout.results()
+        self.layout.move_coord('left', 10, 0)
+        self.assertEqual(self.layout.dirty(), {'a'})
+        self.assertEqual(self.layout.stats['skipped'], 1)
+        curve = self.layout['a']
+        self.assertTrackAlign(curve[-1], self.layout.coords['left'])
+        self.assertEqual(self.layout.stats['computed'], 3)
+
+    def test_inputs_not_modified(self):
+        self.layout.add_coord('add', ec.coord.TrackCoord(
+            pos_x=287.741, pos_z=92.965, rotation=53.356, quad=ec.coord.Q.NE, curvature=0))
+        self.layout.add_join('c', 'start', 'right', method='point', add_point='add')
+        self.layout['c']
+        self.assertEqual(self.layout.coords['start'].curvature, 0)
+
+    def test_error_cached(self):
+        self.layout.add_join('c', 'start', 'left', radius=100)
+        for i in range(2):
+            with self.assertRaisesRegex(ec.curve.CurveError, 'must be greater'):
+                self.layout['c']
+        self.assertEqual(self.layout.stats['computed'], 1)
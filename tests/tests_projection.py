@@ -0,0 +1,78 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for projecting points onto track sections
+
+from array import array
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.coord
+import ec.curve
+import ec.projection
+import ec.sample
+from tests.tests_common import CustomAssertions
+
+
+class ProjectorTests(unittest.TestCase, CustomAssertions):
+
+    def setUp(self):
+        start = ec.coord.TrackCoord(
+            pos_x=217.027, pos_z=34.523, rotation=48.882, quad=ec.coord.Q.NE, curvature=0)
+        end_left = ec.coord.TrackCoord(
+            pos_x=467.962, pos_z=465.900, rotation=12.762, quad=ec.coord.Q.NE, curvature=0)
+        self.curve = ec.curve.TrackCurve(start, 200, 80).curve_fit_radius(
+            end_left, 3000)
+        self.projector = ec.projection.Projector(self.curve)
+        self.points = [(300, 200), (600, 400), (250, 150), (650, 800),
+                       (150, 0), (400, 250)]
+
+    def tearDown(self):
+        del self.curve, self.projector, self.points
+
+    def test_point_on_track(self):
+        for chainage in (10, 200, 777.7, 1500):
+            x, z, b, k = self.projector.index.at(chainage)
+            result = self.projector.project(x, z)
+            self.assertDataAlmostEqual(result, (chainage, 0, b), places=6)
+
+    def test_offset(self):
+        x, z, b, k = self.projector.index.at(400)
+        # 5 m to the right and to the left of the track
+        right = self.projector.project(x + 5 * math.cos(b), z - 5 * math.sin(b))
+        left = self.projector.project(x - 5 * math.cos(b), z + 5 * math.sin(b))
+        self.assertDataAlmostEqual(right, (400, 5, b), places=6)
+        self.assertDataAlmostEqual(left, (400, -5, b), places=6)
+
+    def test_nearest(self):
+        samples = list(ec.sample.sample(self.curve, spacing=0.5))
+        for x, z in self.points:
+            chainage, offset, b = self.projector.project(x, z)
+            px, pz = self.projector.index.at(chainage)[:2]
+            nearest = min(math.hypot(p[1] - x, p[2] - z) for p in samples)
+            self.assertLessEqual(math.hypot(px - x, pz - z), nearest + 1e-9)
+
+    def test_beyond_start(self):
+        start = self.curve[0]
+        x = start.pos_x - 10 * math.sin(start.bearing.rad)
+        z = start.pos_z - 10 * math.cos(start.bearing.rad)
+        chainage, offset, b = self.projector.project(x, z)
+        self.assertEqual(chainage, 0)
+        self.assertAlmostEqual(offset, 0)
+
+    def test_project_many(self):
+        xs, zs = zip(*self.points)
+        expected = [self.projector.project(x, z) for x, z in self.points]
+        self.assertEqual(self.projector.project_many(xs, zs), expected)
+        out = array('d', bytes(8 * 3 * len(xs)))
+        self.projector.project_many(xs, zs, out)
+        self.assertEqual(list(out), [v for row in expected for v in row])
+
+    def test_exception_project_many(self):
+        with self.assertRaisesRegex(ec.projection.ProjectionError, 'same length'):
+            self.projector.project_many([1, 2], [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for sampling points along fitted curves
+
+from array import array
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.coord
+import ec.curve
+import ec.sample
+from tests.tests_common import CustomAssertions
+
+
+class BaseSampleTests(unittest.TestCase, CustomAssertions):
+
+    def setUp(self):
+        start = ec.coord.TrackCoord(
+            pos_x=217.027, pos_z=34.523, rotation=48.882, quad=ec.coord.Q.NE, curvature=0)
+        start_curved = ec.coord.TrackCoord(
+            pos_x=354.667, pos_z=137.112, rotation=59.824, quad=ec.coord.Q.NE, curvature=-1/600)
+        end_left = ec.coord.TrackCoord(
+            pos_x=467.962, pos_z=465.900, rotation=12.762, quad=ec.coord.Q.NE, curvature=0)
+        end_right = ec.coord.TrackCoord(
+            pos_x=582.769, pos_z=223.772, rotation=75.449, quad=ec.coord.Q.NE, curvature=0)
+
+        self.left = ec.curve.TrackCurve(start, 200, 80).curve_fit_radius(
+            end_left, 3000)
+        self.right = ec.curve.TrackCurve(start, 500, 120).curve_fit_radius(
+            end_right, 600)
+        self.point = ec.curve.TrackCurve(start_curved, 500, 120) \
+            .curve_fit_point(end_right)
+
+    def tearDown(self):
+        del self.left, self.right, self.point
+
+
+class SectionGeometryTests(BaseSampleTests):
+
+    def test_exception_no_length(self):
+        with self.assertRaisesRegex(ec.sample.SampleError, 'no length'):
+            ec.sample.SectionGeometry(self.left[0], self.left[0])
+
+    def test_kinds(self):
+        kinds = [ec.sample.SectionGeometry(s, e).kind
+                 for s, e in zip(self.left[:-1], self.left[1:])]
+        self.assertEqual(kinds, ['easement'] + ['static'] * 4 + ['easement'])
+
+    def test_ends(self):
+        for curve in (self.left, self.right, self.point):
+            for start, end in zip(curve[:-1], curve[1:]):
+                geometry = ec.sample.SectionGeometry(start, end)
+                x, z, b, k = geometry.point(geometry.length)
+                self.assertDataAlmostEqual((x, z, k),
+                                           (end.pos_x, end.pos_z, end.curvature))
+                self.assertTrue(end.bearing.nearly_equal(b))
+
+    def test_start(self):
+        start, end = self.point[0], self.point[1]
+        geometry = ec.sample.SectionGeometry(start, end)
+        x, z, b, k = geometry.point(0)
+        self.assertDataAlmostEqual((x, z, b, k), (start.pos_x, start.pos_z,
+                                                  start.bearing.rad, start.curvature))
+
+    def test_straight(self):
+        start = ec.coord.TrackCoord(0, 0, math.pi / 2, ec.coord.Q.NONE,
+                                    curvature=0)
+        end = ec.coord.TrackCoord(10, 0, math.pi / 2, ec.coord.Q.NONE,
+                                  curvature=0, org_length=10,
+                                  org_curvature=0, org_type='straight')
+        geometry = ec.sample.SectionGeometry(start, end)
+        self.assertEqual(geometry.kind, 'straight')
+        self.assertDataAlmostEqual(geometry.point(4), (4, 0, math.pi / 2, 0))
+
+
+class SampleTests(BaseSampleTests):
+
+    def test_exception_spacing(self):
+        with self.assertRaisesRegex(ec.sample.SampleError, 'Either spacing'):
+            list(ec.sample.sample(self.left))
+        with self.assertRaisesRegex(ec.sample.SampleError, 'Either spacing'):
+            list(ec.sample.sample(self.left, 1, 0.01))
+        with self.assertRaisesRegex(ec.sample.SampleError, 'positive'):
+            list(ec.sample.sample(self.left, spacing=-1))
+
+    def test_spacing(self):
+        points = list(ec.sample.sample(self.left, spacing=10, chainage=100))
+        total = sum(s.org_length for s in self.left[1:])
+        self.assertEqual([p[0] for p in points[:-1]],
+                         [100 + 10 * i for i in range(len(points) - 1)])
+        self.assertAlmostEqual(points[-1][0], 100 + total)
+        end = self.left[-1]
+        self.assertEqual(points[-1][1:], (end.pos_x, end.pos_z,
+                                          end.bearing.rad, 0))
+
+    def test_spacing_distance(self):
+        points = list(ec.sample.sample(self.right, spacing=1))
+        for a, b in zip(points, points[1:]):
+            self.assertAlmostEqual(math.hypot(b[1] - a[1], b[2] - a[2]),
+                                   b[0] - a[0], places=4)
+
+    def test_chord_error(self):
+        points = list(ec.sample.sample(self.left, chord_error=0.01))
+        for a, b in zip(points, points[1:]):
+            # Sagitta of chord between points on the static curve
+            chord = math.hypot(b[1] - a[1], b[2] - a[2])
+            self.assertLessEqual(chord ** 2 / 8 * 1 / 3000, 0.01)
+
+    def test_count(self):
+        for curve in (self.left, self.right, self.point):
+            self.assertEqual(
+                ec.sample.sample_count(curve, spacing=2),
+                len(list(ec.sample.sample(curve, spacing=2))))
+            self.assertEqual(
+                ec.sample.sample_count(curve, chord_error=0.001),
+                len(list(ec.sample.sample(curve, chord_error=0.001))))
+
+    def straights(self, lengths):
+        sections = [ec.coord.TrackCoord(0, 0, 0, ec.coord.Q.NONE, curvature=0)]
+        position = 0
+        for length in lengths:
+            position += length
+            sections.append(ec.coord.TrackCoord(
+                0, position, 0, ec.coord.Q.NONE, curvature=0,
+                org_length=length, org_type='straight'))
+        return sections
+
+    def test_count_rounding(self):
+        # Section lengths and spacing with rounding errors at boundaries
+        cases = [([0.7*3, 1.1*3, 1.1, 0.1], 0.3, 0),
+                 ([0.1, 0.2, 0.3], 0.1, 0),
+                 ([0.3] * 7, 0.1, 0.7),
+                 ([1.1, 2.2, 3.3], 1.1, 1000.1)]
+        for lengths, spacing, chainage in cases:
+            sections = self.straights(lengths)
+            points = list(ec.sample.sample(sections, spacing=spacing,
+                                           chainage=chainage))
+            self.assertEqual(ec.sample.sample_count(sections, spacing=spacing,
+                                                    chainage=chainage),
+                             len(points))
+            chainages = [p[0] for p in points]
+            # No points repeated either side of a boundary or at the end
+            for a, b in zip(chainages, chainages[1:]):
+                self.assertGreater(b - a, 1e-6)
+            out = array('d', bytes(8 * 5 * len(points)))
+            self.assertEqual(ec.sample.sample_into(
+                out, sections, spacing=spacing, chainage=chainage),
+                len(points))
+
+    def test_sample_into(self):
+        n = ec.sample.sample_count(self.right, spacing=5)
+        out = array('d', bytes(8 * 5 * n))
+        self.assertEqual(ec.sample.sample_into(out, self.right, spacing=5), n)
+        points = list(ec.sample.sample(self.right, spacing=5))
+        self.assertEqual(list(out), [v for p in points for v in p])
+
+    def test_sample_into_too_small(self):
+        with self.assertRaisesRegex(ec.sample.SampleError, 'too small'):
+            ec.sample.sample_into(array('d', [0] * 10), self.right, spacing=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -284,5 +284,42 @@ class StaticCurveTests(CurveBaseTests):
                     'b': 0}
         self.assertDataAlmostEqual(end_dict, result_d)
 
+
+class SplitStaticCurveTests(CurveBaseTests):
+
+    def test_exception_straight(self):
+        with self.assertRaisesRegex(ec.section.TrackError, 'track is already straight'):
+            self.straight.split_static_curve(1, 500)
+
+    def test_split_lengths(self):
+        sections = self.left.split_static_curve(math.pi/2, 500)
+        lengths = [s.org_length for s in sections]
+        self.assertEqual(len(sections), 4)
+        self.assertEqual(lengths[:3], [500, 500, 500])
+        self.assertAlmostEqual(lengths[3], 500 * math.pi - 1500)
+
+    def test_split_end_same_as_single(self):
+        for ts in (self.left, self.right):
+            end = ts.split_static_curve(math.pi/2, 500)[-1]
+            single = ts.static_curve(math.pi/2)
+            self.assertEqual((end.pos_x, end.pos_z, end.bearing.rad),
+                             (single.pos_x, single.pos_z, single.bearing.rad))
+
+    def test_split_same_as_chained(self):
+        sections = self.right.split_static_curve(math.pi/2, 300)
+        start = self.right.start
+        for s in sections:
+            ts = ec.section.TrackSection(start, 500, 120)
+            start = ts.static_curve(arc_length=s.org_length)
+            self.assertDataAlmostEqual(
+                (s.pos_x, s.pos_z, s.bearing.rad),
+                (start.pos_x, start.pos_z, start.bearing.rad))
+
+    def test_split_single_section(self):
+        sections = self.left.split_static_curve(math.pi/3, 2000)
+        self.assertEqual(len(sections), 1)
+        self.assertAlmostEqual(sections[0].org_length, 1000 * math.pi/3)
+
+
 if __name__ == "__main__":
     unittest.main()
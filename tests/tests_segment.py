@@ -0,0 +1,103 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for segmenting polylines into track sections
+
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.coord
+import ec.curve
+import ec.sample
+import ec.segment
+
+
+class SegmentTests(unittest.TestCase):
+
+    def setUp(self):
+        start = ec.coord.TrackCoord(
+            pos_x=217.027, pos_z=34.523, rotation=48.882, quad=ec.coord.Q.NE, curvature=0)
+        end_left = ec.coord.TrackCoord(
+            pos_x=467.962, pos_z=465.900, rotation=12.762, quad=ec.coord.Q.NE, curvature=0)
+        self.curve = ec.curve.TrackCurve(start, 500, 120).curve_fit_radius(
+            end_left, 600)
+
+        # Straight track 100 m long either side of the curve
+        first, last = self.curve[0], self.curve[-1]
+        b0, b1 = first.bearing.rad, last.bearing.rad
+        points = [(first.pos_x - (100 - i) * math.sin(b0),
+                   first.pos_z - (100 - i) * math.cos(b0)) for i in range(100)]
+        points += [p[1:3] for p in ec.sample.sample(self.curve, spacing=1)]
+        points += [(last.pos_x + i * math.sin(b1), last.pos_z + i * math.cos(b1))
+                   for i in range(1, 101)]
+        # Same precision as values copied from the editor
+        self.points = [(round(x, 3), round(z, 3)) for x, z in points]
+
+    def tearDown(self):
+        del self.curve, self.points
+
+    def test_exception_too_few(self):
+        segmenter = ec.segment.Segmenter()
+        segmenter.feed(0, 0)
+        with self.assertRaisesRegex(ec.segment.SegmentError, 'At least two'):
+            segmenter.finish()
+
+    def test_exception_window(self):
+        with self.assertRaisesRegex(ec.segment.SegmentError, 'at least 1'):
+            ec.segment.Segmenter(window=0)
+
+    def test_types(self):
+        result = list(ec.segment.segment(self.points))
+        self.assertEqual([s.org_type for s in result],
+                         [None, 'straight', 'easement', 'static', 'easement',
+                          'straight'])
+
+    def test_static_radius(self):
+        result = list(ec.segment.segment(self.points))
+        self.assertAlmostEqual(result[3].radius, 600, delta=1)
+        self.assertEqual(result[3].clockwise, 'ACW')
+
+    def test_lengths(self):
+        result = list(ec.segment.segment(self.points))
+        total = sum(s.org_length for s in result[1:])
+        self.assertAlmostEqual(total, 200 + sum(s.org_length for s in self.curve[1:]),
+                               delta=1)
+        for section, fitted in zip(result[2:5], self.curve[1:]):
+            self.assertAlmostEqual(section.org_length, fitted.org_length, delta=5)
+
+    def test_continuity(self):
+        result = list(ec.segment.segment(self.points))
+        for previous, section in zip(result[1:], result[2:]):
+            self.assertEqual(section.org_curvature, previous.curvature)
+        self.assertEqual(result[0].curvature, 0)
+        self.assertEqual(result[-1].curvature, 0)
+
+    def test_ends(self):
+        result = list(ec.segment.segment(self.points))
+        self.assertEqual((result[0].pos_x, result[0].pos_z), self.points[0])
+        self.assertEqual((result[-1].pos_x, result[-1].pos_z), self.points[-1])
+
+    def test_straight_only(self):
+        points = [(i * 0.6, i * 0.8) for i in range(50)]
+        result = list(ec.segment.segment(points))
+        self.assertEqual([s.org_type for s in result], [None, 'straight'])
+        self.assertAlmostEqual(result[1].org_length, 49)
+        self.assertAlmostEqual(result[1].bearing.rad, math.atan2(0.6, 0.8))
+
+    def test_short_polyline(self):
+        result = list(ec.segment.segment([(0, 0), (0, 1), (0, 2)]))
+        self.assertEqual([s.org_type for s in result], [None, 'straight'])
+
+    def test_streaming(self):
+        segmenter = ec.segment.Segmenter()
+        emitted = []
+        for x, z in self.points:
+            emitted.append(len(segmenter.feed(x, z)))
+        # Sections are emitted before the end of the polyline
+        self.assertGreater(sum(emitted), 0)
+        self.assertEqual(sum(emitted) + len(segmenter.finish()), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,234 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for the local HTTP/JSON service
+
+import asyncio
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.common
+import ec.coord
+import ec.curve
+import ec.service
+from tests.tests_common import CustomAssertions
+
+
+async def request(port, method, path, data=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = json.dumps(data).encode() if data is not None else b''
+    writer.write('{0} {1} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {2}'
+                 '\r\nConnection: close\r\n\r\n'.format(method, path, len(body))
+                 .encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(body.decode())
+
+
+class HistogramTests(unittest.TestCase):
+
+    def test_record(self):
+        h = ec.service.Histogram()
+        for ms in (0.2, 3, 3, 4, 700):
+            h.record(ms)
+        result = h.as_dict()
+        self.assertEqual(result['count'], 5)
+        self.assertEqual(result['max_ms'], 700)
+        self.assertEqual(result['buckets']['le_5'], 3)
+        self.assertEqual(result['p50_ms'], 5)
+        self.assertEqual(result['p99_ms'], 700)
+
+
+class ParseTests(unittest.TestCase):
+
+    def test_quad(self):
+        row = ec.service.parse_request(ec.service.batch.Method.RADIUS, {
+            'start': {'x': 1, 'z': 2, 'rotation': 10, 'quad': 'se'},
+            'end': {'x': 3, 'z': 4, 'bearing': 90}, 'radius': 600,
+            'minimum': 500, 'speed': 120, 'clockwise': True})
+        self.assertAlmostEqual(row['start_bearing'], ec.coord.TrackCoord(
+            0, 0, 10, ec.coord.Q.SE).bearing.rad)
+        self.assertEqual((row['value'], row['clockwise']), (600, 1))
+
+    def test_exception_coord(self):
+        with self.assertRaisesRegex(ec.service.ServiceError, "'end'"):
+            ec.service.parse_request(ec.service.batch.Method.POINT, {
+                'start': {'x': 1, 'z': 2, 'bearing': 0}, 'end': {'x': 1},
+                'minimum': 500, 'speed': 120})
+
+    def test_exception_value(self):
+        with self.assertRaisesRegex(ec.service.ServiceError, 'length'):
+            ec.service.parse_request(ec.service.batch.Method.LENGTH, {
+                'start': {'x': 1, 'z': 2, 'bearing': 0},
+                'end': {'x': 1, 'z': 5, 'bearing': 0},
+                'minimum': 500, 'speed': 120})
+
+    def test_exception_end_curved(self):
+        with self.assertRaisesRegex(ec.service.ServiceError, 'straight'):
+            ec.service.parse_request(ec.service.batch.Method.POINT, {
+                'start': {'x': 1, 'z': 2, 'bearing': 0},
+                'end': {'x': 1, 'z': 5, 'bearing': 90, 'curvature': 0.002},
+                'minimum': 500, 'speed': 120})
+
+
+class ServiceTests(unittest.TestCase, CustomAssertions):
+
+    def setUp(self):
+        super(ServiceTests, self).setUp()
+        self.start = ec.coord.TrackCoord(
+            pos_x=217.027, pos_z=34.523, rotation=48.882, quad=ec.coord.Q.NE, curvature=0)
+        self.end = ec.coord.TrackCoord(
+            pos_x=467.962, pos_z=465.900, rotation=12.762, quad=ec.coord.Q.NE, curvature=0)
+        self.data = {'start': {'x': 217.027, 'z': 34.523, 'rotation': 48.882,
+                               'quad': 'NE'},
+                     'end': {'x': 467.962, 'z': 465.900, 'rotation': 12.762,
+                             'quad': 'NE'},
+                     'radius': 600, 'minimum': 500, 'speed': 120}
+
+    def tearDown(self):
+        del self.start, self.end, self.data
+
+    def run_service(self, test, window=0.01):
+        async def run():
+            service = await ec.service.Service(port=0, window=window).start()
+            try:
+                return await test(service)
+            finally:
+                await service.close()
+        return asyncio.run(run())
+
+    def test_curve_fit_radius(self):
+        async def test(service):
+            return await request(service.port, 'POST', '/curve_fit_radius',
+                                 self.data)
+        status, result = self.run_service(test)
+        self.assertEqual(status, 200)
+        self.assertEqual(result['status'], 'OK')
+        curve = ec.curve.TrackCurve(self.start, 500, 120, split=False)\
+            .curve_fit_radius(self.end, 600)
+        self.assertEqual(len(result['sections']), len(curve) - 1)
+        self.assertEqual(result['start']['curvature'], 0)
+        self.assertEqual([s['type'] for s in result['sections']],
+                         [s.org_type for s in curve[1:]])
+        last = result['sections'][-1]
+        fitted = ec.coord.TrackCoord(last['x'], last['z'], last['rotation'],
+                                     ec.coord.Q[last['quad']],
+                                     curvature=last['curvature'])
+        self.assertTrackAlign(fitted, curve[-1])
+
+    def test_not_ok(self):
+        self.data['radius'] = 350
+
+        async def test(service):
+            return await request(service.port, 'POST', '/curve_fit_radius',
+                                 self.data)
+        status, result = self.run_service(test)
+        self.assertEqual(status, 422)
+        self.assertEqual(result['status'], 'RADIUS_BELOW_MINIMUM')
+
+    def test_micro_batch(self):
+        async def test(service):
+            requests = [request(service.port, 'POST', '/curve_fit_radius',
+                                dict(self.data, radius=600 + i))
+                        for i in range(10)]
+            results = await asyncio.gather(*requests)
+            return results, service.stats()
+        results, stats = self.run_service(test, window=0.2)
+        self.assertEqual({r[0] for r in results}, {200})
+        batches = stats['batches']['/curve_fit_radius']
+        self.assertEqual(batches['rows'], 10)
+        self.assertLess(batches['batches'], 10)
+
+    def test_bad_row_in_batch(self):
+        async def test(service):
+            return await asyncio.gather(
+                request(service.port, 'POST', '/curve_fit_radius', self.data),
+                request(service.port, 'POST', '/curve_fit_radius',
+                        dict(self.data, speed=1e200)))
+        (status, result), (bad_status, bad) = self.run_service(test,
+                                                               window=0.2)
+        self.assertEqual((status, result['status']), (200, 'OK'))
+        self.assertEqual((bad_status, bad['status']), (422, 'INVALID'))
+
+    def test_solve_batch_fallback(self):
+        rows = [ec.service.parse_request(ec.service.batch.Method.RADIUS,
+                                         self.data) for _ in range(2)]
+        # Missing column makes the whole batch fail
+        del rows[1]['speed']
+        results = ec.service.solve_batch(rows)
+        self.assertEqual([r[0] for r in results],
+                         [ec.common.Status.OK, ec.common.Status.INVALID])
+        self.assertEqual([s.org_type for s in results[0][1]],
+                         [None, 'easement', 'static', 'easement'])
+
+    def test_internal_error(self):
+        async def test(service):
+            async def fail(*args):
+                raise RuntimeError('fail')
+            service._dispatch = fail
+            return await request(service.port, 'POST', '/curve_fit_radius',
+                                 self.data)
+        status, result = self.run_service(test)
+        self.assertEqual(status, 500)
+        self.assertIn('fail', result['error'])
+
+    def test_stats(self):
+        async def test(service):
+            await request(service.port, 'POST', '/curve_fit_point', self.data)
+            return await request(service.port, 'GET', '/stats')
+        status, result = self.run_service(test)
+        self.assertEqual(status, 200)
+        self.assertEqual(result['endpoints']['/curve_fit_point']['count'], 1)
+        self.assertEqual(result['endpoints']['/curve_fit_length']['count'], 0)
+
+    def test_keep_alive(self):
+        async def test(service):
+            reader, writer = await asyncio.open_connection('127.0.0.1',
+                                                           service.port)
+            body = json.dumps(self.data).encode()
+            statuses = []
+            for _ in range(2):
+                writer.write('POST /curve_fit_radius HTTP/1.1\r\n'
+                             'Content-Length: {}\r\n\r\n'.format(len(body))
+                             .encode() + body)
+                await writer.drain()
+                line = await reader.readline()
+                statuses.append(int(line.split()[1]))
+                length = 0
+                while True:
+                    header = await reader.readline()
+                    if header == b'\r\n':
+                        break
+                    if header.lower().startswith(b'content-length'):
+                        length = int(header.split(b':')[1])
+                await reader.readexactly(length)
+            writer.close()
+            return statuses
+        self.assertEqual(self.run_service(test), [200, 200])
+
+    def test_errors(self):
+        async def test(service):
+            return [await request(service.port, 'GET', '/curve_fit_radius'),
+                    await request(service.port, 'POST', '/unknown', {}),
+                    await request(service.port, 'POST', '/curve_fit_length',
+                                  self.data)]
+        results = self.run_service(test)
+        self.assertEqual([r[0] for r in results], [405, 404, 400])
+        self.assertIn('length', results[2][1]['error'])
+
+    def test_end_curved(self):
+        self.data['end']['curvature'] = 0.002
+
+        async def test(service):
+            return await request(service.port, 'POST', '/curve_fit_radius',
+                                 self.data)
+        status, result = self.run_service(test)
+        self.assertEqual(status, 400)
+        self.assertIn('straight', result['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
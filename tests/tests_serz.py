@@ -0,0 +1,130 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for importing route and track rule XML files
+
+import io
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.serz
+
+HEADER = ('<?xml version="1.0" encoding="utf-8"?>\n'
+          '<cRecordSet xmlns:d="http://www.kuju.com/TnT/2003/Delta" '
+          'd:version="1.0" d:id="1"><Record>')
+FOOTER = '</Record></cRecordSet>'
+
+
+def far(tile, distance):
+    return ('<cFarCoordinate><RouteCoordinate><cRouteCoordinate>'
+            '<Distance d:type="sInt32">{}</Distance></cRouteCoordinate>'
+            '</RouteCoordinate><TileCoordinate><cTileCoordinate>'
+            '<Distance d:type="sFloat32">{}</Distance></cTileCoordinate>'
+            '</TileCoordinate></cFarCoordinate>'.format(tile, distance))
+
+
+def curve(tag, length, tile, pos, tangent, extra=''):
+    return ('<{tag} d:id="2"><Length d:type="sFloat32">{length}</Length>'
+            '<StartPos><cFarVector2><X>{x}</X><Z>{z}</Z></cFarVector2>'
+            '</StartPos><StartTangent><cFarVector2><X d:type="sFloat32">{dx}'
+            '</X><Z d:type="sFloat32">{dz}</Z></cFarVector2></StartTangent>'
+            '{extra}</{tag}>'.format(
+                tag=tag, length=length, x=far(tile[0], pos[0]),
+                z=far(tile[1], pos[1]), dx=tangent[0], dz=tangent[1],
+                extra=extra))
+
+
+def route(curves):
+    body = ''.join('<cTrackRibbon><Curve>{}</Curve></cTrackRibbon>'.format(c)
+                   for c in curves)
+    return io.BytesIO((HEADER + '<Network>' + body + '</Network>'
+                       + FOOTER).encode())
+
+
+class CurveTests(unittest.TestCase):
+
+    def setUp(self):
+        self.curves = [
+            curve('cCurveStraight', 100, (0, -1), (1000, 24), (0, 1)),
+            curve('cCurveEasement', 50, (1, 0), (76, 100), (1, 1),
+                  '<StartCurvature d:type="sFloat32">0</StartCurvature>'
+                  '<EndCurvature d:type="sFloat32">0.002</EndCurvature>'),
+            curve('cCurveArc', 200, (1, 0), (120, 140), (1, 0),
+                  '<Curvature d:type="sFloat32">0.002</Curvature>')
+        ]
+
+    def tearDown(self):
+        del self.curves
+
+    def test_iter_curves(self):
+        result = list(ec.serz.iter_curves(route(self.curves)))
+        self.assertEqual([r.kind for r in result],
+                         ['straight', 'easement', 'static'])
+        self.assertEqual(result[0].tile, (0, -1))
+        self.assertEqual((result[0].pos_x, result[0].pos_z), (1000, 24))
+        self.assertAlmostEqual(result[1].bearing, math.pi / 4)
+        self.assertEqual(result[1].end_curvature, 0.002)
+        self.assertEqual(result[2].start_curvature, 0.002)
+        self.assertEqual(result[2].length, 200)
+
+    def test_read_curves(self):
+        data = ec.serz.read_curves(route(self.curves))
+        self.assertEqual(list(data['kind']), [0, 2, 1])
+        self.assertEqual(list(data['tile_z']), [-1, 0, 0])
+        self.assertAlmostEqual(data['bearing'][2], math.pi / 2)
+
+    def test_track_coords(self):
+        batches = list(ec.serz.track_coords(route(self.curves), batch=2))
+        self.assertEqual([len(b) for b in batches], [2, 1])
+        first, second = batches[0]
+        # Relative to the first tile
+        self.assertEqual((first.pos_x, first.pos_z), (1000, 24))
+        self.assertEqual((second.pos_x, second.pos_z), (1100, 1124))
+        self.assertEqual(batches[1][0].curvature, 0.002)
+
+    def test_track_coords_origin(self):
+        coords = next(ec.serz.track_coords(route(self.curves), origin=(1, 0)))
+        self.assertEqual((coords[0].pos_x, coords[0].pos_z), (-24, -1000))
+
+    def test_large(self):
+        # Many curves streamed one at a time
+        n = 20000
+        data = io.BytesIO((HEADER + '<Network>' + ''.join(
+            '<cTrackRibbon><Curve>{}</Curve></cTrackRibbon>'.format(
+                self.curves[0]) for _ in range(n)) + '</Network>'
+            + FOOTER).encode())
+        self.assertEqual(sum(1 for _ in ec.serz.iter_curves(data)), n)
+
+    def test_exception_missing(self):
+        bad = '<cCurveArc><Length>10</Length></cCurveArc>'
+        with self.assertRaisesRegex(ec.serz.SerzError, 'start position'):
+            list(ec.serz.iter_curves(route([bad])))
+
+    def test_exception_parse(self):
+        with self.assertRaisesRegex(ec.serz.SerzError, 'Could not parse'):
+            list(ec.serz.iter_curves(io.BytesIO(b'<cRecordSet><Record>')))
+
+
+class SpeedToleranceTests(unittest.TestCase):
+
+    def test_speed_tolerances(self):
+        rule = ''.join(
+            '<{0}><cTrackRuleDefinition><SpeedTolerance d:type="sFloat32">'
+            '{1}</SpeedTolerance></cTrackRuleDefinition></{0}>'.format(n, v)
+            for n, v in [('MainLine', 160), ('Passenger', 120),
+                         ('Freight', 100), ('Yard', 40)])
+        data = io.BytesIO((HEADER + '<cTrackRule>' + rule + '</cTrackRule>'
+                           + FOOTER).encode())
+        self.assertEqual(ec.serz.speed_tolerances(data),
+                         {'MainLine': 160, 'Passenger': 120, 'Freight': 100,
+                          'Yard': 40})
+
+    def test_exception_none(self):
+        data = io.BytesIO((HEADER + FOOTER).encode())
+        with self.assertRaisesRegex(ec.serz.SerzError, 'No speed'):
+            ec.serz.speed_tolerances(data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for the TrackIndex class
+
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.coord
+import ec.spatial
+
+
+class BearingCompatibleTests(unittest.TestCase):
+
+    def test_equal(self):
+        self.assertTrue(ec.spatial.bearing_compatible(1, 1 + 1e-9))
+
+    def test_across_zero(self):
+        self.assertTrue(ec.spatial.bearing_compatible(1e-9, 2*math.pi - 1e-9))
+
+    def test_flipped(self):
+        self.assertFalse(ec.spatial.bearing_compatible(0.5, 0.5 + math.pi))
+        self.assertTrue(ec.spatial.bearing_compatible(0.5, 0.5 + math.pi, both=True))
+
+
+class TrackIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        rand = random.Random(16)
+        self.xs = [rand.uniform(-3000, 3000) for i in range(500)]
+        self.zs = [rand.uniform(-3000, 3000) for i in range(500)]
+        self.bs = [rand.choice([0, math.pi/2, math.pi]) for i in range(500)]
+        self.index = ec.spatial.TrackIndex.from_arrays(self.xs, self.zs, self.bs)
+
+    def tearDown(self):
+        del self.xs, self.zs, self.bs, self.index
+
+    def brute(self, x, z, bearing=None):
+        ls = [(math.hypot(self.xs[i] - x, self.zs[i] - z), i) for i in range(len(self.xs))
+              if bearing is None or self.bs[i] == bearing]
+        return sorted(ls)
+
+    def test_exception_cell_size(self):
+        with self.assertRaisesRegex(ec.spatial.SpatialError, 'cell size'):
+            ec.spatial.TrackIndex(100)
+
+    def test_exception_lengths(self):
+        with self.assertRaisesRegex(ec.spatial.SpatialError, 'same length'):
+            ec.spatial.TrackIndex.from_arrays([0, 1], [0], [0, 0])
+
+    def test_tiles(self):
+        self.assertIn((-3, -3), self.index.tiles)
+        self.assertIn((2, 2), self.index.tiles)
+
+    def test_radius(self):
+        result = self.index.radius(100, -200, 400)
+        expected = [r for r in self.brute(100, -200) if r[0] <= 400]
+        self.assertEqual(result, expected)
+
+    def test_radius_bearing(self):
+        result = self.index.radius(100, -200, 400, bearing=math.pi/2)
+        expected = [r for r in self.brute(100, -200, math.pi/2) if r[0] <= 400]
+        self.assertEqual(result, expected)
+
+    def test_nearest(self):
+        self.assertEqual(self.index.nearest(1500, 20, k=5), self.brute(1500, 20)[:5])
+
+    def test_nearest_outside(self):
+        self.assertEqual(self.index.nearest(9000, 9000, k=3), self.brute(9000, 9000)[:3])
+
+    def test_nearest_bearing_flipped(self):
+        result = self.index.nearest(0, 0, k=4, bearing=0, both=True)
+        expected = [r for r in self.brute(0, 0) if self.bs[r[1]] in (0, math.pi)][:4]
+        self.assertEqual(result, expected)
+
+    def test_pairs(self):
+        result = sorted((i, j) for i, j, d in self.index.pairs(150))
+        expected = sorted((i, j) for i in range(500) for j in range(i + 1, 500)
+                          if math.hypot(self.xs[i] - self.xs[j], self.zs[i] - self.zs[j]) <= 150
+                          and self.bs[i] == self.bs[j])
+        self.assertEqual(result, expected)
+
+    def test_insert_coord(self):
+        index = ec.spatial.TrackIndex()
+        index.insert('a', ec.coord.TrackCoord(5, 5, 30, ec.coord.Q.NE, curvature=0))
+        result = index.nearest(0, 0, bearing=math.radians(30), places=5)
+        self.assertEqual([k for d, k in result], ['a'])
@@ -0,0 +1,67 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for radius and speed tolerance sweeps
+
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.coord
+import ec.curve
+import ec.sweep
+from tests.tests_common import CustomAssertions
+
+
+class SweepTests(unittest.TestCase, CustomAssertions):
+
+    def setUp(self):
+        self.start = ec.coord.TrackCoord(
+            pos_x=217.027, pos_z=34.523, rotation=48.882, quad=ec.coord.Q.NE, curvature=0)
+        self.end_left = ec.coord.TrackCoord(
+            pos_x=467.962, pos_z=465.900, rotation=12.762, quad=ec.coord.Q.NE, curvature=0)
+        self.end_far_right = ec.coord.TrackCoord(
+            pos_x=296.508, pos_z=681.428-1024, rotation=72.687, quad=ec.coord.Q.NW, curvature=0)
+        self.radii, self.speeds = [400, 600, 1200, 3000], [80, 120, 160]
+
+    def tearDown(self):
+        del self.start, self.end_left, self.end_far_right, self.radii, self.speeds
+
+    def compare(self, other, clockwise=None, minimum=500):
+        result = ec.sweep.sweep(self.start, other, self.radii, self.speeds, minimum, clockwise)
+        self.assertEqual(len(result), len(self.radii) * len(self.speeds))
+        for row in zip(*(result[c] for c in ['radius', 'speed', 'feasible', 'start_x',
+                                              'start_z', 'end_x', 'end_z', 'static_length'])):
+            radius, speed, feasible = row[:3]
+            track = ec.curve.TrackCurve(self.start, minimum, speed, split=False)
+            try:
+                curve = track.curve_fit_radius(other, radius, clockwise)
+            except ec.curve.CurveError:
+                self.assertFalse(feasible)
+                continue
+            self.assertTrue(feasible)
+            self.assertDataAlmostEqual(row[3:], (curve[0].pos_x, curve[0].pos_z, curve[-1].pos_x,
+                                                 curve[-1].pos_z, curve[2].org_length))
+
+    def test_exception_parallel(self):
+        with self.assertRaisesRegex(ec.curve.CurveError, 'must not be parallel'):
+            ec.sweep.sweep(self.start, self.start, self.radii, self.speeds, 500)
+
+    def test_matches_curve_fit_radius_left(self):
+        self.compare(self.end_left)
+
+    def test_matches_curve_fit_radius_far_right(self):
+        self.compare(self.end_far_right, clockwise=True, minimum=200)
+
+    def test_infeasible_below_minimum(self):
+        result = ec.sweep.sweep(self.start, self.end_left, [400], [120], 500)
+        self.assertEqual(result['feasible'], [False])
+        self.assertIsNone(result['end_x'][0])
+
+    def test_write_csv(self):
+        result = ec.sweep.sweep(self.start, self.end_left, self.radii, self.speeds, 500)
+        f = io.StringIO()
+        result.write_csv(f)
+        lines = f.getvalue().splitlines()
+        self.assertEqual(lines[0], ','.join(ec.sweep.SweepResult.columns))
+        self.assertEqual(len(lines), len(result) + 1)
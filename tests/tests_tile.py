@@ -0,0 +1,57 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for tile coordinate conversion
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.tile
+from tests.tests_common import CustomAssertions
+
+
+class ParseTileTests(unittest.TestCase):
+
+    def test_parse(self):
+        self.assertEqual(ec.tile.parse_tile('+00000000-00000001'), (0, -1))
+
+    def test_parse_tuple(self):
+        self.assertEqual(ec.tile.parse_tile((3, -2)), (3, -2))
+
+    def test_exception_parse(self):
+        with self.assertRaisesRegex(ec.tile.TileError, 'not a valid tile'):
+            ec.tile.parse_tile('00000000-00000001')
+
+    def test_format(self):
+        self.assertEqual(ec.tile.format_tile((0, -1)), '+00000000-00000001')
+
+    def test_round_trip(self):
+        tile = '-00000012+00000345'
+        self.assertEqual(ec.tile.format_tile(ec.tile.parse_tile(tile)), tile)
+
+
+class ConversionTests(unittest.TestCase, CustomAssertions):
+
+    def test_to_global(self):
+        gx, gz = ec.tile.to_global(['+00000000-00000001', '+00000001+00000000'],
+                                   [296.508, 10], [681.428, 20])
+        self.assertDataAlmostEqual(gx + gz, [296.508, 1034, 681.428-1024, 20])
+
+    def test_to_global_single_tile(self):
+        gx, gz = ec.tile.to_global((0, -1), [1, 2], [3, 4])
+        self.assertEqual((gx, gz), ([1, 2], [-1021, -1020]))
+
+    def test_exception_lengths(self):
+        with self.assertRaisesRegex(ec.tile.TileError, 'one tile for every'):
+            ec.tile.to_global(['+00000000+00000000'], [1, 2], [3, 4])
+
+    def test_to_local(self):
+        tiles, lx, lz = ec.tile.to_local([296.508, -1.5], [681.428-1024, 2048])
+        self.assertEqual(tiles, [(0, -1), (-1, 2)])
+        self.assertDataAlmostEqual(lx + lz, [296.508, 1022.5, 681.428, 0])
+
+    def test_normalise(self):
+        origin, xs, zs = ec.tile.normalise(
+            ['+00000000+00000000', '+00000000-00000001'], [217.027, 296.508], [34.523, 681.428])
+        self.assertEqual(origin, (0, 0))
+        self.assertDataAlmostEqual(xs + zs, [217.027, 296.508, 34.523, 681.428-1024])
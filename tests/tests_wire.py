@@ -0,0 +1,91 @@
+# MIT License, copyright Ewan Macpherson, 2016; see LICENCE in root directory
+# Test script for the binary encoding of track sections
+
+import os
+import pickle
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath('..'))
+import ec.coord
+import ec.curve
+import ec.wire
+from tests.tests_common import CustomAssertions
+
+
+class WireTests(unittest.TestCase, CustomAssertions):
+
+    def setUp(self):
+        super(WireTests, self).setUp()
+        start = ec.coord.TrackCoord(
+            pos_x=217.027, pos_z=34.523, rotation=48.882, quad=ec.coord.Q.NE, curvature=0)
+        end_left = ec.coord.TrackCoord(
+            pos_x=467.962, pos_z=465.900, rotation=12.762, quad=ec.coord.Q.NE, curvature=0)
+        self.curve = ec.curve.TrackCurve(start, 500, 120).curve_fit_radius(
+            end_left, 600)
+
+    def tearDown(self):
+        del self.curve
+
+    def test_round_trip(self):
+        data = ec.wire.encode(self.curve)
+        self.assertEqual(len(data), ec.wire.encoded_size(len(self.curve)))
+        result = ec.wire.decode(data)
+        self.assertEqual(len(result), len(self.curve))
+        for new, old in zip(result, self.curve):
+            self.assertEqual(new.__dict__.keys(), old.__dict__.keys())
+            self.assertEqual((new.pos_x, new.pos_z, new.bearing.rad,
+                              new.curvature, new.org_curvature,
+                              new.org_length, new.org_type),
+                             (old.pos_x, old.pos_z, old.bearing.rad,
+                              old.curvature, old.org_curvature,
+                              old.org_length, old.org_type))
+            self.assertTrackAlign(new, old)
+
+    def test_none(self):
+        tc = ec.coord.TrackCoord(1, 2, 3, ec.coord.Q.NONE)
+        new, = ec.wire.decode(ec.wire.encode([tc]))
+        self.assertEqual((new.curvature, new.org_length, new.org_type),
+                         (None, None, None))
+
+    def test_empty(self):
+        self.assertEqual(ec.wire.decode(ec.wire.encode([])), [])
+
+    def test_benchmark(self):
+        result = ec.wire.benchmark(self.curve, number=1)
+        self.assertEqual(set(result), {'wire', 'pickle', 'default'})
+        self.assertEqual(result['wire'][0],
+                         ec.wire.encoded_size(len(self.curve)))
+        self.assertLess(result['pickle'][0], result['default'][0])
+        report = ec.wire.report(self.curve, number=1)
+        for name in ('wire', 'pickle', 'default'):
+            self.assertIn(name, report)
+
+    def test_default_dumps(self):
+        # Same state as pickling without the compact __reduce__ methods
+        data = ec.wire.default_dumps(self.curve)
+        self.assertIn(b'_org_curvature', data)
+        for new, old in zip(pickle.loads(data), self.curve):
+            self.assertEqual(new.__dict__.keys(), old.__dict__.keys())
+            self.assertEqual(new.bearing.rad, old.bearing.rad)
+
+    def test_exception_type(self):
+        tc = ec.coord.TrackCoord(1, 2, 3, ec.coord.Q.NONE, org_type='spiral')
+        with self.assertRaisesRegex(ec.wire.WireError, 'spiral'):
+            ec.wire.encode([tc])
+
+    def test_exception_object(self):
+        with self.assertRaisesRegex(ec.wire.WireError, 'TrackCoord'):
+            ec.wire.encode([None])
+
+    def test_exception_length(self):
+        with self.assertRaisesRegex(ec.wire.WireError, 'Expected'):
+            ec.wire.decode(ec.wire.encode(self.curve)[:-1])
+
+    def test_exception_magic(self):
+        with self.assertRaisesRegex(ec.wire.WireError, 'Not encoded'):
+            ec.wire.decode(b'\0' * 8)
+
+
+if __name__ == '__main__':
+    unittest.main()